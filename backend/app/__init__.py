@@ -7,6 +7,7 @@ from logging.handlers import RotatingFileHandler
 from flask import Flask
 from app.config import get_config
 from app.extensions import init_extensions
+from app.utils.json_provider import OrjsonProvider
 
 
 def create_app(config_name=None):
@@ -27,12 +28,18 @@ def create_app(config_name=None):
     else:
         app.config.from_object(get_config())
 
+    # Encode JSON with orjson (datetime, Decimal and UUID included)
+    app.json = OrjsonProvider(app)
+
     # Initialize extensions
     init_extensions(app)
 
     # Register blueprints
     register_blueprints(app)
 
+    # Register request hooks
+    register_hooks(app)
+
     # Setup logging
     setup_logging(app)
 
@@ -55,6 +62,10 @@ def register_blueprints(app):
     from app.routes.courses import courses_bp
     from app.routes.social import social_bp
     from app.routes.ai_tools import ai_tools_bp
+    from app.routes.notifications import notifications_bp
+    from app.routes.uploads import uploads_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.file_uploads import file_uploads_bp
 
     # API version prefix
     api_prefix = f"/api/{app.config.get('API_VERSION', 'v1')}"
@@ -67,6 +78,35 @@ def register_blueprints(app):
     app.register_blueprint(courses_bp, url_prefix=f'{api_prefix}/courses')
     app.register_blueprint(social_bp, url_prefix=f'{api_prefix}/social')
     app.register_blueprint(ai_tools_bp, url_prefix=f'{api_prefix}/ai-tools')
+    app.register_blueprint(notifications_bp, url_prefix=f'{api_prefix}/notifications')
+    app.register_blueprint(file_uploads_bp, url_prefix=f'{api_prefix}/uploads')
+
+    # Uploaded files keep the /uploads/... paths stored in the database
+    app.register_blueprint(uploads_bp, url_prefix='/uploads')
+
+    if app.config.get('METRICS_ENABLED', True):
+        app.register_blueprint(metrics_bp, url_prefix='/metrics')
+
+
+def register_hooks(app):
+    """Register request lifecycle hooks"""
+    from app.services.notifications import init_notifications
+    from app.services.outbox import init_outbox
+    from app.services.ranking import init_ranking
+    from app.services.job_expiry import init_job_expiry
+    from app.services.cache_tags import init_cache_tags
+    from app.services.query_stats import init_query_stats
+    from app.services.metrics import init_metrics
+    from app.services.profiler import init_profiler
+
+    init_profiler(app)
+    init_metrics(app)
+    init_query_stats(app)
+    init_notifications(app)
+    init_outbox(app)
+    init_ranking(app)
+    init_cache_tags(app)
+    init_job_expiry(app)
 
 
 def setup_logging(app):
@@ -42,12 +42,62 @@ class Config:
     # File Upload
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', './uploads')
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_FILE_SIZE', 10485760))  # 10MB default
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 65536))  # Streaming read size
+    RESUMABLE_UPLOAD_MAX_SIZE = int(os.getenv('RESUMABLE_UPLOAD_MAX_SIZE', 2147483648))  # 2GB per upload
+    RESUMABLE_UPLOAD_CHUNK_SIZE = int(os.getenv('RESUMABLE_UPLOAD_CHUNK_SIZE', 8388608))  # 8MB, below MAX_FILE_SIZE
+    UPLOADS_CACHE_MAX_AGE = int(os.getenv('UPLOADS_CACHE_MAX_AGE', 3600))  # Non content-addressed files
+    UPLOADS_ACCEL_REDIRECT_PREFIX = os.getenv('UPLOADS_ACCEL_REDIRECT_PREFIX')  # e.g. /protected-uploads/ behind nginx
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'False').lower() == 'true'  # Apache/lighttpd mod_xsendfile
     ALLOWED_EXTENSIONS = set(os.getenv('ALLOWED_EXTENSIONS', 'jpg,jpeg,png,pdf,doc,docx,mp4').split(','))
 
+    # Image Processing
+    IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', 2))  # 0 = process inline
+    IMAGE_VARIANTS = {
+        'default': (400, 400),
+        'thumb': (160, 160),
+        'small': (64, 64),
+    }
+    IMAGE_VARIANT_FORMATS = os.getenv('IMAGE_VARIANT_FORMATS', 'webp').split(',')
+
     # WebSocket
     SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE', 'redis://localhost:6379/0')
     SOCKETIO_CORS_ALLOWED_ORIGINS = os.getenv('SOCKETIO_CORS_ALLOWED_ORIGINS', '*')
 
+    # Job View Counting
+    VIEW_COUNTER_BACKEND = os.getenv('VIEW_COUNTER_BACKEND', 'redis')  # redis or memory (single process)
+    VIEW_COUNT_FLUSH_INTERVAL = int(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', 10))  # seconds
+    VIEW_UNIQUE_RETENTION_DAYS = int(os.getenv('VIEW_UNIQUE_RETENTION_DAYS', 30))
+    VIEW_FLUSH_STALE_AFTER = int(os.getenv('VIEW_FLUSH_STALE_AFTER', 300))  # seconds before an unacknowledged batch is re-processed
+
+    # Notifications
+    NOTIFICATION_BATCH_SIZE = int(os.getenv('NOTIFICATION_BATCH_SIZE', 500))
+    NOTIFICATION_UNREAD_CACHE_TIMEOUT = int(os.getenv('NOTIFICATION_UNREAD_CACHE_TIMEOUT', 300))
+
+    # Job Expiry
+    JOB_EXPIRY_SWEEPER_ENABLED = os.getenv('JOB_EXPIRY_SWEEPER_ENABLED', 'True').lower() == 'true'
+    JOB_EXPIRY_SWEEP_INTERVAL = int(os.getenv('JOB_EXPIRY_SWEEP_INTERVAL', 300))  # seconds
+    JOB_EXPIRY_BATCH_SIZE = int(os.getenv('JOB_EXPIRY_BATCH_SIZE', 500))
+
+    # Bulk Job Import
+    JOB_IMPORT_BATCH_SIZE = int(os.getenv('JOB_IMPORT_BATCH_SIZE', 500))  # Rows per multi-row INSERT + commit
+    JOB_IMPORT_MAX_ROWS = int(os.getenv('JOB_IMPORT_MAX_ROWS', 10000))
+
+    # Streaming exports
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 500))  # Rows fetched per server-side cursor round trip
+
+    # Idempotency-Key replay window (seconds)
+    IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 86400))
+
+    # Applicant Ranking
+    RANKING_SCORE_CACHE_TIMEOUT = int(os.getenv('RANKING_SCORE_CACHE_TIMEOUT', 86400))  # Keys are versioned, so long-lived
+
+    # Outbox (background side effects)
+    OUTBOX_WORKER_ENABLED = os.getenv('OUTBOX_WORKER_ENABLED', 'True').lower() == 'true'  # False = drain manually
+    OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', 2))  # seconds
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 100))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 8))  # then marked failed
+    OUTBOX_LOCK_TIMEOUT = int(os.getenv('OUTBOX_LOCK_TIMEOUT', 300))  # seconds before a claimed event is retried
+
     # Email
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
@@ -62,9 +112,21 @@ class Config:
 
     # Redis
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-    CACHE_TYPE = os.getenv('CACHE_TYPE', 'redis')
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'app.utils.cache_backend.TwoTierRedisCache')
     CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/1')
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes
+    # In-process tier of TwoTierRedisCache (per worker, invalidated over pub/sub)
+    CACHE_LOCAL_MAX_ENTRIES = int(os.getenv('CACHE_LOCAL_MAX_ENTRIES', 1024))
+    CACHE_LOCAL_TIMEOUT = int(os.getenv('CACHE_LOCAL_TIMEOUT', 30))  # Staleness bound if an invalidation is lost
+    CACHE_LOCAL_PREFIXES = tuple(
+        prefix for prefix in os.getenv('CACHE_LOCAL_PREFIXES', 'cache_tag:,cached:,job_skills:,applicant_score:').split(',')
+        if prefix
+    )
+    CACHE_INVALIDATION_CHANNEL = os.getenv('CACHE_INVALIDATION_CHANNEL', 'cache:invalidate')
+    # Single-flight computations (recommendations)
+    SINGLE_FLIGHT_LOCK_TIMEOUT = int(os.getenv('SINGLE_FLIGHT_LOCK_TIMEOUT', 30))  # Lock of a crashed process expires
+    SINGLE_FLIGHT_WAIT_TIMEOUT = int(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', 10))  # Then compute without waiting
+    TAGGED_CACHE_TIMEOUT = int(os.getenv('TAGGED_CACHE_TIMEOUT', 3600))  # Tag bumps invalidate earlier
 
     # Application
     APP_NAME = os.getenv('APP_NAME', 'Collabio')
@@ -89,6 +151,28 @@ class Config:
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', './logs/collabio.log')
 
+    # Prometheus metrics (/metrics); set PROMETHEUS_MULTIPROC_DIR in the environment with several workers
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # Bearer token required to scrape (metrics are off in production without it)
+
+    # Sampling profiler (X-Profile header with PROFILER_SECRET, or a JWT with the PROFILER_JWT_CLAIM claim)
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'True').lower() == 'true'
+    PROFILER_SECRET = os.getenv('PROFILER_SECRET')
+    PROFILER_JWT_CLAIM = os.getenv('PROFILER_JWT_CLAIM', 'profiler')
+    PROFILER_DIR = os.getenv('PROFILER_DIR', './profiles')
+    PROFILER_INTERVAL = float(os.getenv('PROFILER_INTERVAL', 0.001))  # seconds between samples
+    PROFILER_CONTINUOUS_ENABLED = os.getenv('PROFILER_CONTINUOUS_ENABLED', 'False').lower() == 'true'
+    PROFILER_CONTINUOUS_INTERVAL = float(os.getenv('PROFILER_CONTINUOUS_INTERVAL', 0.05))
+    PROFILER_CONTINUOUS_FLUSH_INTERVAL = int(os.getenv('PROFILER_CONTINUOUS_FLUSH_INTERVAL', 60))  # seconds
+
+    # SQL instrumentation (per-request query counts, N+1 detection, Server-Timing)
+    SQL_INSTRUMENTATION_ENABLED = os.getenv('SQL_INSTRUMENTATION_ENABLED', 'True').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'True').lower() == 'true'
+    SQL_LOG_REQUESTS = os.getenv('SQL_LOG_REQUESTS', 'False').lower() == 'true'
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))  # same statement shape per request
+    SQL_QUERY_BUDGET = int(os.getenv('SQL_QUERY_BUDGET')) if os.getenv('SQL_QUERY_BUDGET') else None
+    SQL_QUERY_BUDGET_RAISE = os.getenv('SQL_QUERY_BUDGET_RAISE', 'False').lower() == 'true'
+
     # Timezone
     TIMEZONE = os.getenv('TIMEZONE', 'Asia/Karachi')
 
@@ -108,6 +192,8 @@ class ProductionConfig(Config):
     # Override with production values
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
+    # /metrics is never served unauthenticated in production
+    METRICS_ENABLED = Config.METRICS_ENABLED and bool(Config.METRICS_TOKEN)
 
     # Ensure required production env vars are set
     if not SECRET_KEY or SECRET_KEY == 'dev-secret-key-change-in-production':
@@ -120,8 +206,14 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = 'postgresql://localhost/collabio_test_db'
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'postgresql://localhost/collabio_test_db')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    IMAGE_PROCESSING_WORKERS = 0
+    VIEW_COUNTER_BACKEND = 'memory'
+    OUTBOX_WORKER_ENABLED = False
+    JOB_EXPIRY_SWEEPER_ENABLED = False
+    SQL_QUERY_BUDGET = 50
+    SQL_QUERY_BUDGET_RAISE = True
 
 
 # Configuration dictionary
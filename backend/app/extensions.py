@@ -11,6 +11,24 @@ from flask_socketio import SocketIO
 from flask_caching import Cache
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from app.services.metrics import record_cache_lookups
+
+
+class InstrumentedCache(Cache):
+    """Cache that counts hits and misses for /metrics"""
+
+    def get(self, *args, **kwargs):
+        value = super().get(*args, **kwargs)
+        hit = value is not None
+        record_cache_lookups(int(hit), int(not hit))
+        return value
+
+    def get_many(self, *args, **kwargs):
+        values = super().get_many(*args, **kwargs)
+        hits = sum(value is not None for value in values)
+        record_cache_lookups(hits, len(values) - hits)
+        return values
+
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -19,7 +37,7 @@ jwt = JWTManager()
 bcrypt = Bcrypt()
 cors = CORS()
 socketio = SocketIO()
-cache = Cache()
+cache = InstrumentedCache()
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"]
@@ -45,3 +63,15 @@ def init_extensions(app):
 
     if app.config.get('RATELIMIT_ENABLED'):
         limiter.init_app(app)
+
+
+def get_redis():
+    """Get the shared Redis client for REDIS_URL (created lazily per app)"""
+    from flask import current_app
+    import redis
+
+    client = current_app.extensions.get('redis')
+    if client is None:
+        client = redis.Redis.from_url(current_app.config['REDIS_URL'])
+        current_app.extensions['redis'] = client
+    return client
@@ -16,6 +16,7 @@ from .notification import Notification
 from .achievement import Achievement, UserAchievement
 from .websocket import WebSocketSession
 from .file_upload import FileUpload
+from .outbox import OutboxEvent
 
 __all__ = [
     'User',
@@ -49,4 +50,5 @@ __all__ = [
     'UserAchievement',
     'WebSocketSession',
     'FileUpload',
+    'OutboxEvent',
 ]
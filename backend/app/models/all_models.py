@@ -5,7 +5,7 @@ Import this in __init__.py as needed
 import uuid
 from datetime import datetime, date
 from app.extensions import db
-from app.models.base import BaseModel, SoftDeleteMixin, TimestampMixin
+from app.models.base import BaseModel, SoftDeleteMixin, TimestampMixin, active_index
 
 
 # EMPLOYER MODEL
@@ -56,7 +56,7 @@ class MentorProfile(BaseModel, SoftDeleteMixin):
     expertise = db.relationship('MentorExpertise', backref='mentor', lazy='dynamic', cascade='all, delete-orphan')
     mentorship_requests = db.relationship('MentorshipRequest', backref='mentor', lazy='dynamic', foreign_keys='MentorshipRequest.mentor_id')
 
-    def to_dict(self, include_expertise=False):
+    def to_dict(self, include_expertise=False, expertise=None):
         data = {
             'mentor_id': self.mentor_id,
             'full_name': self.full_name,
@@ -69,7 +69,10 @@ class MentorProfile(BaseModel, SoftDeleteMixin):
             'total_sessions': self.total_sessions,
             'linkedin_url': self.linkedin_url
         }
-        if include_expertise:
+        if expertise is not None:
+            # Preloaded in bulk by the caller
+            data['expertise'] = expertise
+        elif include_expertise:
             data['expertise'] = [e.expertise_area for e in self.expertise.filter_by(deleted_at=None)]
         return data
 
@@ -85,6 +88,20 @@ class MentorExpertise(BaseModel, SoftDeleteMixin):
 # JOB MODELS
 class Job(BaseModel, SoftDeleteMixin, TimestampMixin):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        active_index('idx_jobs_employer_posted', 'employer_id', 'posted_at'),
+        # Job listings and recommendations only scan open postings
+        db.Index(
+            'idx_jobs_active_posted', 'posted_at',
+            postgresql_where=db.text("status = 'active' AND deleted_at IS NULL"),
+            sqlite_where=db.text("status = 'active' AND deleted_at IS NULL")
+        ),
+        db.Index(
+            'idx_jobs_active_expires', 'expires_at',
+            postgresql_where=db.text("status = 'active' AND deleted_at IS NULL AND expires_at IS NOT NULL"),
+            sqlite_where=db.text("status = 'active' AND deleted_at IS NULL AND expires_at IS NOT NULL")
+        ),
+    )
 
     job_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     employer_id = db.Column(db.String(36), db.ForeignKey('employer_profiles.employer_id', ondelete='CASCADE'))
@@ -103,11 +120,12 @@ class Job(BaseModel, SoftDeleteMixin, TimestampMixin):
     expires_at = db.Column(db.DateTime)
     status = db.Column(db.String(20), default='active')
     views_count = db.Column(db.Integer, default=0)
+    applications_count = db.Column(db.Integer, nullable=False, default=0)
 
     skills_required = db.relationship('JobSkillRequired', backref='job', lazy='dynamic', cascade='all, delete-orphan')
     applications = db.relationship('JobApplication', backref='job', lazy='dynamic', cascade='all, delete-orphan')
 
-    def to_dict(self, include_skills=False):
+    def to_dict(self, include_skills=False, skills=None):
         data = {
             'job_id': self.job_id,
             'employer_id': self.employer_id,
@@ -117,23 +135,31 @@ class Job(BaseModel, SoftDeleteMixin, TimestampMixin):
             'location': self.location,
             'job_type': self.job_type,
             'work_mode': self.work_mode,
-            'salary_min': float(self.salary_min) if self.salary_min else None,
-            'salary_max': float(self.salary_max) if self.salary_max else None,
+            # Raw Decimal/datetime values, encoded by the JSON provider
+            'salary_min': self.salary_min or None,
+            'salary_max': self.salary_max or None,
             'salary_currency': self.salary_currency,
             'salary_period': self.salary_period,
             'requirements': self.requirements,
-            'posted_at': self.posted_at.isoformat() if self.posted_at else None,
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'posted_at': self.posted_at,
+            'expires_at': self.expires_at,
             'status': self.status,
-            'views_count': self.views_count
+            'views_count': self.views_count,
+            'applications_count': self.applications_count
         }
-        if include_skills:
+        if skills is not None:
+            # Preloaded in bulk by the caller
+            data['skills'] = skills
+        elif include_skills:
             data['skills'] = [s.skill_name for s in self.skills_required.filter_by(deleted_at=None)]
         return data
 
 
 class JobSkillRequired(BaseModel, SoftDeleteMixin):
     __tablename__ = 'job_skills_required'
+    __table_args__ = (
+        active_index('idx_job_skills_job', 'job_id'),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = db.Column(db.String(36), db.ForeignKey('jobs.job_id', ondelete='CASCADE'))
@@ -143,6 +169,16 @@ class JobSkillRequired(BaseModel, SoftDeleteMixin):
 
 class JobApplication(BaseModel, SoftDeleteMixin):
     __tablename__ = 'job_applications'
+    __table_args__ = (
+        active_index('idx_applications_job_applied', 'job_id', 'applied_at'),
+        active_index('idx_applications_student_applied', 'student_id', 'applied_at'),
+        # One active application per student and job (withdrawn ones may be re-applied)
+        db.Index(
+            'idx_applications_job_student_active', 'job_id', 'student_id', unique=True,
+            postgresql_where=db.text('deleted_at IS NULL'),
+            sqlite_where=db.text('deleted_at IS NULL')
+        ),
+    )
 
     application_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = db.Column(db.String(36), db.ForeignKey('jobs.job_id', ondelete='CASCADE'))
@@ -187,6 +223,9 @@ class JobApplication(BaseModel, SoftDeleteMixin):
 
 class SavedJob(BaseModel, SoftDeleteMixin):
     __tablename__ = 'saved_jobs'
+    __table_args__ = (
+        active_index('idx_saved_jobs_student_saved', 'student_id', 'saved_at'),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'))
@@ -197,6 +236,10 @@ class SavedJob(BaseModel, SoftDeleteMixin):
 # MENTORSHIP MODELS
 class MentorshipRequest(BaseModel, SoftDeleteMixin):
     __tablename__ = 'mentorship_requests'
+    __table_args__ = (
+        active_index('idx_mentorship_requests_student_requested', 'student_id', 'requested_at'),
+        active_index('idx_mentorship_requests_mentor_requested', 'mentor_id', 'requested_at'),
+    )
 
     request_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'))
@@ -220,6 +263,10 @@ class MentorshipRequest(BaseModel, SoftDeleteMixin):
 
 class MentorshipSession(BaseModel, SoftDeleteMixin):
     __tablename__ = 'mentorship_sessions'
+    __table_args__ = (
+        active_index('idx_sessions_student_scheduled', 'student_id', 'scheduled_at'),
+        active_index('idx_sessions_mentor_scheduled', 'mentor_id', 'scheduled_at'),
+    )
 
     session_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     request_id = db.Column(db.String(36), db.ForeignKey('mentorship_requests.request_id', ondelete='CASCADE'))
@@ -235,6 +282,9 @@ class MentorshipSession(BaseModel, SoftDeleteMixin):
 
 class MentorshipReview(BaseModel, SoftDeleteMixin):
     __tablename__ = 'mentorship_reviews'
+    __table_args__ = (
+        active_index('idx_reviews_session', 'session_id'),
+    )
 
     review_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     session_id = db.Column(db.String(36), db.ForeignKey('mentorship_sessions.session_id', ondelete='CASCADE'))
@@ -248,8 +298,17 @@ class MentorshipReview(BaseModel, SoftDeleteMixin):
 # MESSAGING MODELS
 class Conversation(BaseModel, SoftDeleteMixin, TimestampMixin):
     __tablename__ = 'conversations'
+    __table_args__ = (
+        db.Index(
+            'idx_conversations_direct_key', 'direct_key', unique=True,
+            postgresql_where=db.text('deleted_at IS NULL'),
+            sqlite_where=db.text('deleted_at IS NULL')
+        ),
+    )
 
     conversation_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # sha256 of the sorted participant pair; NULL for group conversations
+    direct_key = db.Column(db.String(64))
 
     participants = db.relationship('ConversationParticipant', backref='conversation', lazy='dynamic', cascade='all, delete-orphan')
     messages = db.relationship('Message', backref='conversation', lazy='dynamic', cascade='all, delete-orphan')
@@ -257,6 +316,9 @@ class Conversation(BaseModel, SoftDeleteMixin, TimestampMixin):
 
 class ConversationParticipant(BaseModel, SoftDeleteMixin):
     __tablename__ = 'conversation_participants'
+    __table_args__ = (
+        active_index('idx_participants_user_conversation', 'user_id', 'conversation_id'),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     conversation_id = db.Column(db.String(36), db.ForeignKey('conversations.conversation_id', ondelete='CASCADE'))
@@ -267,6 +329,10 @@ class ConversationParticipant(BaseModel, SoftDeleteMixin):
 
 class Message(BaseModel, SoftDeleteMixin):
     __tablename__ = 'messages'
+    __table_args__ = (
+        active_index('idx_messages_conversation', 'conversation_id', 'sent_at'),
+        active_index('idx_messages_unread_conversation', 'conversation_id', 'is_read'),
+    )
 
     message_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     conversation_id = db.Column(db.String(36), db.ForeignKey('conversations.conversation_id', ondelete='CASCADE'))
@@ -346,6 +412,9 @@ class CourseLesson(BaseModel, SoftDeleteMixin):
 
 class CourseEnrollment(BaseModel, SoftDeleteMixin):
     __tablename__ = 'course_enrollments'
+    __table_args__ = (
+        active_index('idx_enrollments_student_enrolled', 'student_id', 'enrolled_at'),
+    )
 
     enrollment_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'))
@@ -360,6 +429,9 @@ class CourseEnrollment(BaseModel, SoftDeleteMixin):
 # AI TOOL USAGE
 class AIToolUsage(BaseModel, SoftDeleteMixin):
     __tablename__ = 'ai_tool_usage'
+    __table_args__ = (
+        active_index('idx_ai_usage_student_used', 'student_id', 'used_at'),
+    )
 
     usage_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'))
@@ -371,6 +443,10 @@ class AIToolUsage(BaseModel, SoftDeleteMixin):
 # SOCIAL MODELS
 class Post(BaseModel, SoftDeleteMixin, TimestampMixin):
     __tablename__ = 'posts'
+    __table_args__ = (
+        active_index('idx_posts_created', 'created_at'),
+        active_index('idx_posts_type_created', 'post_type', 'created_at'),
+    )
 
     post_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     author_id = db.Column(db.String(36), db.ForeignKey('users.user_id', ondelete='CASCADE'))
@@ -396,6 +472,9 @@ class PostLike(BaseModel, SoftDeleteMixin):
 
 class PostComment(BaseModel, SoftDeleteMixin):
     __tablename__ = 'post_comments'
+    __table_args__ = (
+        active_index('idx_comments_post', 'post_id', 'created_at'),
+    )
 
     comment_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     post_id = db.Column(db.String(36), db.ForeignKey('posts.post_id', ondelete='CASCADE'))
@@ -420,6 +499,10 @@ class Connection(BaseModel, SoftDeleteMixin):
 # NOTIFICATION MODEL
 class Notification(BaseModel, SoftDeleteMixin):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        active_index('idx_notifications_user', 'user_id', 'created_at'),
+        db.Index('idx_notifications_user_read_created', 'user_id', 'is_read', 'created_at'),
+    )
 
     notification_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.user_id', ondelete='CASCADE'))
@@ -479,6 +562,14 @@ class WebSocketSession(BaseModel):
 # FILE UPLOAD MODEL
 class FileUpload(BaseModel, SoftDeleteMixin):
     __tablename__ = 'file_uploads'
+    __table_args__ = (
+        db.Index(
+            'idx_uploads_content_hash', 'content_hash', 'category', unique=True,
+            postgresql_where=db.text('deleted_at IS NULL'),
+            sqlite_where=db.text('deleted_at IS NULL')
+        ),
+        db.Index('idx_uploads_path', 'file_path'),
+    )
 
     file_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.user_id', ondelete='CASCADE'))
@@ -488,3 +579,39 @@ class FileUpload(BaseModel, SoftDeleteMixin):
     file_size = db.Column(db.BigInteger)
     category = db.Column(db.String(50), nullable=False)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    content_hash = db.Column(db.String(64))
+    reference_count = db.Column(db.Integer, nullable=False, default=1)
+    upload_status = db.Column(db.String(20), nullable=False, default='complete')
+    bytes_received = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'upload_id': self.file_id,
+            'file_name': self.file_name,
+            'file_path': self.file_path if self.upload_status in ('complete', 'duplicate') else None,
+            'file_type': self.file_type,
+            'file_size': self.file_size,
+            'category': self.category,
+            'status': self.upload_status,
+            'offset': self.bytes_received,
+            'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None
+        }
+
+
+# OUTBOX MODEL
+class OutboxEvent(BaseModel):
+    __tablename__ = 'outbox_events'
+    __table_args__ = (
+        db.Index('idx_outbox_status_available', 'status', 'available_at'),
+    )
+
+    event_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    event_type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime)
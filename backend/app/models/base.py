@@ -1,6 +1,7 @@
 """
 Base model with common fields and methods
 """
+from contextlib import contextmanager
 from datetime import datetime
 from app.extensions import db
 
@@ -36,16 +37,60 @@ class TimestampMixin:
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+def active_index(name, *columns, **kwargs):
+    """
+    Index over rows that are not soft deleted
+
+    Every query filters deleted_at IS NULL, so indexes are partial on it
+    (PostgreSQL and SQLite), matching the indexes in migrations/.
+    """
+    return db.Index(
+        name, *columns,
+        postgresql_where=db.text('deleted_at IS NULL'),
+        sqlite_where=db.text('deleted_at IS NULL'),
+        **kwargs
+    )
+
+
 class BaseModel(db.Model):
     """Abstract base model"""
     __abstract__ = True
 
-    def save(self):
-        """Save model to database"""
+    def save(self, commit=True):
+        """
+        Save model to database
+
+        Pass commit=False inside unit_of_work() to stage the object and let
+        the surrounding transaction commit it together with related rows.
+        """
         db.session.add(self)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
 
+    @staticmethod
+    @contextmanager
+    def unit_of_work():
+        """
+        Group several writes into one transaction
+
+        Objects staged inside the block are flushed together (rows of the same
+        table go out as one multi-row INSERT) and committed once on exit; any
+        exception rolls everything back.
+
+        Example:
+            with BaseModel.unit_of_work():
+                job.save(commit=False)
+                for skill in skills:
+                    skill.save(commit=False)
+        """
+        try:
+            yield db.session
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
     def delete(self):
         """Delete model from database"""
         db.session.delete(self)
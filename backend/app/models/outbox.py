@@ -0,0 +1 @@
+from .all_models import *
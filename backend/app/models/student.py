@@ -4,7 +4,7 @@ Student Models
 import uuid
 from datetime import date
 from app.extensions import db
-from app.models.base import BaseModel, SoftDeleteMixin
+from app.models.base import BaseModel, SoftDeleteMixin, active_index
 
 
 class StudentProfile(BaseModel, SoftDeleteMixin):
@@ -25,6 +25,8 @@ class StudentProfile(BaseModel, SoftDeleteMixin):
     joined_date = db.Column(db.Date, nullable=False, default=date.today)
     connections_count = db.Column(db.Integer, default=0)
     applications_count = db.Column(db.Integer, default=0)
+    # Bumped when data used for job match scores changes (see services.ranking)
+    profile_version = db.Column(db.Integer, nullable=False, default=1)
 
     # Relationships
     education = db.relationship('StudentEducation', backref='student', lazy='dynamic', cascade='all, delete-orphan')
@@ -68,6 +70,9 @@ class StudentProfile(BaseModel, SoftDeleteMixin):
 class StudentEducation(BaseModel, SoftDeleteMixin):
     """Student education model"""
     __tablename__ = 'student_education'
+    __table_args__ = (
+        active_index('idx_education_student', 'student_id'),
+    )
 
     education_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'), nullable=False)
@@ -95,6 +100,9 @@ class StudentEducation(BaseModel, SoftDeleteMixin):
 class StudentExperience(BaseModel, SoftDeleteMixin):
     """Student experience model"""
     __tablename__ = 'student_experience'
+    __table_args__ = (
+        active_index('idx_experience_student', 'student_id'),
+    )
 
     experience_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'), nullable=False)
@@ -122,6 +130,9 @@ class StudentExperience(BaseModel, SoftDeleteMixin):
 class StudentSkill(BaseModel, SoftDeleteMixin):
     """Student skill model"""
     __tablename__ = 'student_skills'
+    __table_args__ = (
+        active_index('idx_skills_student_name', 'student_id', 'skill_name'),
+    )
 
     skill_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey('student_profiles.student_id', ondelete='CASCADE'), nullable=False)
@@ -4,6 +4,8 @@ Courses Routes
 from flask import Blueprint, request
 from app.utils.auth import token_required, user_type_required, get_current_user
 from app.utils.helpers import success_response, error_response, paginate
+from app.utils.conditional import conditional, check_not_modified
+from app.services.cache_tags import cached_view
 from app.models.all_models import Course, CourseEnrollment
 from app.extensions import db
 
@@ -12,6 +14,8 @@ courses_bp = Blueprint('courses', __name__)
 
 @courses_bp.route('/', methods=['GET'])
 @token_required
+@conditional(max_age=60, private=True)
+@cached_view(tags=['courses'])
 def get_courses():
     """Get all courses"""
     query = Course.query.filter_by(deleted_at=None)
@@ -34,6 +38,12 @@ def get_courses():
             )
         )
 
+    # Any change to a listed course bumps its updated_at; removals change the count
+    count, last_updated = query.with_entities(db.func.count(Course.course_id), db.func.max(Course.updated_at)).first()
+    not_modified = check_not_modified(request.query_string.decode(), count, last_updated)
+    if not_modified:
+        return not_modified
+
     query = query.order_by(Course.total_students.desc())
     result = paginate(query)
     return success_response(data=result)
@@ -41,6 +51,8 @@ def get_courses():
 
 @courses_bp.route('/<course_id>', methods=['GET'])
 @token_required
+@conditional(max_age=60, private=True)
+@cached_view(tags=lambda course_id: [f'course:{course_id}'])
 def get_course(course_id):
     """Get course details"""
     course = Course.query.filter_by(course_id=course_id, deleted_at=None).first()
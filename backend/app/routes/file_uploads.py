@@ -0,0 +1,354 @@
+"""
+Resumable Upload Routes (tus-like protocol)
+Init, append chunks at offsets, query status, finalize into content-addressed storage
+"""
+import os
+import base64
+import fcntl
+import hashlib
+from flask import Blueprint, request, current_app
+from werkzeug.utils import secure_filename
+from app.utils.auth import token_required, get_current_user
+from app.utils.helpers import success_response, error_response
+from app.utils.validators import validate_required_fields, validate_file
+from app.utils.file_handler import store_file, get_local_path
+from app.models.all_models import FileUpload
+from app.extensions import db
+
+file_uploads_bp = Blueprint('file_uploads', __name__)
+
+# Categories large enough to need resumable uploads
+RESUMABLE_CATEGORIES = ['courses', 'attachments']
+
+# tus "Checksum Mismatch" status code
+CHECKSUM_MISMATCH = 460
+
+
+def partial_path(upload_id):
+    """Relative path of the partial file for an in-progress upload"""
+    return f"/uploads/.partial/{upload_id}.part"
+
+
+def get_my_upload(upload_id, user):
+    """Get an upload owned by user (or None)"""
+    return FileUpload.query.filter_by(
+        file_id=upload_id,
+        user_id=user.user_id,
+        deleted_at=None
+    ).first()
+
+
+def upload_headers(upload):
+    """tus headers describing upload progress"""
+    return {
+        'Upload-Offset': str(upload.bytes_received),
+        'Upload-Length': str(upload.file_size),
+        'Cache-Control': 'no-store'
+    }
+
+
+def parse_checksum_header(header):
+    """
+    Parse an Upload-Checksum header ("<algorithm> <base64 digest>")
+
+    Returns:
+        tuple: (hashlib object, expected digest bytes) or (None, None)
+    """
+    if not header:
+        return None, None
+
+    try:
+        algorithm, encoded = header.strip().split(' ', 1)
+        return hashlib.new(algorithm.lower()), base64.b64decode(encoded)
+    except ValueError:
+        raise ValueError('Upload-Checksum must be "<algorithm> <base64 digest>"')
+
+
+def is_sha256_hex(value):
+    """Whether value is a hex encoded SHA-256 digest"""
+    return (
+        isinstance(value, str)
+        and len(value) == 64
+        and all(c in '0123456789abcdef' for c in value.lower())
+    )
+
+
+def fail_upload(upload_id, full_path):
+    """Put a claimed upload in the terminal 'failed' state and drop its partial file"""
+    FileUpload.query.filter_by(file_id=upload_id, upload_status='finalizing').update(
+        {'upload_status': 'failed'},
+        synchronize_session=False
+    )
+    db.session.commit()
+
+    if os.path.exists(full_path):
+        os.remove(full_path)
+
+
+@file_uploads_bp.route('/', methods=['POST'])
+@token_required
+def init_upload():
+    """
+    Start a resumable upload
+    Body: {filename, size, category}
+    """
+    user = get_current_user()
+    data = request.get_json() or {}
+
+    valid, error = validate_required_fields(data, ['filename', 'size', 'category'])
+    if not valid:
+        return error_response(error, status=400)
+
+    if data['category'] not in RESUMABLE_CATEGORIES:
+        return error_response(f"Invalid category. Must be one of: {', '.join(RESUMABLE_CATEGORIES)}", status=400)
+
+    filename = secure_filename(data['filename'])
+    valid, error = validate_file(filename)
+    if not valid:
+        return error_response(error, status=400)
+
+    try:
+        size = int(data['size'])
+    except (TypeError, ValueError):
+        return error_response('size must be an integer', status=400)
+
+    max_size = current_app.config.get('RESUMABLE_UPLOAD_MAX_SIZE', 2147483648)
+    if size <= 0 or size > max_size:
+        return error_response(f'size must be between 1 and {max_size} bytes', status=400)
+
+    try:
+        upload = FileUpload(
+            user_id=user.user_id,
+            file_name=filename,
+            file_path='',
+            file_type=data.get('file_type'),
+            file_size=size,
+            category=data['category'],
+            upload_status='uploading',
+            bytes_received=0,
+            reference_count=0
+        )
+        db.session.add(upload)
+        db.session.flush()
+
+        upload.file_path = partial_path(upload.file_id)
+        full_path = get_local_path(upload.file_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        open(full_path, 'wb').close()
+
+        db.session.commit()
+
+        response, status = success_response(
+            data={**upload.to_dict(), 'chunk_size': current_app.config.get('RESUMABLE_UPLOAD_CHUNK_SIZE')},
+            message='Upload created',
+            status=201
+        )
+        response.headers.update(upload_headers(upload))
+        response.headers['Location'] = f"{request.base_url.rstrip('/')}/{upload.file_id}"
+        return response, status
+
+    except Exception as e:
+        db.session.rollback()
+        return error_response(f'Failed to create upload: {str(e)}', status=500)
+
+
+@file_uploads_bp.route('/<upload_id>', methods=['HEAD', 'GET'])
+@token_required
+def get_upload_status(upload_id):
+    """Get upload progress (HEAD returns tus headers only)"""
+    user = get_current_user()
+    upload = get_my_upload(upload_id, user)
+
+    if not upload:
+        return error_response('Upload not found', status=404)
+
+    response, status = success_response(data=upload.to_dict())
+    response.headers.update(upload_headers(upload))
+    return response, status
+
+
+@file_uploads_bp.route('/<upload_id>', methods=['PATCH'])
+@token_required
+def append_chunk(upload_id):
+    """
+    Append a chunk at the current offset
+    Headers: Upload-Offset (required), Upload-Checksum (optional, e.g. "sha256 <base64>")
+    Body: raw chunk bytes (application/offset+octet-stream)
+    """
+    user = get_current_user()
+    upload = get_my_upload(upload_id, user)
+
+    if not upload:
+        return error_response('Upload not found', status=404)
+
+    if upload.upload_status != 'uploading':
+        return error_response('Upload already finalized', status=409)
+
+    try:
+        offset = int(request.headers['Upload-Offset'])
+    except (KeyError, ValueError):
+        return error_response('Upload-Offset header required', status=400)
+
+    if offset != upload.bytes_received:
+        response, status = error_response('Upload-Offset does not match current offset', status=409)
+        response.headers.update(upload_headers(upload))
+        return response, status
+
+    length = request.content_length
+    if not length:
+        return error_response('Content-Length header required', status=411)
+
+    max_chunk = current_app.config.get('RESUMABLE_UPLOAD_CHUNK_SIZE', 8388608)
+    if length > max_chunk:
+        return error_response(f'Chunk exceeds {max_chunk} bytes', status=413)
+
+    if offset + length > upload.file_size:
+        return error_response('Chunk exceeds declared upload size', status=400)
+
+    try:
+        digest, expected = parse_checksum_header(request.headers.get('Upload-Checksum'))
+    except ValueError as e:
+        return error_response(str(e), status=400)
+
+    full_path = get_local_path(upload.file_path)
+    read_size = current_app.config.get('UPLOAD_CHUNK_SIZE', 65536)
+
+    try:
+        with open(full_path, 'r+b') as out:
+            try:
+                fcntl.flock(out, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return error_response('Another chunk is being written to this upload', status=423)
+
+            # Write straight to disk at the offset, never holding the chunk in memory
+            out.seek(offset)
+            written = 0
+            while True:
+                chunk = request.stream.read(read_size)
+                if not chunk:
+                    break
+                if digest:
+                    digest.update(chunk)
+                out.write(chunk)
+                written += len(chunk)
+
+            if written != length or (digest and digest.digest() != expected):
+                out.truncate(offset)
+                if written != length:
+                    return error_response('Incomplete chunk received', status=400)
+                return error_response('Checksum mismatch', status=CHECKSUM_MISMATCH)
+
+            out.flush()
+            os.fsync(out.fileno())
+
+            # Advance only if nobody else moved the offset meanwhile
+            updated = FileUpload.query.filter_by(
+                file_id=upload.file_id,
+                bytes_received=offset
+            ).update({'bytes_received': offset + written}, synchronize_session=False)
+            db.session.commit()
+
+        if not updated:
+            return error_response('Upload-Offset changed during write', status=409)
+
+        db.session.refresh(upload)
+        response, status = success_response(data=upload.to_dict())
+        response.headers.update(upload_headers(upload))
+        return response, 200
+
+    except OSError as e:
+        db.session.rollback()
+        return error_response(f'Failed to write chunk: {str(e)}', status=500)
+
+
+@file_uploads_bp.route('/<upload_id>/finalize', methods=['POST'])
+@token_required
+def finalize_upload(upload_id):
+    """
+    Complete an upload once every byte has been received
+    Body (optional): {sha256: hex digest of the whole file}
+    """
+    user = get_current_user()
+    data = request.get_json(silent=True) or {}
+    upload = get_my_upload(upload_id, user)
+
+    if not upload:
+        return error_response('Upload not found', status=404)
+
+    if not isinstance(data, dict):
+        return error_response('Request body must be a JSON object', status=400)
+
+    expected_hash = data.get('sha256')
+    if expected_hash is not None and not is_sha256_hex(expected_hash):
+        return error_response('sha256 must be a 64 character hex digest', status=400)
+
+    if upload.upload_status == 'complete':
+        return success_response(data=upload.to_dict(), message='Upload already finalized')
+
+    if upload.upload_status != 'uploading':
+        return error_response(f'Upload is {upload.upload_status}', status=409)
+
+    if upload.bytes_received != upload.file_size:
+        response, status = error_response('Upload is incomplete', status=409)
+        response.headers.update(upload_headers(upload))
+        return response, status
+
+    # Claim the upload so concurrent finalize calls cannot both store it
+    claimed = FileUpload.query.filter_by(
+        file_id=upload.file_id,
+        upload_status='uploading',
+        deleted_at=None
+    ).update({'upload_status': 'finalizing'}, synchronize_session=False)
+    db.session.commit()
+
+    if not claimed:
+        return error_response('Upload is already being finalized', status=409)
+
+    full_path = get_local_path(upload.file_path)
+    read_size = current_app.config.get('UPLOAD_CHUNK_SIZE', 65536)
+
+    try:
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(read_size), b''):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        if expected_hash and expected_hash.lower() != content_hash:
+            fail_upload(upload.file_id, full_path)
+            return error_response('Checksum mismatch', status=CHECKSUM_MISMATCH)
+
+        ext = upload.file_name.rsplit('.', 1)[1].lower()
+        store_file(
+            full_path,
+            content_hash=content_hash,
+            size=upload.file_size,
+            ext=ext,
+            category=upload.category,
+            original_filename=upload.file_name,
+            record=upload
+        )
+        return success_response(data=upload.to_dict(), message='Upload complete')
+
+    except Exception as e:
+        db.session.rollback()
+        fail_upload(upload.file_id, full_path)
+        return error_response(f'Failed to finalize upload: {str(e)}', status=500)
+
+
+@file_uploads_bp.route('/<upload_id>', methods=['DELETE'])
+@token_required
+def cancel_upload(upload_id):
+    """Cancel an in-progress upload"""
+    user = get_current_user()
+    upload = get_my_upload(upload_id, user)
+
+    if not upload or upload.upload_status != 'uploading':
+        return error_response('Upload not found', status=404)
+
+    full_path = get_local_path(upload.file_path)
+    if os.path.exists(full_path):
+        os.remove(full_path)
+
+    upload.soft_delete()
+    return success_response(message='Upload cancelled')
@@ -1,16 +1,46 @@
 """
 Job Routes
 """
-from flask import Blueprint, request
+import csv
+import json
+import codecs
+from flask import Blueprint, Response, request, current_app, stream_with_context
 from datetime import datetime
-from app.utils.auth import token_required, user_type_required, get_current_user
-from app.utils.helpers import success_response, error_response, paginate, parse_datetime
+from app.utils.auth import token_required, user_type_required, get_current_user, get_viewer_key
+from app.utils.helpers import success_response, error_response, paginate, parse_datetime, iter_csv_lines
 from app.utils.validators import validate_required_fields
+from app.utils.idempotency import idempotent
+from app.utils.conditional import conditional, check_not_modified
+from app.services.cache_tags import cached
 from app.models.all_models import Job, JobSkillRequired, JobApplication, SavedJob
+from app.models.student import StudentProfile
+from app.services import job_import
+from app.services.view_counter import record_job_view, get_pending_views, get_unique_viewers
+from app.services.ai_matching import load_student_signals, cache_job_skills
+from app.services.ranking import rank_applications, score_applicants
+from app.services.query_stats import query_budget
+from app.services.applications import (
+    APPLICATION_STATUSES, submit_application, queue_status_side_effects, apply_status_changes,
+    iter_application_export
+)
 from app.extensions import db
 
 jobs_bp = Blueprint('jobs', __name__)
 
+# Max applications per bulk status update
+BULK_STATUS_MAX_ITEMS = 500
+
+# Columns of the applications export, in order
+EXPORT_COLUMNS = ['application_id', 'student_name', 'email', 'status', 'match_score',
+                  'skills', 'resume_url', 'applied_at']
+
+# Content types accepted by the bulk job import
+IMPORT_FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+
 
 @jobs_bp.route('/', methods=['GET'])
 def get_jobs():
@@ -71,6 +101,7 @@ def get_jobs():
 
 
 @jobs_bp.route('/<job_id>', methods=['GET'])
+@conditional(max_age=0)
 def get_job(job_id):
     """Get single job (public)"""
     job = Job.query.filter_by(job_id=job_id, deleted_at=None).first()
@@ -78,11 +109,49 @@ def get_job(job_id):
     if not job:
         return error_response('Job not found', status=404)
 
-    # Increment views
-    job.views_count += 1
-    db.session.commit()
+    # Count the view in the buffered counter (flushed in batches, no write here)
+    record_job_view(job.job_id, get_viewer_key())
 
-    return success_response(data=job.to_dict(include_skills=True))
+    # Edits bump updated_at; view/application counters are bumped without it
+    not_modified = check_not_modified(job.job_id, job.updated_at, job.views_count, job.applications_count)
+    if not_modified:
+        return not_modified
+
+    data = dict(job_detail(job))  # Cached values are shared, never mutate them
+    # Counters change without bumping the job's tag; always serve them fresh
+    data['views_count'] = job.views_count
+    data['applications_count'] = job.applications_count
+    return success_response(data=data)
+
+
+@cached('job_detail', key=lambda job: job.job_id, tags=lambda job: [f'job:{job.job_id}'])
+def job_detail(job):
+    """Job with its skills (cached until the job or its skills change)"""
+    return job.to_dict(include_skills=True)
+
+
+@jobs_bp.route('/<job_id>/views', methods=['GET'])
+@token_required
+@user_type_required('employer')
+def get_job_views(job_id):
+    """Get view statistics for a job (employer only)"""
+    user = get_current_user()
+    job = Job.query.filter_by(
+        job_id=job_id,
+        employer_id=user.employer_profile.employer_id,
+        deleted_at=None
+    ).first()
+
+    if not job:
+        return error_response('Job not found or unauthorized', status=404)
+
+    days = min(request.args.get('days', 7, type=int), current_app.config.get('VIEW_UNIQUE_RETENTION_DAYS', 30))
+
+    return success_response(data={
+        'job_id': job.job_id,
+        'views_count': (job.views_count or 0) + get_pending_views(job.job_id),
+        'unique_viewers': get_unique_viewers(job.job_id, days=max(days, 1))
+    })
 
 
 @jobs_bp.route('/', methods=['POST'])
@@ -97,45 +166,94 @@ def create_job():
     if not valid:
         return error_response(error, status=400)
 
+    skill_names = data.get('skills') if isinstance(data.get('skills'), list) else []
+
     try:
-        job = Job(
-            employer_id=user.employer_profile.employer_id,
-            title=data['title'],
-            company_name=user.employer_profile.company_name,
-            description=data['description'],
-            location=data.get('location'),
-            job_type=data['job_type'],
-            work_mode=data.get('work_mode'),
-            salary_min=data.get('salary_min'),
-            salary_max=data.get('salary_max'),
-            salary_currency=data.get('salary_currency', 'USD'),
-            salary_period=data.get('salary_period'),
-            requirements=data.get('requirements'),
-            expires_at=parse_datetime(data.get('expires_at')) if data.get('expires_at') else None,
-            status=data.get('status', 'active')
-        )
-        job.save()
-
-        # Add required skills
-        if 'skills' in data and isinstance(data['skills'], list):
-            for skill_name in data['skills']:
-                skill = JobSkillRequired(
-                    job_id=job.job_id,
-                    skill_name=skill_name,
-                    is_required=True
-                )
-                skill.save()
+        # Job and all skills are inserted and committed in one transaction
+        with Job.unit_of_work():
+            job = Job(
+                employer_id=user.employer_profile.employer_id,
+                title=data['title'],
+                company_name=user.employer_profile.company_name,
+                description=data['description'],
+                location=data.get('location'),
+                job_type=data['job_type'],
+                work_mode=data.get('work_mode'),
+                salary_min=data.get('salary_min'),
+                salary_max=data.get('salary_max'),
+                salary_currency=data.get('salary_currency', 'USD'),
+                salary_period=data.get('salary_period'),
+                requirements=data.get('requirements'),
+                expires_at=parse_datetime(data.get('expires_at')) if data.get('expires_at') else None,
+                status=data.get('status', 'active')
+            )
+            job.save(commit=False)
 
-        return success_response(
-            data=job.to_dict(include_skills=True),
-            message='Job created successfully',
-            status=201
-        )
+            # Add required skills
+            for skill_name in skill_names:
+                JobSkillRequired(job=job, skill_name=skill_name, is_required=True).save(commit=False)
+
+            db.session.flush()
+
+            # Built before commit so no attribute is reloaded afterwards
+            job_data = job.to_dict()
+            job_data['skills'] = list(skill_names)
 
     except Exception as e:
         db.session.rollback()
         return error_response(f'Failed to create job: {str(e)}', status=500)
 
+    # The job is committed; a cold skills cache is refilled on first match
+    try:
+        cache_job_skills(job_data['job_id'], skill_names)
+    except Exception as e:
+        current_app.logger.warning(f"Failed to cache skills of job {job_data['job_id']}: {e}")
+
+    return success_response(
+        data=job_data,
+        message='Job created successfully',
+        status=201
+    )
+
+
+@jobs_bp.route('/import', methods=['POST'])
+@token_required
+@user_type_required('employer')
+def import_jobs():
+    """
+    Bulk import job postings (employers only)
+    Body: NDJSON (application/x-ndjson, one job object per line) or CSV
+    (text/csv with a header row; skills separated by ; or |), streamed
+    """
+    user = get_current_user()
+    employer = user.employer_profile
+
+    import_format = request.args.get('format') or IMPORT_FORMATS.get(request.mimetype)
+    if import_format not in ('ndjson', 'csv'):
+        return error_response('Send NDJSON (application/x-ndjson) or CSV (text/csv), or pass ?format=ndjson|csv', status=415)
+
+    # Decode and parse the body line by line instead of buffering it
+    lines = codecs.iterdecode(request.stream, 'utf-8-sig')
+    rows = job_import.iter_ndjson(lines) if import_format == 'ndjson' else job_import.iter_csv(lines)
+
+    try:
+        result = job_import.import_jobs(rows, employer)
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return error_response('Import body must be UTF-8 encoded', status=400)
+    except csv.Error as e:
+        db.session.rollback()
+        return error_response(f'Invalid CSV: {str(e)}', status=400)
+
+    if not result['imported']:
+        return error_response(f"No jobs imported, {result['failed']} row(s) failed", errors=result['errors'], status=400)
+
+    return success_response(
+        data=result,
+        message=f"Imported {result['imported']} job(s), {result['failed']} failed",
+        status=201
+    )
+
 
 @jobs_bp.route('/<job_id>', methods=['PUT'])
 @token_required
@@ -189,8 +307,12 @@ def delete_job(job_id):
 @jobs_bp.route('/<job_id>/apply', methods=['POST'])
 @token_required
 @user_type_required('student')
+@idempotent('apply')
 def apply_to_job(job_id):
-    """Apply to a job"""
+    """
+    Apply to a job
+    Headers: Idempotency-Key (optional) - retries with the same key replay the first response
+    """
     user = get_current_user()
     student = user.student_profile
     data = request.get_json() or {}
@@ -199,28 +321,16 @@ def apply_to_job(job_id):
     if not job:
         return error_response('Job not found or no longer active', status=404)
 
-    # Check if already applied
-    existing = JobApplication.query.filter_by(
-        job_id=job_id,
-        student_id=student.student_id,
-        deleted_at=None
-    ).first()
-
-    if existing:
-        return error_response('Already applied to this job', status=409)
-
     try:
-        application = JobApplication(
-            job_id=job_id,
-            student_id=student.student_id,
+        application = submit_application(
+            job,
+            student,
             cover_letter=data.get('cover_letter'),
-            resume_url=data.get('resume_url', student.resume_url)
+            resume_url=data.get('resume_url')
         )
-        application.save()
 
-        # Update student applications count
-        student.applications_count += 1
-        db.session.commit()
+        if not application:
+            return error_response('Already applied to this job', status=409)
 
         return success_response(
             data=application.to_dict(),
@@ -236,6 +346,7 @@ def apply_to_job(job_id):
 @jobs_bp.route('/applications/my', methods=['GET'])
 @token_required
 @user_type_required('student')
+@query_budget(6)
 def get_my_applications():
     """Get my job applications"""
     user = get_current_user()
@@ -253,19 +364,15 @@ def get_my_applications():
 @jobs_bp.route('/<job_id>/applications', methods=['GET'])
 @token_required
 @user_type_required('employer')
+@query_budget(12)
 def get_job_applications(job_id):
     """Get applications for a job (employer only)"""
-    print(f"[DEBUG] get_job_applications called for job_id: {job_id}")
     try:
         user = get_current_user()
-        print(f"[DEBUG] User: {user}, Type: {user.user_type if user else 'None'}")
 
         if not user or not user.employer_profile:
-            print(f"[DEBUG] No employer profile found")
             return error_response('Employer profile not found', status=404)
 
-        print(f"[DEBUG] Employer ID: {user.employer_profile.employer_id}")
-
         # Verify job belongs to employer
         job = Job.query.filter_by(
             job_id=job_id,
@@ -273,61 +380,130 @@ def get_job_applications(job_id):
             deleted_at=None
         ).first()
 
-        print(f"[DEBUG] Job found: {job is not None}")
-
         if not job:
-            print(f"[DEBUG] Job not found or doesn't belong to employer")
             return error_response('Job not found or unauthorized', status=404)
     except Exception as e:
-        print(f"[ERROR] get_job_applications exception: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        current_app.logger.exception(f'Error fetching applications for job {job_id}: {e}')
         return error_response(f'Error fetching applications: {str(e)}', status=500)
 
-    query = JobApplication.query.filter_by(
-        job_id=job_id,
-        deleted_at=None
-    ).order_by(JobApplication.applied_at.desc())
+    sort_by = request.args.get('sort_by', 'applied_at')
+    if sort_by not in ('applied_at', 'score'):
+        return error_response('sort_by must be applied_at or score', status=400)
 
-    # Filter by status
-    if 'status' in request.args:
-        query = query.filter_by(status=request.args['status'])
+    min_score = request.args.get('min_score', type=int)
 
     # Get page and per_page from request args
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
-    per_page = min(per_page, 100)  # Max limit
+    per_page = max(1, min(per_page, 100))  # Max limit
+    page = max(page, 1)
 
-    # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Students and their users come back with the applications themselves
+    query = JobApplication.query.filter_by(
+        job_id=job_id,
+        deleted_at=None
+    ).options(db.joinedload(JobApplication.student).joinedload(StudentProfile.user))
+
+    if sort_by == 'score' or min_score is not None:
+        # Rank every applicant from cached/bulk-computed scores, then load only this page
+        ranked = rank_applications(job, status=request.args.get('status'), min_score=min_score, sort_by=sort_by)
+        page_ids = [application_id for application_id, _, _ in ranked[(page - 1) * per_page:page * per_page]]
+        loaded = {app.application_id: app for app in query.filter(JobApplication.application_id.in_(page_ids))} if page_ids else {}
+        items = [loaded[application_id] for application_id in page_ids if application_id in loaded]
+        total = len(ranked)
+    else:
+        query = query.order_by(JobApplication.applied_at.desc())
+
+        # Filter by status
+        if 'status' in request.args:
+            query = query.filter_by(status=request.args['status'])
+
+        # Paginate
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        items, total = pagination.items, pagination.total
+
+    pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+
+    # Skills, education and experience for the whole page in bulk
+    signals = load_student_signals([app.student_id for app in items])
+    students = {app.student_id: app.student for app in items if app.student}
+    scores = score_applicants(
+        job,
+        {student_id: student.profile_version for student_id, student in students.items()},
+        students=students,
+        signals=signals
+    )
 
     # Serialize with student information
-    applications_data = [app.to_dict(include_student=True) for app in pagination.items]
+    applications_data = []
+    for app in items:
+        data = app.to_dict(include_student=True)
+        data['resume_url'] = app.resume_url or (app.student.resume_url if app.student else None)
+        data['match_score'] = scores.get(app.student_id)
+        if 'student' in data:
+            data['student']['skills'] = signals[app.student_id]['skills']
+        applications_data.append(data)
 
     result = {
         'data': applications_data,
         'meta': {
             'page': page,
             'per_page': per_page,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'has_next': pagination.has_next,
-            'has_prev': pagination.has_prev,
-            'next_page': page + 1 if pagination.has_next else None,
-            'prev_page': page - 1 if pagination.has_prev else None
+            'total': total,
+            'pages': pages,
+            'has_next': page < pages,
+            'has_prev': page > 1,
+            'next_page': page + 1 if page < pages else None,
+            'prev_page': page - 1 if page > 1 else None
         }
     }
 
     return success_response(data=result)
 
 
+@jobs_bp.route('/<job_id>/applications/export', methods=['GET'])
+@token_required
+@user_type_required('employer')
+def export_job_applications(job_id):
+    """
+    Export all applications of a job as a streamed download (employer only)
+    Query: format=csv|ndjson (default csv), status
+    """
+    user = get_current_user()
+
+    job = Job.query.filter_by(
+        job_id=job_id,
+        employer_id=user.employer_profile.employer_id,
+        deleted_at=None
+    ).first()
+
+    if not job:
+        return error_response('Job not found or unauthorized', status=404)
+
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return error_response('format must be csv or ndjson', status=400)
+
+    rows = iter_application_export(job, status=request.args.get('status'))
+
+    if export_format == 'ndjson':
+        body = (json.dumps(row) + '\n' for row in rows)
+        mimetype = 'application/x-ndjson'
+    else:
+        body = iter_csv_lines(EXPORT_COLUMNS, rows)
+        mimetype = 'text/csv'
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=applications-{job_id}.{export_format}'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
 @jobs_bp.route('/applications/<application_id>/status', methods=['PUT'])
 @token_required
 @user_type_required('employer')
 def update_application_status(application_id):
     """Update application status (employer only)"""
-    from app.models.all_models import Conversation, ConversationParticipant, Message, Notification
-
     user = get_current_user()
     data = request.get_json()
 
@@ -335,10 +511,8 @@ def update_application_status(application_id):
     if not valid:
         return error_response(error, status=400)
 
-    # Valid statuses
-    valid_statuses = ['pending', 'reviewing', 'shortlisted', 'rejected', 'accepted']
-    if data['status'] not in valid_statuses:
-        return error_response(f"Invalid status. Must be one of: {', '.join(valid_statuses)}", status=400)
+    if data['status'] not in APPLICATION_STATUSES:
+        return error_response(f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}", status=400)
 
     application = JobApplication.query.filter_by(
         application_id=application_id,
@@ -349,84 +523,17 @@ def update_application_status(application_id):
         return error_response('Application not found', status=404)
 
     # Verify application belongs to employer's job
-    if application.job.employer_id != user.employer_profile.employer_id:
+    job = application.job
+    if job.employer_id != user.employer_profile.employer_id:
         return error_response('Unauthorized', status=403)
 
     old_status = application.status
     application.status = data['status']
 
-    print(f"[DEBUG] Status change: {old_status} -> {data['status']}")
-    print(f"[DEBUG] Should send message: {data['status'] == 'accepted' and old_status != 'accepted'}")
-
     try:
-        # If application is accepted, create conversation and send message
-        if data['status'] == 'accepted' and old_status != 'accepted':
-            print(f"[DEBUG] Creating conversation and sending message...")
-            employer_user_id = user.user_id
-            student_user_id = application.student.user.user_id
-            print(f"[DEBUG] Employer user ID: {employer_user_id}, Student user ID: {student_user_id}")
-
-            # Check if conversation already exists between employer and student
-            existing_conversation = db.session.query(Conversation).join(
-                ConversationParticipant,
-                Conversation.conversation_id == ConversationParticipant.conversation_id
-            ).filter(
-                ConversationParticipant.user_id.in_([employer_user_id, student_user_id]),
-                Conversation.deleted_at == None
-            ).group_by(Conversation.conversation_id).having(
-                db.func.count(ConversationParticipant.user_id) == 2
-            ).first()
-
-            if not existing_conversation:
-                # Create new conversation
-                print(f"[DEBUG] Creating new conversation...")
-                conversation = Conversation()
-                conversation.save()
-                print(f"[DEBUG] Conversation created with ID: {conversation.conversation_id}")
-
-                # Add participants
-                employer_participant = ConversationParticipant(
-                    conversation_id=conversation.conversation_id,
-                    user_id=employer_user_id
-                )
-                employer_participant.save()
-                print(f"[DEBUG] Added employer participant")
-
-                student_participant = ConversationParticipant(
-                    conversation_id=conversation.conversation_id,
-                    user_id=student_user_id
-                )
-                student_participant.save()
-                print(f"[DEBUG] Added student participant")
-            else:
-                conversation = existing_conversation
-                print(f"[DEBUG] Using existing conversation ID: {conversation.conversation_id}")
-
-            # Send automated message from employer to student
-            message_text = f"Congratulations! Your application for the {application.job.title} position has been accepted. We're excited to move forward with you. Feel free to reach out if you have any questions!"
-
-            print(f"[DEBUG] Creating message...")
-            message = Message(
-                conversation_id=conversation.conversation_id,
-                sender_id=employer_user_id,
-                message_text=message_text
-            )
-            message.save()
-            print(f"[DEBUG] Message saved with ID: {message.message_id}")
-
-            # Create notification for student
-            print(f"[DEBUG] Creating notification...")
-            notification = Notification(
-                user_id=student_user_id,
-                type='application_accepted',
-                title='Application Accepted!',
-                message=f'Your application for {application.job.title} at {application.job.company_name} has been accepted!',
-                link_url=f'/student/applications'
-            )
-            notification.save()
-            print(f"[DEBUG] Notification saved with ID: {notification.notification_id}")
-            print(f"[DEBUG] *** Message and notification created successfully! ***")
-
+        # Conversation, acceptance message and notification are sent by the
+        # outbox worker; the event commits atomically with the status change
+        queue_status_side_effects(application, old_status, data['status'], job)
         db.session.commit()
 
         return success_response(
@@ -439,6 +546,112 @@ def update_application_status(application_id):
         return error_response(f'Failed to update application status: {str(e)}', status=500)
 
 
+@jobs_bp.route('/<job_id>/applications/status', methods=['PUT'])
+@token_required
+@user_type_required('employer')
+def bulk_update_application_status(job_id):
+    """
+    Update the status of many applications of a job (employer only)
+    Body: {updates: [{application_id, status}, ...]}
+       or {application_ids: [...], status}
+    """
+    user = get_current_user()
+    data = request.get_json() or {}
+
+    if 'updates' in data:
+        updates = data['updates']
+    elif 'application_ids' in data and 'status' in data:
+        if not isinstance(data['application_ids'], list):
+            return error_response('application_ids must be an array', status=400)
+        updates = [{'application_id': application_id, 'status': data['status']} for application_id in data['application_ids']]
+    else:
+        return error_response('updates or application_ids and status are required', status=400)
+
+    if not isinstance(updates, list) or not updates:
+        return error_response('updates must be a non-empty array', status=400)
+
+    if len(updates) > BULK_STATUS_MAX_ITEMS:
+        return error_response(f'At most {BULK_STATUS_MAX_ITEMS} applications can be updated at once', status=400)
+
+    order = []          # application ids, or the result entry of a malformed item
+    results = {}
+    requested = {}
+    for index, item in enumerate(updates):
+        application_id = item.get('application_id') if isinstance(item, dict) else None
+        status = item.get('status') if isinstance(item, dict) else None
+        if not application_id or not isinstance(application_id, str):
+            order.append({
+                'index': index,
+                'application_id': None,
+                'result': 'invalid',
+                'error': 'Each update must be an object with an application_id'
+            })
+            continue
+        if application_id not in order:
+            order.append(application_id)
+        if application_id in requested or application_id in results:
+            results[application_id] = {'result': 'invalid', 'error': 'Duplicate application_id'}
+            requested.pop(application_id, None)
+        elif status not in APPLICATION_STATUSES:
+            results[application_id] = {'result': 'invalid', 'error': f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}"}
+        else:
+            requested[application_id] = status
+
+    try:
+        # Ownership and current statuses in one joined query; rows stay locked until commit
+        rows = db.session.query(JobApplication, Job).join(
+            Job, JobApplication.job_id == Job.job_id
+        ).filter(
+            Job.job_id == job_id,
+            Job.employer_id == user.employer_profile.employer_id,
+            Job.deleted_at.is_(None),
+            JobApplication.application_id.in_(list(requested)),
+            JobApplication.deleted_at.is_(None)
+        ).with_for_update(of=JobApplication).all() if requested else []
+
+        if not rows and not Job.query.filter_by(
+            job_id=job_id,
+            employer_id=user.employer_profile.employer_id,
+            deleted_at=None
+        ).first():
+            db.session.rollback()
+            return error_response('Job not found or unauthorized', status=404)
+
+        job = rows[0][1] if rows else None
+        changes = {}
+        for application, _ in rows:
+            status = requested[application.application_id]
+            results[application.application_id] = {
+                'result': 'unchanged' if application.status == status else 'updated',
+                'old_status': application.status,
+                'status': status
+            }
+            if application.status != status:
+                changes[application] = status
+
+        for application_id in requested:
+            results.setdefault(application_id, {'result': 'not_found', 'error': 'Application not found'})
+
+        apply_status_changes(job, changes)
+        db.session.commit()
+
+        items = [
+            entry if isinstance(entry, dict) else {'application_id': entry, **results[entry]}
+            for entry in order
+        ]
+        return success_response(
+            data={
+                'results': items,
+                'updated': sum(1 for item in items if item['result'] == 'updated')
+            },
+            message=f'{len(changes)} application(s) updated'
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        return error_response(f'Failed to update application statuses: {str(e)}', status=500)
+
+
 @jobs_bp.route('/<job_id>/save', methods=['POST'])
 @token_required
 @user_type_required('student')
@@ -511,6 +724,7 @@ def get_my_saved_jobs():
 @jobs_bp.route('/recommendations', methods=['GET'])
 @token_required
 @user_type_required('student')
+@query_budget(12)
 def get_recommended_jobs():
     """Get AI-matched job recommendations"""
     user = get_current_user()
@@ -519,6 +733,7 @@ def get_recommended_jobs():
     from app.services.ai_matching import get_recommended_jobs
 
     limit = request.args.get('limit', 10, type=int)
+    limit = max(1, min(limit, current_app.config.get('PAGINATION_MAX_LIMIT', 100)))
     recommendations = get_recommended_jobs(student, limit=limit)
 
     return success_response(data=recommendations, message=f'Found {len(recommendations)} recommended jobs')
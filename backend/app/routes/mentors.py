@@ -1,10 +1,14 @@
 """
 Mentor Routes
 """
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
 from app.utils.auth import token_required, user_type_required, get_current_user
 from app.utils.helpers import success_response, error_response, paginate, parse_datetime
 from app.utils.validators import validate_required_fields
+from app.utils.conditional import conditional
+from app.services.cache_tags import cached_view
+from app.services.ai_matching import load_mentor_expertise
+from app.services.query_stats import query_budget
 from app.models.all_models import MentorProfile, MentorshipRequest, MentorshipSession, MentorshipReview
 from app.extensions import db
 
@@ -12,6 +16,9 @@ mentors_bp = Blueprint('mentors', __name__)
 
 
 @mentors_bp.route('/', methods=['GET'])
+@conditional(max_age=60)
+@cached_view(tags=['mentors'])
+@query_budget(6)
 def get_mentors():
     """Get all mentors (public)"""
     query = MentorProfile.query.filter_by(deleted_at=None)
@@ -41,12 +48,16 @@ def get_mentors():
     result = paginate(query)
     # Transform data to include expertise
     if 'data' in result and isinstance(result['data'], list):
-        result['data'] = [mentor.to_dict(include_expertise=True) for mentor in query.limit(result['meta']['per_page']).offset((result['meta']['page'] - 1) * result['meta']['per_page']).all()]
+        mentors = query.limit(result['meta']['per_page']).offset((result['meta']['page'] - 1) * result['meta']['per_page']).all()
+        expertise = load_mentor_expertise([mentor.mentor_id for mentor in mentors])
+        result['data'] = [mentor.to_dict(expertise=expertise[mentor.mentor_id]) for mentor in mentors]
 
     return success_response(data=result)
 
 
 @mentors_bp.route('/<mentor_id>', methods=['GET'])
+@conditional(max_age=60)
+@cached_view(tags=lambda mentor_id: [f'mentor:{mentor_id}'])
 def get_mentor(mentor_id):
     """Get mentor profile (public)"""
     mentor = MentorProfile.query.filter_by(mentor_id=mentor_id, deleted_at=None).first()
@@ -131,7 +142,8 @@ def get_my_requests():
 @user_type_required('mentor')
 def respond_to_request(request_id):
     """Respond to mentorship request (accept/reject) and send message to student"""
-    from app.models.all_models import Conversation, ConversationParticipant, Message
+    from app.models.all_models import Message
+    from app.services.conversations import get_or_create_direct_conversation
 
     user = get_current_user()
     data = request.get_json()
@@ -160,33 +172,8 @@ def respond_to_request(request_id):
         request_obj.responded_at = db.func.current_timestamp()
 
         # Create or get conversation between mentor and student
-        existing_conversation = Conversation.query.join(ConversationParticipant).filter(
-            ConversationParticipant.user_id.in_([user.user_id, request_obj.student_id]),
-            Conversation.deleted_at.is_(None)
-        ).group_by(Conversation.conversation_id).having(
-            db.func.count(ConversationParticipant.participant_id) == 2
-        ).first()
-
-        if not existing_conversation:
-            # Create new conversation
-            conversation = Conversation()
-            conversation.save()
-
-            # Add mentor participant
-            ConversationParticipant(
-                conversation_id=conversation.conversation_id,
-                user_id=user.user_id
-            ).save()
-
-            # Add student participant
-            ConversationParticipant(
-                conversation_id=conversation.conversation_id,
-                user_id=request_obj.student_id
-            ).save()
-
-            conversation_id = conversation.conversation_id
-        else:
-            conversation_id = existing_conversation.conversation_id
+        conversation, _ = get_or_create_direct_conversation(user.user_id, request_obj.student_id, commit=False)
+        conversation_id = conversation.conversation_id
 
         # Send message to student
         mentor_name = user.mentor_profile.full_name
@@ -293,6 +280,7 @@ def review_session(session_id):
 @mentors_bp.route('/recommendations', methods=['GET'])
 @token_required
 @user_type_required('student')
+@query_budget(12)
 def get_recommended_mentors():
     """Get AI-matched mentor recommendations"""
     user = get_current_user()
@@ -301,6 +289,7 @@ def get_recommended_mentors():
     from app.services.ai_matching import get_recommended_mentors
 
     limit = request.args.get('limit', 10, type=int)
+    limit = max(1, min(limit, current_app.config.get('PAGINATION_MAX_LIMIT', 100)))
     recommendations = get_recommended_mentors(student, limit=limit)
 
     return success_response(data=recommendations, message=f'Found {len(recommendations)} recommended mentors')
@@ -4,9 +4,11 @@ Real-time messaging handled by WebSockets
 """
 from flask import Blueprint, request
 from app.utils.auth import token_required, get_current_user
-from app.utils.helpers import success_response, error_response, paginate
+from app.utils.helpers import success_response, stream_success_response, error_response, paginate
 from app.utils.validators import validate_required_fields
 from app.models.all_models import Conversation, ConversationParticipant, Message
+from app.services.conversations import get_or_create_direct_conversation
+from app.services.query_stats import query_budget
 from app.extensions import db
 
 messaging_bp = Blueprint('messaging', __name__)
@@ -14,6 +16,7 @@ messaging_bp = Blueprint('messaging', __name__)
 
 @messaging_bp.route('/conversations', methods=['GET'])
 @token_required
+@query_budget(8)
 def get_conversations():
     """Get my conversations"""
     from app.models.user import User
@@ -21,7 +24,6 @@ def get_conversations():
     from app.models.all_models import EmployerProfile
 
     user = get_current_user()
-    print(f"[DEBUG get_conversations] User ID: {user.user_id}")
 
     # Get conversations where user is participant
     conversations = Conversation.query.join(ConversationParticipant).filter(
@@ -29,55 +31,65 @@ def get_conversations():
         ConversationParticipant.deleted_at.is_(None),
         Conversation.deleted_at.is_(None)
     ).order_by(Conversation.updated_at.desc()).all()
+    conversation_ids = [conv.conversation_id for conv in conversations]
 
-    print(f"[DEBUG get_conversations] Found {len(conversations)} conversations")
+    # Other participants, their users and profiles for every conversation at once
+    participants = ConversationParticipant.query.filter(
+        ConversationParticipant.conversation_id.in_(conversation_ids),
+        ConversationParticipant.user_id != user.user_id,
+        ConversationParticipant.deleted_at.is_(None)
+    ).all() if conversation_ids else []
+
+    user_ids = {p.user_id for p in participants}
+    users = {u.user_id: u for u in User.query.filter(User.user_id.in_(user_ids))} if user_ids else {}
+
+    profile_info = {}
+    student_ids = [u.user_id for u in users.values() if u.user_type == 'student']
+    if student_ids:
+        for profile in StudentProfile.query.filter(StudentProfile.student_id.in_(student_ids)):
+            profile_info[profile.student_id] = {
+                'full_name': profile.full_name,
+                'profile_picture_url': profile.profile_picture
+            }
+    employer_ids = [u.user_id for u in users.values() if u.user_type == 'employer']
+    if employer_ids:
+        for profile in EmployerProfile.query.filter(EmployerProfile.employer_id.in_(employer_ids)):
+            profile_info[profile.employer_id] = {
+                'full_name': profile.company_name,
+                'profile_picture_url': profile.company_logo
+            }
+
+    other_participants = {}
+    for p in participants:
+        participant_user = users.get(p.user_id)
+        if participant_user:
+            other_participants.setdefault(p.conversation_id, []).append({
+                'user_id': participant_user.user_id,
+                'email': participant_user.email,
+                'user_type': participant_user.user_type,
+                **profile_info.get(participant_user.user_id, {})
+            })
+
+    # Latest message of every conversation in one query
+    latest_messages = {}
+    if conversation_ids:
+        latest = db.session.query(
+            Message.conversation_id,
+            db.func.max(Message.sent_at).label('sent_at')
+        ).filter(
+            Message.conversation_id.in_(conversation_ids),
+            Message.deleted_at.is_(None)
+        ).group_by(Message.conversation_id).subquery()
+
+        for message in Message.query.join(latest, db.and_(
+            Message.conversation_id == latest.c.conversation_id,
+            Message.sent_at == latest.c.sent_at
+        )).filter(Message.deleted_at.is_(None)):
+            latest_messages.setdefault(message.conversation_id, message)
 
-    # Manually build conversation list with participant info
     conversations_data = []
     for conv in conversations:
-        # Get all participants except current user
-        participants = ConversationParticipant.query.filter_by(
-            conversation_id=conv.conversation_id,
-            deleted_at=None
-        ).all()
-
-        print(f"[DEBUG] Conversation {conv.conversation_id} has {len(participants)} participants")
-
-        # Get the other participant (not current user)
-        other_participants = []
-        for p in participants:
-            if p.user_id != user.user_id:
-                participant_user = User.query.get(p.user_id)
-                if participant_user:
-                    # Get profile info based on user type
-                    profile_info = {}
-                    if participant_user.user_type == 'student':
-                        student_profile = StudentProfile.query.filter_by(student_id=participant_user.user_id).first()
-                        if student_profile:
-                            profile_info = {
-                                'full_name': student_profile.full_name,
-                                'profile_picture_url': student_profile.profile_picture
-                            }
-                    elif participant_user.user_type == 'employer':
-                        employer_profile = EmployerProfile.query.filter_by(employer_id=participant_user.user_id).first()
-                        if employer_profile:
-                            profile_info = {
-                                'full_name': employer_profile.company_name,
-                                'profile_picture_url': employer_profile.company_logo
-                            }
-
-                    other_participants.append({
-                        'user_id': participant_user.user_id,
-                        'email': participant_user.email,
-                        'user_type': participant_user.user_type,
-                        **profile_info
-                    })
-
-        # Get latest message
-        latest_message = Message.query.filter_by(
-            conversation_id=conv.conversation_id,
-            deleted_at=None
-        ).order_by(Message.sent_at.desc()).first()
+        latest_message = latest_messages.get(conv.conversation_id)
 
         latest_message_data = None
         if latest_message:
@@ -92,12 +104,10 @@ def get_conversations():
             'conversation_id': conv.conversation_id,
             'created_at': conv.created_at.isoformat() if conv.created_at else None,
             'updated_at': conv.updated_at.isoformat() if conv.updated_at else None,
-            'participants': other_participants,
+            'participants': other_participants.get(conv.conversation_id, []),
             'latest_message': latest_message_data
         })
 
-    print(f"[DEBUG get_conversations] Returning {len(conversations_data)} conversations")
-
     result = {
         'data': conversations_data,
         'meta': {
@@ -145,7 +155,8 @@ def get_conversation(conversation_id):
         deleted_at=None
     ).order_by(Message.sent_at.asc())
 
-    messages = [msg.to_dict() for msg in messages_query.all()]
+    # Long histories are encoded and sent in chunks as rows arrive
+    messages = (msg.to_dict() for msg in messages_query.yield_per(500))
 
     # Get participants with full details
     participants_query = ConversationParticipant.query.filter_by(
@@ -186,11 +197,10 @@ def get_conversation(conversation_id):
         'conversation_id': conversation.conversation_id,
         'created_at': conversation.created_at.isoformat() if conversation.created_at else None,
         'updated_at': conversation.updated_at.isoformat() if conversation.updated_at else None,
-        'participants': participants,
-        'messages': messages
+        'participants': participants
     }
 
-    return success_response(data=data)
+    return stream_success_response(data, 'messages', messages)
 
 
 @messaging_bp.route('/conversations', methods=['POST'])
@@ -213,7 +223,17 @@ def create_conversation():
         participant_ids.append(user.user_id)
 
     try:
-        # Create conversation
+        # 1:1 chats reuse the existing direct conversation for the pair
+        if len(set(participant_ids)) == 2:
+            other_id = next(pid for pid in participant_ids if pid != user.user_id)
+            conversation, created = get_or_create_direct_conversation(user.user_id, other_id)
+            return success_response(
+                data={'conversation_id': conversation.conversation_id},
+                message='Conversation created successfully' if created else 'Conversation already exists',
+                status=201 if created else 200
+            )
+
+        # Create group conversation
         conversation = Conversation()
         conversation.save()
 
@@ -0,0 +1,26 @@
+"""
+Metrics Routes
+Prometheus scrape endpoint
+"""
+import hmac
+from flask import Blueprint, request, current_app, Response, abort
+from app.extensions import limiter
+from app.services.metrics import render
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# Scraped every few seconds; never rate limited
+limiter.exempt(metrics_bp)
+
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics of all workers (Bearer METRICS_TOKEN when configured)"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        provided = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(provided, token):
+            abort(403)
+
+    body, content_type = render()
+    return Response(body, content_type=content_type)
@@ -0,0 +1,71 @@
+"""
+Notification Routes
+Real-time delivery handled by WebSockets (notification event in the user room)
+"""
+from flask import Blueprint, request, current_app
+from app.utils.auth import token_required, get_current_user
+from app.utils.helpers import success_response, error_response
+from app.services import notifications as notification_service
+from app.extensions import db
+
+notifications_bp = Blueprint('notifications', __name__)
+
+
+@notifications_bp.route('/', methods=['GET'])
+@token_required
+def get_notifications():
+    """Get my notifications (cursor-paginated, newest first)"""
+    user = get_current_user()
+
+    limit = request.args.get('per_page', current_app.config.get('PAGINATION_DEFAULT_LIMIT', 20), type=int)
+    limit = max(1, min(limit, current_app.config.get('PAGINATION_MAX_LIMIT', 100)))
+
+    result = notification_service.list_notifications(
+        user.user_id,
+        cursor=request.args.get('cursor'),
+        limit=limit,
+        unread_only=request.args.get('unread', '').lower() == 'true'
+    )
+    result['meta']['unread_count'] = notification_service.get_unread_count(user.user_id)
+
+    return success_response(data=result)
+
+
+@notifications_bp.route('/unread-count', methods=['GET'])
+@token_required
+def get_unread_count():
+    """Get unread notification count"""
+    user = get_current_user()
+    return success_response(data={'unread_count': notification_service.get_unread_count(user.user_id)})
+
+
+@notifications_bp.route('/mark-read', methods=['POST'])
+@token_required
+def mark_notifications_read():
+    """
+    Mark notifications as read
+    Body: {notification_ids: [...]} or {all: true}
+    """
+    user = get_current_user()
+    data = request.get_json() or {}
+
+    if data.get('all'):
+        notification_ids = None
+    else:
+        notification_ids = data.get('notification_ids')
+        if not isinstance(notification_ids, list) or len(notification_ids) == 0:
+            return error_response('notification_ids must be a non-empty array or all must be true', status=400)
+
+    try:
+        updated = notification_service.mark_read(user.user_id, notification_ids)
+        return success_response(
+            data={
+                'updated': updated,
+                'unread_count': notification_service.get_unread_count(user.user_id)
+            },
+            message='Notifications marked as read'
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        return error_response(f'Failed to mark notifications as read: {str(e)}', status=500)
@@ -5,7 +5,9 @@ from flask import Blueprint, request
 from app.utils.auth import token_required, user_type_required, get_current_user
 from app.utils.helpers import success_response, error_response, paginate, parse_date
 from app.utils.validators import validate_required_fields, validate_date_range
-from app.utils.file_handler import save_file
+from app.utils.file_handler import save_file, delete_file
+from app.services.image_processing import process_image, swap_file_url
+from app.services.cache_tags import cached_view
 from app.models.student import StudentProfile, StudentEducation, StudentExperience, StudentSkill
 from app.extensions import db
 
@@ -28,6 +30,7 @@ def get_students():
 
 @students_bp.route('/<student_id>', methods=['GET'])
 @token_required
+@cached_view(tags=lambda student_id: [f'student:{student_id}'])
 def get_student(student_id):
     """Get single student profile"""
     student = StudentProfile.query.filter_by(student_id=student_id, deleted_at=None).first()
@@ -81,15 +84,28 @@ def upload_profile_picture():
     user = get_current_user()
     student = user.student_profile
 
-    result = save_file(file, category='profiles', resize_image=(400, 400))
+    result = save_file(file, category='profiles', user_id=user.user_id)
 
     if not result['success']:
         return error_response(result['error'], status=400)
 
+    previous = student.profile_picture
     student.profile_picture = result['file_path']
     db.session.commit()
 
-    return success_response(data={'profile_picture': student.profile_picture},
+    # Release the replaced picture (removed from disk once nothing uses it)
+    delete_file(previous)
+
+    # Resize in the background and swap to the resized variant when ready
+    student_id = student.student_id
+
+    def use_resized(file_path, variants):
+        swap_file_url(StudentProfile.profile_picture, file_path, variants['default'],
+                      StudentProfile.student_id == student_id)
+
+    variants = process_image(result['file_path'], resize_image=(400, 400), on_ready=use_resized)
+
+    return success_response(data={'profile_picture': student.profile_picture, 'variants': variants},
                           message='Profile picture uploaded successfully')
 
 
@@ -105,14 +121,17 @@ def upload_resume():
     user = get_current_user()
     student = user.student_profile
 
-    result = save_file(file, category='resumes')
+    result = save_file(file, category='resumes', user_id=user.user_id)
 
     if not result['success']:
         return error_response(result['error'], status=400)
 
+    previous = student.resume_url
     student.resume_url = result['file_path']
     db.session.commit()
 
+    delete_file(previous)
+
     return success_response(data={'resume_url': student.resume_url},
                           message='Resume uploaded successfully')
 
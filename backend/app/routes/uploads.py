@@ -0,0 +1,78 @@
+"""
+Upload Serving Routes
+Serve files under /uploads with ETags, Range requests and long-lived caching
+"""
+import os
+import re
+import mimetypes
+from flask import Blueprint, request, current_app, send_file, abort, Response
+from werkzeug.security import safe_join
+from app.extensions import limiter
+
+uploads_bp = Blueprint('uploads', __name__)
+
+# Video seeking issues many Range requests; don't count them against API limits
+limiter.exempt(uploads_bp)
+
+# <sha256>.<ext> or a rendered variant such as <sha256>_thumb.webp
+CONTENT_ADDRESSED_NAME = re.compile(r'^(?P<hash>[0-9a-f]{64})(?P<variant>_[a-z0-9]+)?\.[a-z0-9]+$')
+
+IMMUTABLE_MAX_AGE = 31536000  # 1 year
+
+
+@uploads_bp.route('/<path:file_path>', methods=['GET', 'HEAD'])
+def serve_upload(file_path):
+    """Serve an uploaded file (public)"""
+    upload_folder = os.path.abspath(current_app.config.get('UPLOAD_FOLDER', './uploads'))
+    full_path = safe_join(upload_folder, file_path)
+
+    if not full_path or not os.path.isfile(full_path):
+        abort(404)
+
+    # Never expose in-progress uploads (.partial/) or temp files being written
+    if any(part.startswith('.') for part in file_path.split('/')) or file_path.endswith(('.part', '.tmp')):
+        abort(404)
+
+    match = CONTENT_ADDRESSED_NAME.match(os.path.basename(file_path))
+    immutable = match is not None
+
+    # Content hash is a strong validator for the original; variants use size/mtime
+    etag = match.group('hash') if match and not match.group('variant') else True
+    max_age = IMMUTABLE_MAX_AGE if immutable else current_app.config.get('UPLOADS_CACHE_MAX_AGE', 3600)
+
+    accel_prefix = current_app.config.get('UPLOADS_ACCEL_REDIRECT_PREFIX')
+    if accel_prefix:
+        response = accel_redirect_response(full_path, file_path, accel_prefix, etag)
+    else:
+        response = send_file(
+            full_path,
+            conditional=True,
+            etag=etag,
+            max_age=max_age
+        )
+
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if immutable:
+        response.cache_control.immutable = True
+
+    return response
+
+
+def accel_redirect_response(full_path, file_path, prefix, etag):
+    """
+    Hand the transfer to nginx via X-Accel-Redirect
+
+    nginx handles Range and sendfile; the app still answers If-None-Match.
+    """
+    stat = os.stat(full_path)
+    response = Response(mimetype=mimetypes.guess_type(full_path)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{file_path}"
+
+    if etag is True:
+        etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    response.set_etag(etag)
+    response.last_modified = int(stat.st_mtime)
+
+    return response.make_conditional(request)
@@ -2,6 +2,7 @@
 AI Matching Service
 Calculate match scores between students and jobs/mentors
 """
+from app.services.single_flight import single_flight
 
 
 def calculate_job_match_score(student, job):
@@ -15,12 +16,189 @@ def calculate_job_match_score(student, job):
     - Experience alignment
     - Location preferences
     """
+    signals = load_student_signals([student.student_id])[student.student_id]
+    return job_match_score(student, job, get_job_skills(job), signals)
+
+
+JOB_SKILLS_KEY = 'job_skills:{job_id}'
+
+
+def get_job_skills(job):
+    """Lowercased names of a job's required skills (cached per job)"""
+    from app.extensions import cache
+
+    key = JOB_SKILLS_KEY.format(job_id=job.job_id)
+    skills = cache.get(key)
+
+    if skills is None:
+        skills = cache_job_skills(job.job_id, [
+            skill.skill_name for skill in job.skills_required.filter_by(deleted_at=None)
+        ])
+
+    return set(skills)
+
+
+def get_jobs_skills(jobs):
+    """
+    Lowercased required skill names of many jobs: one cache round trip, plus
+    one query for the jobs missing from the cache
+
+    Returns:
+        dict: {job_id: set of skill names}
+    """
+    from app.extensions import cache
+
+    job_ids = [job.job_id for job in jobs]
+    cached = cache.get_many(*[JOB_SKILLS_KEY.format(job_id=job_id) for job_id in job_ids]) if job_ids else []
+    skills = {job_id: names for job_id, names in zip(job_ids, cached) if names is not None}
+
+    missing = [job_id for job_id in job_ids if job_id not in skills]
+    if missing:
+        skills.update(cache_jobs_skills(load_job_skills(missing)))
+
+    return {job_id: set(names) for job_id, names in skills.items()}
+
+
+def load_job_skills(job_ids):
+    """
+    Required skill names of many jobs in one query
+
+    Returns:
+        dict: {job_id: [skill names]}
+    """
+    from app.extensions import db
+    from app.models.all_models import JobSkillRequired
+
+    skills = {job_id: [] for job_id in job_ids}
+    if not skills:
+        return skills
+
+    rows = db.session.query(JobSkillRequired.job_id, JobSkillRequired.skill_name).filter(
+        JobSkillRequired.job_id.in_(skills),
+        JobSkillRequired.deleted_at.is_(None)
+    )
+    for job_id, skill_name in rows:
+        skills[job_id].append(skill_name)
+    return skills
+
+
+def load_mentor_expertise(mentor_ids):
+    """
+    Expertise areas of many mentors in one query
+
+    Returns:
+        dict: {mentor_id: [expertise areas]}
+    """
+    from app.extensions import db
+    from app.models.all_models import MentorExpertise
+
+    expertise = {mentor_id: [] for mentor_id in mentor_ids}
+    if not expertise:
+        return expertise
+
+    rows = db.session.query(MentorExpertise.mentor_id, MentorExpertise.expertise_area).filter(
+        MentorExpertise.mentor_id.in_(expertise),
+        MentorExpertise.deleted_at.is_(None)
+    )
+    for mentor_id, area in rows:
+        expertise[mentor_id].append(area)
+    return expertise
+
+
+def cache_job_skills(job_id, skill_names):
+    """Store a job's required skill names for matching (e.g. right after creating it)"""
+    return cache_jobs_skills({job_id: skill_names})[job_id]
+
+
+def cache_jobs_skills(skills_by_job):
+    """
+    Store required skill names of many jobs in one cache round trip
+
+    Args:
+        skills_by_job: Dict of job_id -> list of skill names
+
+    Returns:
+        dict: {job_id: sorted lowercased skill names}
+    """
+    from flask import current_app
+    from app.extensions import cache
+
+    normalized = {
+        job_id: sorted({name.lower() for name in skill_names})
+        for job_id, skill_names in skills_by_job.items()
+    }
+    if normalized:
+        cache.set_many(
+            {JOB_SKILLS_KEY.format(job_id=job_id): skills for job_id, skills in normalized.items()},
+            timeout=current_app.config.get('RANKING_SCORE_CACHE_TIMEOUT', 86400)
+        )
+    return normalized
+
+
+def load_student_signals(student_ids):
+    """
+    Bulk load the profile data job matching needs for many students
+
+    Three queries regardless of how many students are passed.
+
+    Returns:
+        dict: {student_id: {'skills': [names], 'current_field': str or None,
+                            'experience_count': int}}
+    """
+    from app.extensions import db
+    from app.models.student import StudentSkill, StudentEducation, StudentExperience
+
+    signals = {
+        student_id: {'skills': [], 'current_field': None, 'experience_count': 0}
+        for student_id in student_ids
+    }
+    if not signals:
+        return signals
+
+    skills = db.session.query(StudentSkill.student_id, StudentSkill.skill_name).filter(
+        StudentSkill.student_id.in_(signals),
+        StudentSkill.deleted_at.is_(None)
+    ).order_by(StudentSkill.created_at)
+    for student_id, skill_name in skills:
+        signals[student_id]['skills'].append(skill_name)
+
+    education = db.session.query(StudentEducation.student_id, StudentEducation.field_of_study).filter(
+        StudentEducation.student_id.in_(signals),
+        StudentEducation.is_current == True,
+        StudentEducation.deleted_at.is_(None)
+    )
+    for student_id, field_of_study in education:
+        if signals[student_id]['current_field'] is None:
+            signals[student_id]['current_field'] = field_of_study
+
+    experience = db.session.query(StudentExperience.student_id, db.func.count()).filter(
+        StudentExperience.student_id.in_(signals),
+        StudentExperience.deleted_at.is_(None)
+    ).group_by(StudentExperience.student_id)
+    for student_id, count in experience:
+        signals[student_id]['experience_count'] = count
+
+    return signals
+
+
+def job_match_score(student, job, job_skills, signals):
+    """
+    Score a student against a job from preloaded data (no queries)
+
+    Args:
+        student: StudentProfile (only its own columns are read)
+        job: Job
+        job_skills: Result of get_job_skills(job)
+        signals: The student's entry from load_student_signals()
+
+    Returns:
+        int: Score between 0-100
+    """
     score = 0
     max_score = 100
 
     # 1. Skill Matching (40 points)
-    student_skills = {skill.skill_name.lower() for skill in student.skills.filter_by(deleted_at=None)}
-    job_skills = {skill.skill_name.lower() for skill in job.skills_required.filter_by(deleted_at=None)}
+    student_skills = {skill.lower() for skill in signals['skills']}
 
     if job_skills:
         skill_match_ratio = len(student_skills & job_skills) / len(job_skills)
@@ -28,11 +206,10 @@ def calculate_job_match_score(student, job):
 
     # 2. Education Relevance (20 points)
     # Check if field of study is relevant to job
-    education = student.education.filter_by(deleted_at=None, is_current=True).first()
-    if education:
+    if signals['current_field']:
         # Simple keyword matching (can be enhanced with NLP)
         job_keywords = job.title.lower().split() + (job.description or '').lower().split()
-        education_field = education.field_of_study.lower()
+        education_field = signals['current_field'].lower()
 
         if any(keyword in education_field for keyword in job_keywords[:5]):
             score += 20
@@ -40,7 +217,7 @@ def calculate_job_match_score(student, job):
             score += 10  # Partial credit for having education
 
     # 3. Experience Level (20 points)
-    experience_count = student.experience.filter_by(deleted_at=None).count()
+    experience_count = signals['experience_count']
     if job.job_type == 'internship':
         score += min(experience_count * 10, 20)  # Internships don't need much experience
     elif job.job_type == 'full-time':
@@ -68,7 +245,7 @@ def calculate_job_match_score(student, job):
         completeness += 3
     if student.portfolio_url or student.github_url:
         completeness += 3
-    if student.skills.count() >= 3:
+    if len(signals['skills']) >= 3:
         completeness += 2
 
     score += completeness
@@ -87,11 +264,39 @@ def calculate_mentor_match_score(student, mentor):
     - Industry match
     - Experience level
     """
+    expertise = load_mentor_expertise([mentor.mentor_id])[mentor.mentor_id]
+    signals = load_student_signals([student.student_id])[student.student_id]
+    return mentor_match_score(mentor, expertise, signals, recent_position(student))
+
+
+def recent_position(student):
+    """Position of the student's most recent experience (or None)"""
+    from app.models.student import StudentExperience
+
+    experience = student.experience.filter_by(deleted_at=None).order_by(
+        StudentExperience.start_date.desc()
+    ).first()
+    return experience.position if experience else None
+
+
+def mentor_match_score(mentor, expertise, signals, position):
+    """
+    Score a mentor for a student from preloaded data (no queries)
+
+    Args:
+        mentor: MentorProfile
+        expertise: The mentor's entry from load_mentor_expertise()
+        signals: The student's entry from load_student_signals()
+        position: Result of recent_position(student)
+
+    Returns:
+        int: Score between 0-100
+    """
     score = 0
 
     # 1. Skill Overlap (35 points)
-    student_skills = {skill.skill_name.lower() for skill in student.skills.filter_by(deleted_at=None)}
-    mentor_expertise = {exp.expertise_area.lower() for exp in mentor.expertise.filter_by(deleted_at=None)}
+    student_skills = {skill.lower() for skill in signals['skills']}
+    mentor_expertise = {area.lower() for area in expertise}
 
     if mentor_expertise:
         overlap_ratio = len(student_skills & mentor_expertise) / len(mentor_expertise)
@@ -99,10 +304,9 @@ def calculate_mentor_match_score(student, mentor):
 
     # 2. Career Path Alignment (25 points)
     # Check if student's target roles align with mentor's experience
-    recent_experience = student.experience.filter_by(deleted_at=None).order_by('-start_date').first()
-    if recent_experience:
-        if mentor.current_role.lower() in recent_experience.position.lower() or \
-           recent_experience.position.lower() in mentor.current_role.lower():
+    if position:
+        if mentor.current_role.lower() in position.lower() or \
+           position.lower() in mentor.current_role.lower():
             score += 25
         else:
             score += 10
@@ -117,10 +321,9 @@ def calculate_mentor_match_score(student, mentor):
         score += 5
 
     # 4. Education Relevance (15 points)
-    education = student.education.filter_by(deleted_at=None, is_current=True).first()
-    if education:
+    if signals['current_field']:
         # If mentor's company or role relates to student's field
-        if education.field_of_study.lower() in (mentor.current_role + ' ' + mentor.current_company).lower():
+        if signals['current_field'].lower() in (mentor.current_role + ' ' + mentor.current_company).lower():
             score += 15
         else:
             score += 5
@@ -128,6 +331,13 @@ def calculate_mentor_match_score(student, mentor):
     return min(int(score), 100)
 
 
+# Profile edits bump profile_version and job changes the 'jobs' tag, so both
+# get fresh recommendations at once
+@single_flight(
+    'job_recommendations',
+    key=lambda student, limit=10: (student.student_id, student.profile_version, limit),
+    ttl=60, stale_ttl=600, tags=['jobs']
+)
 def get_recommended_jobs(student, limit=10):
     """
     Get top recommended jobs for student
@@ -136,21 +346,30 @@ def get_recommended_jobs(student, limit=10):
 
     active_jobs = Job.query.filter_by(status='active', deleted_at=None).all()
 
-    # Calculate match scores
-    job_scores = []
-    for job in active_jobs:
-        match_score = calculate_job_match_score(student, job)
-        job_scores.append((job, match_score))
+    # Calculate match scores from data loaded once for all jobs
+    signals = load_student_signals([student.student_id])[student.student_id]
+    skills = get_jobs_skills(active_jobs)
+    job_scores = [
+        (job, job_match_score(student, job, skills[job.job_id], signals))
+        for job in active_jobs
+    ]
 
     # Sort by score and return top matches
     job_scores.sort(key=lambda x: x[1], reverse=True)
+    top = job_scores[:limit]
+    names = load_job_skills([job.job_id for job, _ in top])
 
     return [
-        {**job.to_dict(include_skills=True), 'match_score': score}
-        for job, score in job_scores[:limit]
+        {**job.to_dict(skills=names[job.job_id]), 'match_score': score}
+        for job, score in top
     ]
 
 
+@single_flight(
+    'mentor_recommendations',
+    key=lambda student, limit=10: (student.student_id, student.profile_version, limit),
+    ttl=300, stale_ttl=3600, tags=['mentors']
+)
 def get_recommended_mentors(student, limit=10):
     """
     Get top recommended mentors for student
@@ -159,16 +378,19 @@ def get_recommended_mentors(student, limit=10):
 
     mentors = MentorProfile.query.filter_by(deleted_at=None).all()
 
-    # Calculate match scores
-    mentor_scores = []
-    for mentor in mentors:
-        match_score = calculate_mentor_match_score(student, mentor)
-        mentor_scores.append((mentor, match_score))
+    # Calculate match scores from data loaded once for all mentors
+    signals = load_student_signals([student.student_id])[student.student_id]
+    position = recent_position(student)
+    expertise = load_mentor_expertise([mentor.mentor_id for mentor in mentors])
+    mentor_scores = [
+        (mentor, mentor_match_score(mentor, expertise[mentor.mentor_id], signals, position))
+        for mentor in mentors
+    ]
 
     # Sort by score and return top matches
     mentor_scores.sort(key=lambda x: x[1], reverse=True)
 
     return [
-        {**mentor.to_dict(include_expertise=True), 'match_score': score}
+        {**mentor.to_dict(expertise=expertise[mentor.mentor_id]), 'match_score': score}
         for mentor, score in mentor_scores[:limit]
     ]
@@ -0,0 +1,249 @@
+"""
+Application Service
+Job application status changes and their side effects (delivered through the outbox)
+"""
+import uuid
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.extensions import db
+from app.models.all_models import Conversation, Job, JobApplication, Message
+from app.models.student import StudentProfile
+from app.services import outbox
+from app.services.cache_tags import mark_changed
+from app.services.ai_matching import load_student_signals
+from app.services.ranking import score_applicants
+from app.services.conversations import direct_conversation_key, get_or_create_direct_conversation
+from app.services.notifications import notify
+from app.utils.file_handler import retain_file
+
+
+APPLICATION_STATUSES = ['pending', 'reviewing', 'shortlisted', 'rejected', 'accepted']
+
+APPLICATION_ACCEPTED = 'application.accepted'
+
+ACCEPTED_MESSAGE = (
+    "Congratulations! Your application for the {job_title} position has been accepted. "
+    "We're excited to move forward with you. Feel free to reach out if you have any questions!"
+)
+
+
+def submit_application(job, student, cover_letter=None, resume_url=None):
+    """
+    Insert an application and bump both counters in one transaction
+
+    INSERT ... ON CONFLICT DO NOTHING against the partial unique index makes
+    duplicate applies (including concurrent ones) a no-op instead of a
+    check-then-insert race, and the counters are incremented in SQL.
+
+    Args:
+        job: Active Job being applied to
+        student: Applying StudentProfile
+        cover_letter: Optional cover letter
+        resume_url: Resume for this application (defaults to the profile's)
+
+    Returns:
+        JobApplication or None if the student already applied (nothing written)
+    """
+    insert = postgresql_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+    resume_url = resume_url or student.resume_url
+
+    statement = insert(JobApplication).values(
+        job_id=job.job_id,
+        student_id=student.student_id,
+        cover_letter=cover_letter,
+        resume_url=resume_url
+    ).on_conflict_do_nothing(
+        index_elements=['job_id', 'student_id'],
+        index_where=JobApplication.deleted_at.is_(None)
+    ).returning(JobApplication.application_id)
+
+    application_id = db.session.execute(statement).scalar()
+    if application_id is None:
+        db.session.rollback()
+        return None
+
+    StudentProfile.query.filter_by(student_id=student.student_id).update(
+        {'applications_count': db.func.coalesce(StudentProfile.applications_count, 0) + 1},
+        synchronize_session=False
+    )
+    # Counter bump must not change updated_at (it versions cached match scores)
+    Job.query.filter_by(job_id=job.job_id).update(
+        {
+            'applications_count': db.func.coalesce(Job.applications_count, 0) + 1,
+            'updated_at': Job.updated_at
+        },
+        synchronize_session=False
+    )
+    # The application keeps its resume when the profile's is replaced
+    retain_file(resume_url)
+    mark_changed(student)
+    db.session.commit()
+
+    return db.session.get(JobApplication, application_id)
+
+
+def iter_application_export(job, status=None, chunk_size=None):
+    """
+    Stream every application of a job with student details and match score
+
+    Rows come from a server-side cursor (yield_per) with students and users
+    joined in; skills and scores are bulk-loaded per chunk, so memory and
+    query count per chunk stay constant however many applicants there are.
+
+    Args:
+        job: Job being exported (ownership already checked)
+        status: Optional application status filter
+        chunk_size: Rows per fetch (default EXPORT_CHUNK_SIZE)
+
+    Yields:
+        dict: One flat row per application
+    """
+    chunk_size = chunk_size or current_app.config.get('EXPORT_CHUNK_SIZE', 500)
+
+    statement = db.select(JobApplication).filter(
+        JobApplication.job_id == job.job_id,
+        JobApplication.deleted_at.is_(None)
+    ).options(
+        db.joinedload(JobApplication.student).joinedload(StudentProfile.user)
+    ).order_by(JobApplication.applied_at.desc())
+
+    if status:
+        statement = statement.filter(JobApplication.status == status)
+
+    result = db.session.execute(statement.execution_options(yield_per=chunk_size))
+
+    for chunk in result.scalars().partitions():
+        signals = load_student_signals([application.student_id for application in chunk])
+        students = {application.student_id: application.student for application in chunk if application.student}
+        scores = score_applicants(
+            job,
+            {student_id: student.profile_version for student_id, student in students.items()},
+            students=students,
+            signals=signals
+        )
+
+        for application in chunk:
+            student = application.student
+            yield {
+                'application_id': application.application_id,
+                'student_name': student.full_name if student else None,
+                'email': student.user.email if student and student.user else None,
+                'status': application.status,
+                'match_score': scores.get(application.student_id),
+                'skills': signals[application.student_id]['skills'],
+                'resume_url': application.resume_url or (student.resume_url if student else None),
+                'applied_at': application.applied_at.isoformat() if application.applied_at else None
+            }
+
+        # Drop the chunk from the identity map before fetching the next one
+        for application in chunk:
+            for obj in (application, application.student, application.student and application.student.user):
+                if obj is not None and obj in db.session:
+                    db.session.expunge(obj)
+
+
+def queue_status_side_effects(application, old_status, new_status, job):
+    """
+    Queue side effects of a status change in the caller's transaction
+
+    Args:
+        application: JobApplication being changed
+        old_status: Status before the change
+        new_status: Status after the change
+        job: The application's Job (employer_id, title, company_name)
+
+    Returns:
+        OutboxEvent or None
+    """
+    if new_status != 'accepted' or old_status == 'accepted':
+        return None
+
+    # Profile ids are the owning users' ids
+    return outbox.enqueue(APPLICATION_ACCEPTED, {
+        'application_id': application.application_id,
+        'employer_user_id': job.employer_id,
+        'student_user_id': application.student_id,
+        'job_title': job.title,
+        'company_name': job.company_name
+    })
+
+
+def apply_status_changes(job, changes):
+    """
+    Change the status of many applications of a job with one UPDATE
+
+    Args:
+        job: Job the applications belong to (ownership already checked)
+        changes: Dict of JobApplication -> new status; rows should be locked
+            by the caller (SELECT ... FOR UPDATE) so old statuses stay valid
+
+    Returns:
+        int: Number of rows updated
+    """
+    if not changes:
+        return 0
+
+    statuses = {application.application_id: status for application, status in changes.items()}
+
+    updated = JobApplication.query.filter(
+        JobApplication.job_id == job.job_id,
+        JobApplication.application_id.in_(statuses)
+    ).update({
+        'status': db.case(statuses, value=JobApplication.application_id),
+        'updated_at': datetime.utcnow()
+    }, synchronize_session=False)
+
+    for application, status in changes.items():
+        queue_status_side_effects(application, application.status, status, job)
+
+    return updated
+
+
+@outbox.handler(APPLICATION_ACCEPTED)
+def deliver_acceptances(events):
+    """
+    Open the employer/student conversation, send the acceptance message and
+    notify the student, for a batch of accepted applications
+    """
+    payloads = [event.payload for event in events]
+
+    keys = {direct_conversation_key(p['employer_user_id'], p['student_user_id']) for p in payloads}
+    conversations = {
+        c.direct_key: c
+        for c in Conversation.query.filter(
+            Conversation.direct_key.in_(keys),
+            Conversation.deleted_at.is_(None)
+        )
+    }
+
+    now = datetime.utcnow()
+    messages = []
+
+    for payload in payloads:
+        employer_user_id = payload['employer_user_id']
+        student_user_id = payload['student_user_id']
+
+        key = direct_conversation_key(employer_user_id, student_user_id)
+        if key not in conversations:
+            conversations[key], _ = get_or_create_direct_conversation(employer_user_id, student_user_id, commit=False)
+
+        messages.append({
+            'message_id': str(uuid.uuid4()),
+            'conversation_id': conversations[key].conversation_id,
+            'sender_id': employer_user_id,
+            'message_text': ACCEPTED_MESSAGE.format(job_title=payload['job_title']),
+            'sent_at': now,
+            'is_read': False
+        })
+        # Inserted with this transaction and pushed once it commits
+        notify(
+            user_id=student_user_id,
+            type='application_accepted',
+            title='Application Accepted!',
+            message=f"Your application for {payload['job_title']} at {payload['company_name']} has been accepted!",
+            link_url='/student/applications'
+        )
+
+    db.session.execute(db.insert(Message), messages)
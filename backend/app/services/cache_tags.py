@@ -0,0 +1,225 @@
+"""
+Tagged Cache
+Cache route and function results under dependency tags (job:<id>,
+mentor:<id>, student:<id>, ...) that are bumped automatically when rows
+behind them are committed
+
+Every tag has a version in the cache. Entries store the versions of their
+tags at build time and are only served while all of them are unchanged, so
+bumping a tag invalidates every entry that depends on it without having to
+know their keys.
+"""
+import time
+import hashlib
+from functools import wraps
+from flask import g, current_app, request, make_response
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from app.extensions import db, cache
+from app.models.all_models import (
+    Job, JobSkillRequired, EmployerProfile, MentorProfile, MentorExpertise, Course, CourseLesson
+)
+from app.models.student import StudentProfile, StudentSkill, StudentEducation, StudentExperience
+
+
+TAG_KEY = 'cache_tag:{tag}'
+ENTRY_KEY = 'cached:{name}:{digest}'
+
+# Tags a committed change to a row of each model invalidates
+TAG_RULES = {
+    Job: lambda job: [f'job:{job.job_id}', 'jobs'],
+    JobSkillRequired: lambda skill: [f'job:{skill.job_id}', 'jobs'],
+    EmployerProfile: lambda employer: [f'employer:{employer.employer_id}'],
+    MentorProfile: lambda mentor: [f'mentor:{mentor.mentor_id}', 'mentors'],
+    MentorExpertise: lambda expertise: [f'mentor:{expertise.mentor_id}', 'mentors'],
+    Course: lambda course: [f'course:{course.course_id}', 'courses'],
+    CourseLesson: lambda lesson: [f'course:{lesson.course_id}'],
+    StudentProfile: lambda student: [f'student:{student.student_id}'],
+    StudentSkill: lambda skill: [f'student:{skill.student_id}'],
+    StudentEducation: lambda education: [f'student:{education.student_id}'],
+    StudentExperience: lambda experience: [f'student:{experience.student_id}'],
+}
+
+
+def new_version():
+    return format(time.time_ns(), 'x')
+
+
+def bump_tags(tags):
+    """Invalidate every entry depending on any of the tags"""
+    if tags:
+        # Versions never expire; an evicted version just makes its entries miss
+        cache.set_many({TAG_KEY.format(tag=tag): new_version() for tag in tags}, timeout=0)
+
+
+def read(key, tags):
+    """
+    Read a raw entry and the current versions of tags in one round trip
+
+    Returns:
+        tuple: (entry or None, current tag versions)
+    """
+    tag_keys = [TAG_KEY.format(tag=tag) for tag in tags]
+    values = cache.get_many(key, *tag_keys)
+    entry, versions = values[0], list(values[1:])
+
+    missing = {tag_key: new_version() for tag_key, version in zip(tag_keys, versions) if version is None}
+    if missing:
+        cache.set_many(missing, timeout=0)
+        versions = [version or missing[tag_key] for tag_key, version in zip(tag_keys, versions)]
+
+    return entry, versions
+
+
+def lookup(key, tags):
+    """
+    Read an entry and the current versions of its tags in one round trip
+
+    Returns:
+        tuple: (entry value or None, current tag versions to store with a rebuilt value)
+    """
+    entry, versions = read(key, tags)
+    if entry is not None and entry['versions'] == versions:
+        return entry['value'], versions
+    return None, versions
+
+
+def store(key, versions, value, timeout=None):
+    cache.set(key, {'versions': versions, 'value': value},
+              timeout=timeout or current_app.config.get('TAGGED_CACHE_TIMEOUT', 3600))
+
+
+def entry_key(name, *parts):
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return ENTRY_KEY.format(name=name, digest=digest)
+
+
+def resolve_tags(tags, *args, **kwargs):
+    return list(tags(*args, **kwargs)) if callable(tags) else list(tags)
+
+
+def cached(name, tags, key=None, timeout=None):
+    """
+    Cache a function's result per arguments under dependency tags
+
+    Versions are read before the value is built, so a change committed while
+    building makes the stored entry stale instead of serving old data.
+
+    Args:
+        name: Cache namespace of the function
+        tags: List of tags or callable(*args, **kwargs) returning them
+        key: Optional callable(*args, **kwargs) returning the cache key parts
+            (defaults to the arguments themselves)
+        timeout: Seconds to keep entries (default TAGGED_CACHE_TIMEOUT)
+
+    Example:
+        @cached('job_detail', key=lambda job: job.job_id, tags=lambda job: [f'job:{job.job_id}'])
+        def job_detail(job):
+            return job.to_dict(include_skills=True)
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            parts = key(*args, **kwargs) if key else (args, sorted(kwargs.items()))
+            cache_key = entry_key(name, parts)
+
+            value, versions = lookup(cache_key, resolve_tags(tags, *args, **kwargs))
+            if value is None:
+                value = fn(*args, **kwargs)
+                store(cache_key, versions, value, timeout)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def cached_view(tags, timeout=None, per_user=False):
+    """
+    Cache a GET view's successful responses per URL (path and query string)
+
+    Goes inside @conditional; the ETag a view set with check_not_modified()
+    is cached with the body so hits validate against the same ETag.
+
+    Args:
+        tags: List of tags or callable(**view_args) returning them
+        timeout: Seconds to keep entries (default TAGGED_CACHE_TIMEOUT)
+        per_user: Key entries by the JWT identity too (responses differ per user)
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            parts = [request.full_path]
+            if per_user:
+                parts.append(get_jwt_identity())
+            cache_key = entry_key(f'view:{request.endpoint}', *parts)
+
+            stored, versions = lookup(cache_key, resolve_tags(tags, **kwargs))
+            if stored is not None:
+                response = make_response(stored['body'], 200)
+                response.mimetype = stored['mimetype']
+                g.etag = stored['etag']
+                return response
+
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                store(cache_key, versions, {
+                    'body': response.get_data(),
+                    'mimetype': response.mimetype,
+                    'etag': g.get('etag')
+                }, timeout)
+            return response
+
+        return wrapper
+    return decorator
+
+
+def queue_tags(*tags):
+    """Bump tags when the current transaction commits (dropped on rollback)"""
+    db.session.info.setdefault('cache_tags', set()).update(tags)
+
+
+def mark_changed(*objects):
+    """
+    Queue the tags of rows changed behind the ORM's back (bulk UPDATEs skip
+    the flush listeners) so they are bumped on commit
+    """
+    for obj in objects:
+        rule = TAG_RULES.get(type(obj))
+        if rule:
+            queue_tags(*rule(obj))
+
+
+def collect_tags(session, flush_context):
+    """Remember the tags of every row written by this flush"""
+    pending = session.info.setdefault('cache_tags', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        rule = TAG_RULES.get(type(obj))
+        if rule and (obj not in session.dirty or session.is_modified(obj)):
+            pending.update(rule(obj))
+
+
+def bump_committed_tags(session):
+    """Bump tags of rows that are now committed"""
+    tags = session.info.pop('cache_tags', None)
+    if not tags:
+        return
+    try:
+        bump_tags(tags)
+    except Exception as e:
+        # The data is committed; entries expire after TAGGED_CACHE_TIMEOUT at the latest
+        current_app.logger.warning(f'Failed to invalidate cache tags {sorted(tags)}: {e}')
+
+
+def discard_tags(session):
+    session.info.pop('cache_tags', None)
+
+
+def init_cache_tags(app):
+    """Bump cache tags of committed rows"""
+    for name, listener in [
+        ('after_flush', collect_tags),
+        ('after_commit', bump_committed_tags),
+        ('after_rollback', discard_tags),
+    ]:
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
@@ -0,0 +1,58 @@
+"""
+Conversation Service
+Direct (1:1) conversations keyed by a canonical participant-pair hash
+"""
+import hashlib
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.all_models import Conversation, ConversationParticipant
+
+
+def direct_conversation_key(user_id_a, user_id_b):
+    """Canonical key for the pair of users, independent of argument order"""
+    first, second = sorted([str(user_id_a), str(user_id_b)])
+    return hashlib.sha256(f"{first}:{second}".encode()).hexdigest()
+
+
+def get_or_create_direct_conversation(user_id_a, user_id_b, commit=True):
+    """
+    Get the 1:1 conversation between two users, creating it if needed
+
+    Uses a single indexed lookup on Conversation.direct_key. Creation runs in
+    a savepoint so a concurrent insert of the same pair (unique violation)
+    falls back to the existing row without discarding the caller's pending
+    changes.
+
+    Args:
+        user_id_a: First participant
+        user_id_b: Second participant
+        commit: Commit the transaction (False when the caller commits)
+
+    Returns:
+        tuple: (Conversation, created: bool)
+    """
+    key = direct_conversation_key(user_id_a, user_id_b)
+
+    conversation = Conversation.query.filter_by(direct_key=key, deleted_at=None).first()
+    if conversation:
+        return conversation, False
+
+    try:
+        with db.session.begin_nested():
+            conversation = Conversation(direct_key=key)
+            db.session.add(conversation)
+            db.session.flush()
+
+            db.session.add_all([
+                ConversationParticipant(conversation_id=conversation.conversation_id, user_id=user_id_a),
+                ConversationParticipant(conversation_id=conversation.conversation_id, user_id=user_id_b)
+            ])
+        created = True
+    except IntegrityError:
+        conversation = Conversation.query.filter_by(direct_key=key, deleted_at=None).first()
+        created = False
+
+    if commit:
+        db.session.commit()
+
+    return conversation, created
@@ -0,0 +1,196 @@
+"""
+Image Processing Service
+Resize uploaded images into variants in a process pool, off the request thread
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from PIL import Image, ImageOps
+from app.utils.file_handler import get_local_path
+
+
+_executor = None
+
+# Output formats PIL should use for each file extension
+SAVE_FORMATS = {
+    'jpg': 'JPEG',
+    'jpeg': 'JPEG',
+    'png': 'PNG',
+    'gif': 'GIF',
+    'webp': 'WEBP',
+}
+
+
+def get_executor(app):
+    """Get (or lazily create) the shared image processing pool"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=app.config.get('IMAGE_PROCESSING_WORKERS', 2),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _executor
+
+
+def variant_filename(filename, name, ext):
+    """Build variant file name, e.g. abc123.jpg -> abc123_thumb.webp"""
+    stem = filename.rsplit('.', 1)[0]
+    return f"{stem}_{name}.{ext}"
+
+
+def variant_urls(file_path, variants=None, formats=None):
+    """
+    Get the URLs variants of an uploaded image will have once processed
+
+    Args:
+        file_path: Relative path of the original (e.g. /uploads/profiles/abc.jpg)
+        variants: Dict of variant name -> (width, height)
+        formats: Extra output formats besides the original one
+
+    Returns:
+        dict: {variant_name: url, f'{variant_name}_{format}': url}
+    """
+    variants = variants or current_app.config.get('IMAGE_VARIANTS', {})
+    formats = formats if formats is not None else current_app.config.get('IMAGE_VARIANT_FORMATS', [])
+
+    folder, filename = file_path.rsplit('/', 1)
+    ext = filename.rsplit('.', 1)[1].lower()
+
+    urls = {}
+    for name in variants:
+        urls[name] = f"{folder}/{variant_filename(filename, name, ext)}"
+        for fmt in formats:
+            urls[f"{name}_{fmt}"] = f"{folder}/{variant_filename(filename, name, fmt)}"
+    return urls
+
+
+def render_variants(source_path, variants, formats):
+    """
+    Render resized variants of an image (runs inside a pool worker)
+
+    Variants are written to a temporary file and renamed into place so a
+    reader never sees a partially written image.
+
+    Args:
+        source_path: Absolute path of the original image
+        variants: Dict of variant name -> (width, height)
+        formats: Extra output formats besides the original one
+
+    Returns:
+        list: Absolute paths written
+    """
+    directory, filename = os.path.split(source_path)
+    ext = filename.rsplit('.', 1)[1].lower()
+    largest = (
+        max(size[0] for size in variants.values()),
+        max(size[1] for size in variants.values())
+    )
+
+    written = []
+    with Image.open(source_path) as img:
+        # Let the JPEG decoder downscale while decoding (no-op for other formats)
+        img.draft('RGB', largest)
+        img = ImageOps.exif_transpose(img)
+        img.load()
+
+        for name, size in variants.items():
+            resized = img.copy()
+            resized.thumbnail(size, Image.Resampling.LANCZOS)
+
+            for out_ext in [ext] + list(formats):
+                out = resized
+                if SAVE_FORMATS.get(out_ext) == 'JPEG' and out.mode not in ('RGB', 'L'):
+                    out = out.convert('RGB')
+
+                target = os.path.join(directory, variant_filename(filename, name, out_ext))
+                tmp_path = f"{target}.tmp"
+                out.save(tmp_path, format=SAVE_FORMATS.get(out_ext, out_ext.upper()))
+                os.replace(tmp_path, target)
+                written.append(target)
+
+    return written
+
+
+def process_image(file_path, resize_image=None, on_ready=None):
+    """
+    Schedule variant generation for an uploaded image and return immediately
+
+    Args:
+        file_path: Relative path returned by save_file (e.g. /uploads/profiles/abc.jpg)
+        resize_image: Tuple of (width, height) for the default variant
+        on_ready: Callable(file_path, variants) run in an app context once every
+            variant exists on disk
+
+    Returns:
+        dict: Variant URLs that will exist once processing finishes
+    """
+    app = current_app._get_current_object()
+
+    variants = dict(app.config.get('IMAGE_VARIANTS', {}))
+    if resize_image:
+        variants['default'] = tuple(resize_image)
+    formats = app.config.get('IMAGE_VARIANT_FORMATS', [])
+
+    source_path = get_local_path(file_path)
+    urls = variant_urls(file_path, variants, formats)
+
+    def finish(error=None):
+        if error:
+            app.logger.error(f'Error processing image {file_path}: {error}')
+            return
+        if on_ready:
+            with app.app_context():
+                try:
+                    on_ready(file_path, urls)
+                except Exception as e:
+                    app.logger.error(f'Error applying image variants for {file_path}: {e}')
+
+    # Content-addressed uploads reuse variants rendered for identical content
+    folder = os.path.dirname(source_path)
+    if all(os.path.exists(os.path.join(folder, url.rsplit('/', 1)[1])) for url in urls.values()):
+        finish()
+        return urls
+
+    if app.config.get('IMAGE_PROCESSING_WORKERS', 2) <= 0:
+        try:
+            render_variants(source_path, variants, formats)
+        except Exception as e:
+            finish(e)
+        else:
+            finish()
+        return urls
+
+    future = get_executor(app).submit(render_variants, source_path, variants, formats)
+    future.add_done_callback(lambda f: finish(f.exception()))
+
+    return urls
+
+
+def swap_file_url(column, old_url, new_url, *criteria):
+    """
+    Atomically replace a stored file URL, only if it still points at old_url
+
+    A newer upload that already replaced the URL is left untouched.
+
+    Args:
+        column: Model column holding the URL (e.g. StudentProfile.profile_picture)
+        old_url: URL written when the upload was accepted
+        new_url: Processed variant URL
+        *criteria: Extra filters identifying the row
+
+    Returns:
+        bool: True if the URL was swapped
+    """
+    from app.extensions import db
+    from app.services.cache_tags import mark_changed
+
+    model = column.class_
+    updated = model.query.filter(column == old_url, *criteria).update(
+        {column: new_url},
+        synchronize_session=False
+    )
+    if updated:
+        mark_changed(*model.query.filter(*criteria))
+    db.session.commit()
+    return updated > 0
@@ -0,0 +1,107 @@
+"""
+Job Expiry Service
+Close postings past expires_at in batches on a background schedule
+"""
+import time
+import threading
+from datetime import datetime
+from app.extensions import db, cache
+from app.models.all_models import Job
+from app.services.ai_matching import JOB_SKILLS_KEY
+from app.services.cache_tags import queue_tags
+
+
+_sweeper = None
+_lock = threading.Lock()
+
+
+def close_expired_jobs(batch_size=500, now=None):
+    """
+    Close active jobs whose expires_at has passed
+
+    Works in batches of batch_size (one SELECT of ids and one UPDATE per
+    batch, each committed) so a large backlog never holds long locks. The
+    UPDATE re-checks status, so concurrent sweepers in other processes are
+    harmless.
+
+    Returns:
+        list: IDs of the jobs closed
+    """
+    now = now or datetime.utcnow()
+    closed = []
+
+    while True:
+        job_ids = [row.job_id for row in db.session.query(Job.job_id).filter(
+            Job.status == 'active',
+            Job.deleted_at.is_(None),
+            Job.expires_at.isnot(None),
+            Job.expires_at <= now
+        ).limit(batch_size)]
+
+        if not job_ids:
+            break
+
+        Job.query.filter(
+            Job.job_id.in_(job_ids),
+            Job.status == 'active'
+        ).update({'status': 'closed'}, synchronize_session=False)
+        queue_tags('jobs', *[f'job:{job_id}' for job_id in job_ids])
+        db.session.commit()
+
+        evict_jobs(job_ids)
+        closed.extend(job_ids)
+
+        if len(job_ids) < batch_size:
+            break
+
+    return closed
+
+
+def evict_jobs(job_ids):
+    """Drop cached matching data of jobs that left the active set"""
+    if job_ids:
+        cache.delete_many(*[JOB_SKILLS_KEY.format(job_id=job_id) for job_id in job_ids])
+
+
+def sweep_in_app_context(app):
+    """Run one sweep, logging instead of raising"""
+    with app.app_context():
+        try:
+            closed = close_expired_jobs(app.config.get('JOB_EXPIRY_BATCH_SIZE', 500))
+            if closed:
+                app.logger.info(f'Closed {len(closed)} expired job(s)')
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f'Failed to close expired jobs: {e}')
+
+
+def start_sweeper(app):
+    """Start the background expiry sweeper for this process (once)"""
+    global _sweeper
+    if _sweeper is not None:
+        return
+
+    with _lock:
+        if _sweeper is not None:
+            return
+
+        interval = app.config.get('JOB_EXPIRY_SWEEP_INTERVAL', 300)
+
+        def run():
+            while True:
+                sweep_in_app_context(app)
+                time.sleep(interval)
+
+        _sweeper = threading.Thread(target=run, name='job-expiry-sweeper', daemon=True)
+        _sweeper.start()
+
+
+def init_job_expiry(app):
+    """Run the sweeper alongside the app"""
+    if not app.config.get('JOB_EXPIRY_SWEEPER_ENABLED', True):
+        return
+
+    # Started lazily so the thread is created in each worker process, not before a fork
+    @app.before_request
+    def ensure_job_expiry_sweeper():
+        start_sweeper(app)
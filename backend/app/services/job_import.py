@@ -0,0 +1,263 @@
+"""
+Job Import Service
+Stream NDJSON/CSV job rows, validate them one by one and insert in chunks
+"""
+import csv
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from app.extensions import db
+from app.models.all_models import Job, JobSkillRequired
+from app.services.ai_matching import cache_jobs_skills
+from app.services.cache_tags import queue_tags
+from app.utils.helpers import parse_datetime
+
+
+JOB_TYPES = ['internship', 'full-time', 'part-time', 'contract']
+WORK_MODES = ['remote', 'hybrid', 'on-site']
+SALARY_PERIODS = ['hourly', 'monthly', 'yearly']
+JOB_STATUSES = ['active', 'closed', 'draft']
+
+# Separators accepted for the skills column of CSV imports
+CSV_SKILL_SEPARATORS = [';', '|']
+
+# Text fields and their column limits (None = unbounded Text)
+TEXT_FIELDS = {
+    'title': 255,
+    'description': None,
+    'job_type': None,
+    'location': 255,
+    'work_mode': None,
+    'salary_currency': 3,
+    'salary_period': None,
+    'requirements': None,
+    'status': None,
+    'expires_at': None,
+}
+SKILL_NAME_MAX_LENGTH = 100
+# Numeric(10, 2): at most 8 digits before the decimal point
+SALARY_LIMIT = Decimal('100000000')
+
+
+def iter_ndjson(lines):
+    """
+    Parse NDJSON lines lazily
+
+    Yields:
+        tuple: (row number, dict or None, error or None)
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield number, None, 'Each line must be a JSON object'
+            continue
+        yield number, row, None
+
+
+def iter_csv(lines):
+    """
+    Parse CSV rows lazily (header row required, skills separated by ; or |)
+
+    Yields:
+        tuple: (row number, dict or None, error or None)
+    """
+    reader = csv.DictReader(lines)
+    for number, row in enumerate(reader, start=1):
+        row = {(key or '').strip(): (value.strip() if isinstance(value, str) else value)
+               for key, value in row.items()}
+        row = {key: value for key, value in row.items() if value not in (None, '')}
+
+        skills = row.get('skills')
+        if skills:
+            for separator in CSV_SKILL_SEPARATORS:
+                skills = skills.replace(separator, ',')
+            row['skills'] = [skill.strip() for skill in skills.split(',') if skill.strip()]
+
+        yield number, row, None
+
+
+def build_job_row(row, employer):
+    """
+    Validate an import row and turn it into column values
+
+    Args:
+        row: Parsed row dict
+        employer: Importing EmployerProfile
+
+    Returns:
+        tuple: (job values dict, skill names list) or raises ValueError
+    """
+    for field, max_length in TEXT_FIELDS.items():
+        value = row.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f'{field} must be a string')
+        if max_length and len(value) > max_length:
+            raise ValueError(f'{field} must be at most {max_length} characters')
+
+    for field in ['title', 'description', 'job_type']:
+        if not row.get(field):
+            raise ValueError(f'{field} is required')
+
+    if row['job_type'] not in JOB_TYPES:
+        raise ValueError(f"job_type must be one of: {', '.join(JOB_TYPES)}")
+    if row.get('work_mode') and row['work_mode'] not in WORK_MODES:
+        raise ValueError(f"work_mode must be one of: {', '.join(WORK_MODES)}")
+    if row.get('salary_period') and row['salary_period'] not in SALARY_PERIODS:
+        raise ValueError(f"salary_period must be one of: {', '.join(SALARY_PERIODS)}")
+
+    status = row.get('status', 'active')
+    if status not in JOB_STATUSES:
+        raise ValueError(f"status must be one of: {', '.join(JOB_STATUSES)}")
+
+    salaries = {}
+    for field in ['salary_min', 'salary_max']:
+        value = row.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f'{field} must be a number')
+        try:
+            salary = Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError(f'{field} must be a number')
+        if not salary.is_finite():
+            raise ValueError(f'{field} must be a number')
+        if abs(salary) >= SALARY_LIMIT:
+            raise ValueError(f'{field} must be less than {SALARY_LIMIT}')
+        salaries[field] = salary
+
+    expires_at = None
+    if row.get('expires_at'):
+        expires_at = parse_datetime(row['expires_at'])
+        if not expires_at:
+            raise ValueError('expires_at must be formatted as YYYY-MM-DD HH:MM:SS')
+
+    skills = row.get('skills') or []
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError('skills must be a list of strings')
+    skills = [skill.strip() for skill in skills if skill.strip()]
+    if any(len(skill) > SKILL_NAME_MAX_LENGTH for skill in skills):
+        raise ValueError(f'skills must be at most {SKILL_NAME_MAX_LENGTH} characters each')
+
+    now = datetime.utcnow()
+    values = {
+        'job_id': str(uuid.uuid4()),
+        'employer_id': employer.employer_id,
+        'title': row['title'],
+        'company_name': employer.company_name,
+        'description': row['description'],
+        'location': row.get('location'),
+        'job_type': row['job_type'],
+        'work_mode': row.get('work_mode'),
+        'salary_min': salaries.get('salary_min'),
+        'salary_max': salaries.get('salary_max'),
+        'salary_currency': row.get('salary_currency', 'USD'),
+        'salary_period': row.get('salary_period'),
+        'requirements': row.get('requirements'),
+        'posted_at': now,
+        'expires_at': expires_at,
+        'status': status,
+        'views_count': 0,
+        'applications_count': 0,
+        'created_at': now,
+        'updated_at': now
+    }
+    return values, skills
+
+
+def import_jobs(rows, employer):
+    """
+    Validate and insert streamed job rows in chunks
+
+    Each chunk of JOB_IMPORT_BATCH_SIZE valid rows is written with one
+    multi-row INSERT for jobs and one for skills, then committed, so memory
+    stays bounded and a failure only affects its own chunk. Skill caches are
+    primed once at the end.
+
+    Args:
+        rows: Iterator from iter_ndjson() / iter_csv()
+        employer: Importing EmployerProfile
+
+    Returns:
+        dict: {imported, failed, job_ids, errors: [{row, error}]}
+    """
+    batch_size = current_app.config.get('JOB_IMPORT_BATCH_SIZE', 500)
+    max_rows = current_app.config.get('JOB_IMPORT_MAX_ROWS', 10000)
+
+    result = {'imported': 0, 'failed': 0, 'job_ids': [], 'errors': []}
+    skills_by_job = {}
+    job_rows = []
+    skill_rows = []
+    row_numbers = []
+
+    def flush():
+        if not job_rows:
+            return
+        try:
+            db.session.execute(db.insert(Job), job_rows)
+            if skill_rows:
+                db.session.execute(db.insert(JobSkillRequired), skill_rows)
+            # Bulk INSERTs skip the flush listeners
+            queue_tags('jobs')
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            result['failed'] += len(job_rows)
+            result['errors'].extend({'row': number, 'error': f'Failed to save: {e}'} for number in row_numbers)
+            for values in job_rows:
+                skills_by_job.pop(values['job_id'], None)
+        else:
+            result['imported'] += len(job_rows)
+            result['job_ids'].extend(values['job_id'] for values in job_rows)
+        job_rows.clear()
+        skill_rows.clear()
+        row_numbers.clear()
+
+    for seen, (number, row, error) in enumerate(rows, start=1):
+        if seen > max_rows:
+            result['errors'].append({'row': number, 'error': f'Import is limited to {max_rows} rows; remaining rows were skipped'})
+            break
+
+        if error is None:
+            try:
+                values, skills = build_job_row(row, employer)
+            except ValueError as e:
+                error = str(e)
+
+        if error is not None:
+            result['failed'] += 1
+            result['errors'].append({'row': number, 'error': error})
+            continue
+
+        job_rows.append(values)
+        row_numbers.append(number)
+        skills_by_job[values['job_id']] = skills
+        skill_rows.extend({
+            'id': str(uuid.uuid4()),
+            'job_id': values['job_id'],
+            'skill_name': skill,
+            'is_required': True
+        } for skill in skills)
+
+        if len(job_rows) >= batch_size:
+            flush()
+
+    flush()
+
+    # Chunks are committed; a cold skills cache is refilled on first match
+    try:
+        cache_jobs_skills(skills_by_job)
+    except Exception as e:
+        current_app.logger.warning(f'Failed to cache skills of imported jobs: {e}')
+    return result
@@ -0,0 +1,166 @@
+"""
+Prometheus Metrics
+Request latency/counters per blueprint and route, SQLAlchemy pool gauges,
+Socket.IO and cache counters
+
+With several gunicorn workers set PROMETHEUS_MULTIPROC_DIR (an empty,
+writable directory, cleared before the server starts) so every worker
+writes its samples there and /metrics aggregates all of them.
+"""
+import os
+import time
+from functools import wraps
+from flask import g, request
+from flask.signals import got_request_exception
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+
+REQUEST_LATENCY = Histogram(
+    'collabio_http_request_duration_seconds',
+    'HTTP request latency',
+    ['blueprint', 'route', 'method']
+)
+REQUESTS = Counter(
+    'collabio_http_requests_total',
+    'HTTP requests served',
+    ['blueprint', 'route', 'method', 'status']
+)
+REQUEST_ERRORS = Counter(
+    'collabio_http_request_errors_total',
+    'HTTP requests that ended in a 5xx response, by exception class or status',
+    ['blueprint', 'route', 'method', 'error']
+)
+
+# Gauges are summed over live worker processes
+DB_POOL_SIZE = Gauge('collabio_db_pool_size', 'Connections the pool keeps open', multiprocess_mode='livesum')
+DB_POOL_CHECKED_OUT = Gauge('collabio_db_pool_checked_out', 'Connections currently checked out', multiprocess_mode='livesum')
+DB_POOL_OVERFLOW = Gauge('collabio_db_pool_overflow', 'Connections open beyond pool_size', multiprocess_mode='livesum')
+
+SOCKET_CLIENTS = Gauge('collabio_socketio_connected_clients', 'Connected Socket.IO clients', multiprocess_mode='livesum')
+SOCKET_EVENTS = Counter('collabio_socketio_events_total', 'Socket.IO events received', ['event'])
+
+CACHE_LOOKUPS = Counter('collabio_cache_lookups_total', 'flask_caching lookups by result', ['result'])
+CACHE_TIER_LOOKUPS = Counter('collabio_cache_tier_lookups_total', 'Two-tier cache lookups by tier and result', ['tier', 'result'])
+
+
+def route_labels():
+    """Low-cardinality labels of the current request (URL rule, not the raw path)"""
+    return {
+        'blueprint': request.blueprint or 'none',
+        'route': request.url_rule.rule if request.url_rule else 'unmatched',
+        'method': request.method
+    }
+
+
+def record_cache_lookups(hits, misses):
+    """Count cache hits and misses (hit ratio = hits / (hits + misses))"""
+    if hits:
+        CACHE_LOOKUPS.labels(result='hit').inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(result='miss').inc(misses)
+
+
+def record_tier_lookups(tier, hits, misses):
+    """Count lookups answered (or not) by one tier of the two-tier cache"""
+    if hits:
+        CACHE_TIER_LOOKUPS.labels(tier=tier, result='hit').inc(hits)
+    if misses:
+        CACHE_TIER_LOOKUPS.labels(tier=tier, result='miss').inc(misses)
+
+
+def socket_connected():
+    SOCKET_CLIENTS.inc()
+
+
+def socket_disconnected():
+    SOCKET_CLIENTS.dec()
+
+
+def counted_socket_event(socketio_instance, event_name):
+    """Register a Socket.IO handler (like socketio.on) that also counts the event"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            SOCKET_EVENTS.labels(event=event_name).inc()
+            return fn(*args, **kwargs)
+        return socketio_instance.on(event_name)(wrapper)
+    return decorator
+
+
+def update_pool_gauges(pool):
+    """Copy the pool's current state into the gauges (pools without stats are skipped)"""
+    if not hasattr(pool, 'checkedout'):
+        return
+    DB_POOL_SIZE.set(pool.size())
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+def watch_pool(engine):
+    """Keep pool gauges current on every checkout/checkin of the engine's pool"""
+    pool = engine.pool
+
+    @event.listens_for(pool, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        update_pool_gauges(pool)
+
+    @event.listens_for(pool, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        update_pool_gauges(pool)
+
+    update_pool_gauges(pool)
+
+
+def render():
+    """
+    Render metrics in Prometheus exposition format
+
+    Returns:
+        tuple: (body, content type)
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_metrics(app):
+    """Record request metrics and watch the database pool"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    from app.extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            watch_pool(engine)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+
+        labels = route_labels()
+        REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - started)
+        REQUESTS.labels(status=str(response.status_code), **labels).inc()
+        if response.status_code >= 500:
+            error = g.pop('metrics_exception', None) or str(response.status_code)
+            REQUEST_ERRORS.labels(error=error, **labels).inc()
+        return response
+
+    def record_exception(sender, exception, **extra):
+        # Counted with the 500 response it turns into
+        g.metrics_exception = type(exception).__name__
+
+    got_request_exception.connect(record_exception, app, weak=False)
@@ -0,0 +1,237 @@
+"""
+Notification Service
+Queue notifications on the transaction, insert them in batches and push them
+to connected users once it commits
+"""
+import uuid
+import base64
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from app.extensions import db, socketio, cache
+from app.models.all_models import Notification
+
+
+UNREAD_COUNT_KEY = 'notifications:unread:{user_id}'
+
+
+def user_room(user_id):
+    """Socket.IO room every connection of a user joins"""
+    return f'user:{user_id}'
+
+
+def build_notification(user_id, type, title, message, link_url=None):
+    """
+    Build a notification row ready for a multi-row insert
+
+    Returns:
+        dict: Column values including generated id and timestamp
+    """
+    return {
+        'notification_id': str(uuid.uuid4()),
+        'user_id': user_id,
+        'type': type,
+        'title': title,
+        'message': message,
+        'link_url': link_url,
+        'is_read': False,
+        'created_at': datetime.utcnow()
+    }
+
+
+def notify(user_id, type, title, message, link_url=None):
+    """
+    Add a notification to the current transaction
+
+    Rows are inserted within the caller's transaction (in batches of
+    NOTIFICATION_BATCH_SIZE, never committed here) and pushed to sockets once
+    the caller commits; a rollback drops them.
+    """
+    row = build_notification(user_id, type, title, message, link_url)
+
+    pending = db.session.info.setdefault('pending_notifications', [])
+    pending.append(row)
+
+    if len(pending) >= current_app.config.get('NOTIFICATION_BATCH_SIZE', 500):
+        insert_pending(db.session())
+
+    return row
+
+
+def insert_pending(session):
+    """Insert notifications queued in a session's transaction (without committing)"""
+    pending = session.info.pop('pending_notifications', None)
+    if pending:
+        session.execute(db.insert(Notification), pending)
+        session.info.setdefault('inserted_notifications', []).extend(pending)
+
+
+def publish_committed(session):
+    """Push notifications whose transaction has committed"""
+    rows = session.info.pop('inserted_notifications', None)
+    if not rows:
+        return
+    try:
+        publish(rows)
+    except Exception as e:
+        # Rows are stored; clients see them on their next fetch
+        current_app.logger.warning(f'Failed to publish notifications: {e}')
+
+
+def discard_pending(session):
+    """Drop notifications of a rolled back transaction"""
+    session.info.pop('pending_notifications', None)
+    session.info.pop('inserted_notifications', None)
+
+
+def publish(rows):
+    """Push committed notifications to their users and refresh unread counts"""
+    user_ids = {row['user_id'] for row in rows}
+    cache.delete_many(*[UNREAD_COUNT_KEY.format(user_id=user_id) for user_id in user_ids])
+
+    for row in rows:
+        try:
+            socketio.emit(
+                'notification',
+                serialize_notification(row),
+                room=user_room(row['user_id'])
+            )
+        except Exception as e:
+            current_app.logger.warning(f'Failed to push notification: {e}')
+
+
+def serialize_notification(row):
+    """Serialize a notification row dict the same way as Notification.to_dict()"""
+    return {
+        'notification_id': row['notification_id'],
+        'type': row['type'],
+        'title': row['title'],
+        'message': row['message'],
+        'link_url': row['link_url'],
+        'is_read': row['is_read'],
+        'created_at': row['created_at'].isoformat() if row['created_at'] else None
+    }
+
+
+def get_unread_count(user_id):
+    """Get unread notification count for user (cached)"""
+    key = UNREAD_COUNT_KEY.format(user_id=user_id)
+    count = cache.get(key)
+
+    if count is None:
+        count = Notification.query.filter_by(
+            user_id=user_id,
+            is_read=False,
+            deleted_at=None
+        ).count()
+        cache.set(key, count, timeout=current_app.config.get('NOTIFICATION_UNREAD_CACHE_TIMEOUT', 300))
+
+    return count
+
+
+def mark_read(user_id, notification_ids=None):
+    """
+    Mark notifications as read in one UPDATE
+
+    Args:
+        user_id: Owner of the notifications
+        notification_ids: IDs to mark, or None to mark all unread
+
+    Returns:
+        int: Number of notifications updated
+    """
+    query = Notification.query.filter(
+        Notification.user_id == user_id,
+        Notification.is_read == False,
+        Notification.deleted_at.is_(None)
+    )
+
+    if notification_ids is not None:
+        if not notification_ids:
+            return 0
+        query = query.filter(Notification.notification_id.in_(notification_ids))
+
+    updated = query.update({'is_read': True}, synchronize_session=False)
+    db.session.commit()
+
+    cache.delete(UNREAD_COUNT_KEY.format(user_id=user_id))
+    return updated
+
+
+def encode_cursor(notification):
+    """Encode the (created_at, notification_id) position of a notification"""
+    raw = f"{notification.created_at.isoformat()}|{notification.notification_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor()
+
+    Returns:
+        tuple: (created_at, notification_id) or None if cursor is invalid
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, notification_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), notification_id
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def list_notifications(user_id, cursor=None, limit=20, unread_only=False):
+    """
+    Get a page of notifications newest first using keyset pagination
+
+    Returns:
+        dict: {'data': [...], 'meta': {'per_page', 'has_next', 'next_cursor'}}
+    """
+    query = Notification.query.filter(
+        Notification.user_id == user_id,
+        Notification.deleted_at.is_(None)
+    )
+
+    if unread_only:
+        query = query.filter(Notification.is_read == False)
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if position:
+            created_at, notification_id = position
+            query = query.filter(
+                db.or_(
+                    Notification.created_at < created_at,
+                    db.and_(
+                        Notification.created_at == created_at,
+                        Notification.notification_id < notification_id
+                    )
+                )
+            )
+
+    items = query.order_by(
+        Notification.created_at.desc(),
+        Notification.notification_id.desc()
+    ).limit(limit + 1).all()
+
+    has_next = len(items) > limit
+    items = items[:limit]
+
+    return {
+        'data': [n.to_dict() for n in items],
+        'meta': {
+            'per_page': limit,
+            'has_next': has_next,
+            'next_cursor': encode_cursor(items[-1]) if has_next else None
+        }
+    }
+
+
+def init_notifications(app):
+    """Insert queued notifications with their transaction and push them after commit"""
+    for name, listener in [
+        ('before_commit', insert_pending),
+        ('after_commit', publish_committed),
+        ('after_rollback', discard_pending),
+    ]:
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
@@ -0,0 +1,227 @@
+"""
+Outbox Service
+Transactional outbox: events commit with the change that caused them and a
+background worker runs their side effects in batches, with retries
+"""
+import threading
+from datetime import datetime, timedelta
+from flask import g, has_request_context
+from app.extensions import db
+from app.models.all_models import OutboxEvent
+
+
+HANDLERS = {}
+
+_worker = None
+_wake = threading.Event()
+_lock = threading.Lock()
+
+
+def handler(event_type):
+    """
+    Register a batch handler for an event type
+
+    The handler receives a list of OutboxEvent rows and runs inside the
+    worker's transaction (it must not commit). It may return a callable to
+    run once the transaction has committed (e.g. pushing to sockets).
+    """
+    def decorator(func):
+        HANDLERS[event_type] = func
+        return func
+    return decorator
+
+
+def enqueue(event_type, payload):
+    """
+    Add an event to the current transaction
+
+    Nothing runs until the caller commits; a rollback discards the event
+    along with the change that produced it.
+
+    Args:
+        event_type: Registered handler name (e.g. 'application.accepted')
+        payload: JSON serializable dict
+
+    Returns:
+        OutboxEvent: Pending event (uncommitted)
+    """
+    event = OutboxEvent(event_type=event_type, payload=payload)
+    db.session.add(event)
+
+    if has_request_context():
+        g.outbox_enqueued = True
+
+    return event
+
+
+def claim_batch(app, limit):
+    """
+    Lock a batch of due events for this worker
+
+    Events stuck in 'processing' longer than OUTBOX_LOCK_TIMEOUT (a worker
+    died mid-batch) are claimed again.
+
+    Returns:
+        list: Claimed OutboxEvent rows
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=app.config.get('OUTBOX_LOCK_TIMEOUT', 300))
+
+    events = OutboxEvent.query.filter(
+        db.or_(
+            db.and_(OutboxEvent.status == 'pending', OutboxEvent.available_at <= now),
+            db.and_(OutboxEvent.status == 'processing', OutboxEvent.locked_at < stale)
+        )
+    ).order_by(OutboxEvent.created_at).limit(limit).with_for_update(skip_locked=True).all()
+
+    for event in events:
+        event.status = 'processing'
+        event.locked_at = now
+        event.attempts = (event.attempts or 0) + 1
+
+    db.session.commit()
+    return events
+
+
+def process_batch(app, limit=None):
+    """
+    Claim and run one batch of due events
+
+    Events of the same type are handled together in one transaction. If that
+    fails each event is retried on its own so one bad event cannot hold back
+    the rest of the batch.
+
+    Returns:
+        int: Number of events claimed
+    """
+    limit = limit or app.config.get('OUTBOX_BATCH_SIZE', 100)
+    events = claim_batch(app, limit)
+
+    groups = {}
+    for event in events:
+        groups.setdefault(event.event_type, []).append(event)
+
+    for event_type, group in groups.items():
+        try:
+            run_handler(event_type, group)
+        except Exception as e:
+            db.session.rollback()
+            if len(group) == 1:
+                mark_failed(app, group[0], e)
+                continue
+
+            for event in group:
+                try:
+                    run_handler(event_type, [event])
+                except Exception as e:
+                    db.session.rollback()
+                    mark_failed(app, event, e)
+
+    return len(events)
+
+
+def run_handler(event_type, events):
+    """Run the handler for events and mark them done in the same transaction"""
+    func = HANDLERS.get(event_type)
+    if func is None:
+        raise LookupError(f'No outbox handler registered for {event_type}')
+
+    after_commit = func(events)
+
+    now = datetime.utcnow()
+    for event in events:
+        event.status = 'done'
+        event.processed_at = now
+        event.last_error = None
+
+    db.session.commit()
+
+    if after_commit:
+        after_commit()
+
+
+def mark_failed(app, event, error):
+    """Schedule a retry with exponential backoff, or give up after OUTBOX_MAX_ATTEMPTS"""
+    event = db.session.get(OutboxEvent, event.event_id)
+    max_attempts = app.config.get('OUTBOX_MAX_ATTEMPTS', 8)
+
+    event.last_error = str(error)
+    event.locked_at = None
+    if event.attempts >= max_attempts:
+        event.status = 'failed'
+        app.logger.error(f'Outbox event {event.event_id} ({event.event_type}) failed: {error}')
+    else:
+        event.status = 'pending'
+        event.available_at = datetime.utcnow() + timedelta(seconds=min(2 ** event.attempts, 300))
+        app.logger.warning(f'Outbox event {event.event_id} ({event.event_type}) will be retried: {error}')
+
+    db.session.commit()
+
+
+def drain(app):
+    """
+    Process due events until none are left (in-process worker)
+
+    Used by the background thread and directly by tests/scripts when
+    OUTBOX_WORKER_ENABLED is False.
+
+    Returns:
+        int: Number of events processed
+    """
+    total = 0
+    with app.app_context():
+        while True:
+            claimed = process_batch(app)
+            total += claimed
+            if claimed == 0:
+                break
+    return total
+
+
+def wake():
+    """Ask the worker to poll now instead of waiting for the next interval"""
+    _wake.set()
+
+
+def start_worker(app):
+    """Start the background outbox worker for this process (once)"""
+    global _worker
+    if _worker is not None:
+        return
+
+    with _lock:
+        if _worker is not None:
+            return
+
+        interval = app.config.get('OUTBOX_POLL_INTERVAL', 2)
+
+        def run():
+            while True:
+                _wake.wait(interval)
+                _wake.clear()
+                try:
+                    drain(app)
+                except Exception as e:
+                    app.logger.error(f'Outbox worker error: {e}')
+
+        _worker = threading.Thread(target=run, name='outbox-worker', daemon=True)
+        _worker.start()
+
+
+def init_outbox(app):
+    """Register event handlers and run the worker alongside the app"""
+    from app.services import applications  # noqa: F401 (registers handlers)
+
+    if not app.config.get('OUTBOX_WORKER_ENABLED', True):
+        return
+
+    # Started lazily so the thread is created in each worker process, not before a fork
+    @app.before_request
+    def ensure_outbox_worker():
+        start_worker(app)
+
+    @app.after_request
+    def wake_outbox_worker(response):
+        if g.pop('outbox_enqueued', False) and response.status_code < 400:
+            wake()
+        return response
@@ -0,0 +1,241 @@
+"""
+Sampling Profiler
+Profile single requests on demand (speedscope files) and, optionally, sample
+every request continuously at a low rate, aggregating stacks per route
+
+Samples are taken from a separate thread with sys._current_frames(), so the
+profiled code runs unmodified (requires threaded workers, which is what the
+app runs with: async_mode='threading').
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import hmac
+import threading
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt
+
+
+PROFILE_HEADER = 'X-Profile'
+
+_lock = threading.Lock()
+_active = {}            # thread ident -> route being served (continuous mode)
+_stacks = Counter()     # folded "route;frame;frame" -> samples
+_continuous = None
+
+
+def frame_name(code):
+    """Stable frame label: function (file:first line)"""
+    filename = code.co_filename
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if filename.startswith(root):
+        filename = os.path.relpath(filename, root)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+def thread_stack(ident):
+    """Current stack of a thread, outermost frame first (None if it has finished)"""
+    frame = sys._current_frames().get(ident)
+    stack = []
+    while frame is not None:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+    stack.reverse()
+    return stack or None
+
+
+class RequestProfiler:
+    """Sample one thread at a fixed interval until stopped"""
+
+    def __init__(self, ident, interval):
+        self.ident = ident
+        self.interval = interval
+        self.samples = []
+        self.weights = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            stack = thread_stack(self.ident)
+            now = time.perf_counter()
+            if stack:
+                self.samples.append(stack)
+                self.weights.append(now - last)
+            last = now
+
+    def to_speedscope(self, name):
+        """Profile in speedscope's sampled format (https://www.speedscope.app)"""
+        frames = []
+        index = {}
+        samples = []
+        for stack in self.samples:
+            sample = []
+            for code in stack:
+                if code not in index:
+                    index[code] = len(frames)
+                    frames.append({'name': code.co_name, 'file': code.co_filename, 'line': code.co_firstlineno})
+                sample.append(index[code])
+            samples.append(sample)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'collabio',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': self.duration,
+                'samples': samples,
+                'weights': self.weights
+            }]
+        }
+
+
+def profiling_requested(app):
+    """
+    Whether the current request asked to be profiled
+
+    Needs the X-Profile header, set either to PROFILER_SECRET or to any value
+    with a JWT carrying the PROFILER_JWT_CLAIM claim.
+    """
+    value = request.headers.get(PROFILE_HEADER)
+    if not value:
+        return False
+
+    secret = app.config.get('PROFILER_SECRET')
+    if secret and hmac.compare_digest(value, secret):
+        return True
+
+    try:
+        verify_jwt_in_request(optional=True)
+        return bool(get_jwt().get(app.config.get('PROFILER_JWT_CLAIM', 'profiler')))
+    except Exception:
+        return False
+
+
+def profile_path(app, suffix):
+    directory = app.config.get('PROFILER_DIR', './profiles')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, suffix)
+
+
+def save_profile(app, profiler):
+    """Write a request profile to PROFILER_DIR and return its file name"""
+    endpoint = (request.endpoint or 'unmatched').replace('.', '-')
+    name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{request.method}-{endpoint}-{uuid.uuid4().hex[:8]}.speedscope.json"
+
+    with open(profile_path(app, name), 'w') as f:
+        json.dump(profiler.to_speedscope(f'{request.method} {request.path}'), f)
+    return name
+
+
+def flush_stacks(app):
+    """Write this process' aggregated stacks in folded format (flamegraph.pl, speedscope)"""
+    with _lock:
+        lines = [f'{stack} {count}' for stack, count in _stacks.most_common()]
+    if not lines:
+        return
+
+    path = profile_path(app, f'continuous-{os.getpid()}.folded')
+    with open(f'{path}.tmp', 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(f'{path}.tmp', path)
+
+
+def start_continuous(app):
+    """Start the low-rate sampler for this process (once)"""
+    global _continuous
+    if _continuous is not None:
+        return
+
+    with _lock:
+        if _continuous is not None:
+            return
+
+        interval = app.config.get('PROFILER_CONTINUOUS_INTERVAL', 0.05)
+        flush_interval = app.config.get('PROFILER_CONTINUOUS_FLUSH_INTERVAL', 60)
+
+        def run():
+            flushed = time.monotonic()
+            while True:
+                time.sleep(interval)
+                with _lock:
+                    active = list(_active.items())
+                for ident, route in active:
+                    stack = thread_stack(ident)
+                    if stack:
+                        folded = ';'.join([route] + [frame_name(code) for code in stack])
+                        with _lock:
+                            _stacks[folded] += 1
+
+                if time.monotonic() - flushed >= flush_interval:
+                    try:
+                        flush_stacks(app)
+                    except OSError as e:
+                        app.logger.warning(f'Failed to write continuous profile: {e}')
+                    flushed = time.monotonic()
+
+        _continuous = threading.Thread(target=run, name='continuous-profiler', daemon=True)
+        _continuous.start()
+
+
+def init_profiler(app):
+    """Profile requests that ask for it and, if enabled, sample all requests"""
+    if not app.config.get('PROFILER_ENABLED', True):
+        return
+
+    continuous = app.config.get('PROFILER_CONTINUOUS_ENABLED', False)
+
+    @app.before_request
+    def start_profiling():
+        ident = threading.get_ident()
+
+        if continuous:
+            start_continuous(app)
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            with _lock:
+                _active[ident] = f'{request.method} {route}'
+
+        if profiling_requested(app):
+            g.request_profiler = RequestProfiler(ident, app.config.get('PROFILER_INTERVAL', 0.001)).start()
+
+    @app.after_request
+    def stop_profiling(response):
+        profiler = g.pop('request_profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            try:
+                response.headers['X-Profile-File'] = save_profile(app, profiler)
+            except OSError as e:
+                app.logger.warning(f'Failed to write request profile: {e}')
+        return response
+
+    @app.teardown_request
+    def stop_sampling(exception=None):
+        # after_request is skipped when the view raises; don't leave the sampler running
+        profiler = g.pop('request_profiler', None)
+        if profiler is not None:
+            profiler.stop()
+
+        if continuous:
+            with _lock:
+                _active.pop(threading.get_ident(), None)
@@ -0,0 +1,185 @@
+"""
+Per-request SQL instrumentation
+Count and time every statement, flag repeated statement shapes (N+1) and
+report them through Server-Timing headers and a summary log line
+"""
+import re
+import json
+import time
+from collections import defaultdict
+from functools import wraps
+from flask import g, request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Normalisation applied before grouping statements by shape
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                    # string literals
+    (re.compile(r'%\(\w+\)s|:\w+|\$\d+|%s'), '?'),            # bind parameters of any paramstyle
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                  # numeric literals
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?)'),       # expanded IN lists
+    (re.compile(r'\s+'), ' '),
+]
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more SQL statements than its budget allows"""
+
+
+def fingerprint(statement):
+    """Shape of a statement with literals, parameters and IN lists collapsed"""
+    for pattern, replacement in _LITERALS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def query_budget(max_queries):
+    """
+    Set the maximum number of SQL statements a view may run
+
+    Overrides SQL_QUERY_BUDGET for one route. Going over raises
+    QueryBudgetExceeded when SQL_QUERY_BUDGET_RAISE is set (tests) and logs a
+    warning otherwise.
+
+    Example:
+        @jobs_bp.route('/<job_id>', methods=['GET'])
+        @query_budget(5)
+        def get_job(job_id):
+            ...
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return fn(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+def current_stats():
+    """Stats of the request being served, or None outside requests"""
+    return g.get('query_stats')
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    # Background workers have an app context but no request stats
+    stats = current_stats() if g else None
+    if stats is None:
+        return
+
+    stats['count'] += 1
+    stats['duration'] += elapsed
+    shape = stats['shapes'][fingerprint(statement)]
+    shape['count'] += 1
+    shape['duration'] += elapsed
+
+
+def repeated_shapes(stats, threshold):
+    """Statement shapes run at least threshold times (likely N+1), most frequent first"""
+    shapes = [
+        {'statement': statement, 'count': shape['count'], 'duration_ms': round(shape['duration'] * 1000, 2)}
+        for statement, shape in stats['shapes'].items()
+        if shape['count'] >= threshold
+    ]
+    return sorted(shapes, key=lambda shape: shape['count'], reverse=True)
+
+
+def route_budget():
+    """Query budget of the current endpoint (per-view override or SQL_QUERY_BUDGET)"""
+    view = current_app.view_functions.get(request.endpoint)
+    budget = getattr(view, 'query_budget', None)
+    if budget is None:
+        budget = current_app.config.get('SQL_QUERY_BUDGET')
+    return budget
+
+
+def init_query_stats(app):
+    """Instrument every engine and summarise SQL usage per request"""
+    if not app.config.get('SQL_INSTRUMENTATION_ENABLED', True):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = {
+            'count': 0,
+            'duration': 0.0,
+            'started': time.perf_counter(),
+            'shapes': defaultdict(lambda: {'count': 0, 'duration': 0.0})
+        }
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = current_stats()
+        if stats is None:
+            return response
+
+        summary = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code
+        }
+        budget = route_budget()
+
+        # A streamed body still runs queries after this hook (get_conversation,
+        # the applications export), so summarise it once the body is done;
+        # its headers are already sent by then, so it gets no Server-Timing
+        if response.is_streamed:
+            response.call_on_close(lambda: finish_query_stats(app, stats, summary, budget))
+            return response
+
+        if app.config.get('SERVER_TIMING_ENABLED', True):
+            total_ms = (time.perf_counter() - stats['started']) * 1000
+            db_ms = stats['duration'] * 1000
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={db_ms:.2f};desc="{stats["count"]} queries", app;dur={total_ms - db_ms:.2f}'
+            )
+
+        finish_query_stats(app, stats, summary, budget)
+        return response
+
+
+def finish_query_stats(app, stats, summary, budget):
+    """
+    Log a request's SQL summary and enforce its query budget
+
+    Args:
+        app: Flask app (also called after the request context is gone)
+        stats: The request's query stats
+        summary: method, path, endpoint and status of the request
+        budget: Query budget of the route (or None)
+    """
+    summary = {
+        **summary,
+        'duration_ms': round((time.perf_counter() - stats['started']) * 1000, 2),
+        'db_ms': round(stats['duration'] * 1000, 2),
+        'queries': stats['count'],
+        'distinct_queries': len(stats['shapes']),
+        'repeated': repeated_shapes(stats, app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 5))
+    }
+
+    if summary['repeated']:
+        app.logger.warning(f'Possible N+1 queries: {json.dumps(summary)}')
+    elif app.config.get('SQL_LOG_REQUESTS', False):
+        app.logger.info(json.dumps(summary))
+
+    if budget is not None and stats['count'] > budget:
+        message = f'{summary["method"]} {summary["path"]} ran {stats["count"]} queries (budget {budget})'
+        if app.config.get('SQL_QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message)
+        app.logger.warning(message)
@@ -0,0 +1,182 @@
+"""
+Applicant Ranking Service
+Score all of a job's applicants in bulk and cache scores per job/profile version
+"""
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from app.extensions import db, cache
+from app.models.all_models import JobApplication
+from app.models.student import StudentProfile, StudentSkill, StudentEducation, StudentExperience
+from app.services.ai_matching import load_student_signals, get_job_skills, job_match_score
+
+
+SCORE_KEY = 'applicant_score:{job_id}:{job_version}:{student_id}:{profile_version}'
+
+# Students scored per bulk load
+SCORE_BATCH_SIZE = 500
+
+# Profile columns job_match_score reads; other edits keep cached scores valid
+SCORED_PROFILE_FIELDS = ['location', 'bio', 'resume_url', 'portfolio_url', 'github_url']
+
+# Child rows whose changes affect a student's scores
+SCORED_PROFILE_RELATIONS = (StudentSkill, StudentEducation, StudentExperience)
+
+
+def job_version(job):
+    """Version of a job's scoring inputs (bumped whenever the job row changes)"""
+    changed = job.updated_at or job.posted_at
+    return changed.strftime('%Y%m%d%H%M%S%f') if changed else '0'
+
+
+def score_applicants(job, profile_versions, students=None, signals=None):
+    """
+    Get match scores of many students for a job, using cached scores where
+    the job and profile versions are unchanged
+
+    Args:
+        job: Job being ranked
+        profile_versions: Dict of student_id -> profile_version
+        students: Optional preloaded {student_id: StudentProfile}
+        signals: Optional preloaded load_student_signals() result
+
+    Returns:
+        dict: {student_id: score}
+    """
+    version = job_version(job)
+    keys = {
+        student_id: SCORE_KEY.format(job_id=job.job_id, job_version=version,
+                                     student_id=student_id, profile_version=profile_version)
+        for student_id, profile_version in profile_versions.items()
+    }
+    if not keys:
+        return {}
+
+    cached = cache.get_many(*keys.values())
+    scores = {
+        student_id: score
+        for student_id, score in zip(keys, cached)
+        if score is not None
+    }
+
+    missing = [student_id for student_id in keys if student_id not in scores]
+    if not missing:
+        return scores
+
+    job_skills = get_job_skills(job)
+    fresh = {}
+
+    for start in range(0, len(missing), SCORE_BATCH_SIZE):
+        batch = missing[start:start + SCORE_BATCH_SIZE]
+
+        if students is not None and all(student_id in students for student_id in batch):
+            batch_students = students
+        else:
+            batch_students = {
+                student.student_id: student
+                for student in StudentProfile.query.filter(StudentProfile.student_id.in_(batch))
+            }
+
+        if signals is not None and all(student_id in signals for student_id in batch):
+            batch_signals = signals
+        else:
+            batch_signals = load_student_signals(batch)
+
+        for student_id in batch:
+            if student_id in batch_students:
+                fresh[student_id] = job_match_score(batch_students[student_id], job, job_skills, batch_signals[student_id])
+
+    cache.set_many(
+        {keys[student_id]: score for student_id, score in fresh.items()},
+        timeout=current_app.config.get('RANKING_SCORE_CACHE_TIMEOUT', 86400)
+    )
+
+    scores.update(fresh)
+    return scores
+
+
+def rank_applications(job, status=None, min_score=None, sort_by='score'):
+    """
+    Rank every application of a job by match score (best first)
+
+    Only ids and versions are loaded for the ranking itself; profiles are
+    fetched just for students whose score is not cached.
+
+    Args:
+        job: Job whose applications are ranked
+        status: Optional application status filter
+        min_score: Optional minimum score (inclusive)
+        sort_by: 'score' (newest first on ties) or 'applied_at' (newest first)
+
+    Returns:
+        list: [(application_id, student_id, score)]
+    """
+    query = db.session.query(
+        JobApplication.application_id,
+        JobApplication.student_id,
+        JobApplication.applied_at,
+        StudentProfile.profile_version
+    ).join(
+        StudentProfile, StudentProfile.student_id == JobApplication.student_id
+    ).filter(
+        JobApplication.job_id == job.job_id,
+        JobApplication.deleted_at.is_(None)
+    )
+
+    if status:
+        query = query.filter(JobApplication.status == status)
+
+    rows = query.all()
+    scores = score_applicants(job, {row.student_id: row.profile_version for row in rows})
+
+    ranked = [
+        (row.application_id, row.student_id, scores.get(row.student_id, 0), row.applied_at)
+        for row in rows
+    ]
+    if min_score is not None:
+        ranked = [item for item in ranked if item[2] >= min_score]
+
+    # Newest first, then (stable) by score
+    ranked.sort(key=lambda item: item[3] or datetime.min, reverse=True)
+    if sort_by == 'score':
+        ranked.sort(key=lambda item: item[2], reverse=True)
+
+    return [(application_id, student_id, score) for application_id, student_id, score, _ in ranked]
+
+
+def bump_profile_versions(session, flush_context, instances):
+    """
+    Bump StudentProfile.profile_version whenever scoring inputs change
+
+    Runs before every flush so profile edits and skill/education/experience
+    changes (including soft deletes) invalidate cached applicant scores.
+    """
+    student_ids = set()
+    bumped = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, SCORED_PROFILE_RELATIONS):
+            student_ids.add(obj.student_id)
+        elif isinstance(obj, StudentProfile) and obj in session.dirty:
+            state = db.inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in SCORED_PROFILE_FIELDS):
+                obj.profile_version = StudentProfile.profile_version + 1
+                bumped.add(obj.student_id)
+
+    # Profiles not bumped with their own row get a set-based UPDATE
+    student_ids -= bumped
+    student_ids.discard(None)
+
+    if student_ids:
+        session.execute(
+            db.update(StudentProfile)
+            .where(StudentProfile.student_id.in_(student_ids))
+            .values(profile_version=StudentProfile.profile_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def init_ranking(app):
+    """Keep profile versions current for the score cache"""
+    if not event.contains(db.session, 'before_flush', bump_profile_versions):
+        event.listen(db.session, 'before_flush', bump_profile_versions)
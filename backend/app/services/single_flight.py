@@ -0,0 +1,164 @@
+"""
+Single-flight
+Collapse concurrent identical computations onto one execution and share its
+result: threads of a process wait for one leader, and leaders of different
+processes take a cache lock (SETNX on Redis) so only one of them computes
+
+Results are kept for ttl seconds, then served stale for stale_ttl more while
+a single caller recomputes them. Results with cache tags (see cache_tags) are
+dropped as soon as one of their tags is bumped, fresh or stale.
+"""
+import time
+import hashlib
+import threading
+from functools import wraps
+from flask import current_app
+from app.extensions import cache
+from app.services.cache_tags import read, resolve_tags
+
+
+ENTRY_KEY = 'single_flight:{name}:{digest}'
+LOCK_KEY = 'single_flight_lock:{name}:{digest}'
+POLL_INTERVAL = 0.05   # Seconds between checks for another process' result
+
+_lock = threading.Lock()
+_in_flight = {}     # entry key -> Flight of the thread computing it
+
+
+class Flight:
+    """One in-flight computation that other threads of the process wait for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def store(entry_key, value, versions, ttl, stale_ttl):
+    cache.set(entry_key, {'value': value, 'versions': versions, 'computed_at': time.time()},
+              timeout=ttl + stale_ttl)
+    return value
+
+
+def usable(entry, versions):
+    """Whether an entry was computed under the current tag versions"""
+    return entry is not None and entry.get('versions', []) == versions
+
+
+def is_fresh(entry, versions, ttl):
+    return usable(entry, versions) and time.time() - entry['computed_at'] < ttl
+
+
+def compute_locked(entry_key, lock_key, compute, tags, ttl, stale_ttl):
+    """
+    Compute under the cross-process lock, or wait for the result of the
+    process holding it
+
+    Falls back to computing without the lock after SINGLE_FLIGHT_WAIT_TIMEOUT
+    (the holder is slow or died; its lock expires after SINGLE_FLIGHT_LOCK_TIMEOUT).
+    """
+    lock_timeout = current_app.config.get('SINGLE_FLIGHT_LOCK_TIMEOUT', 30)
+    deadline = time.monotonic() + current_app.config.get('SINGLE_FLIGHT_WAIT_TIMEOUT', 10)
+
+    while not cache.add(lock_key, 1, timeout=lock_timeout):
+        entry, versions = read(entry_key, tags)
+        if is_fresh(entry, versions, ttl):
+            return entry['value']
+        if time.monotonic() >= deadline:
+            return store(entry_key, compute(), versions, ttl, stale_ttl)
+        time.sleep(POLL_INTERVAL)
+
+    try:
+        # The previous holder may have stored a result just before releasing
+        entry, versions = read(entry_key, tags)
+        if is_fresh(entry, versions, ttl):
+            return entry['value']
+        return store(entry_key, compute(), versions, ttl, stale_ttl)
+    finally:
+        cache.delete(lock_key)
+
+
+def run(name, digest, compute, ttl, stale_ttl, tags=()):
+    """
+    Return a fresh result, a stale one while another caller refreshes it, or
+    the result of the one computation in flight
+
+    Args:
+        name: Namespace of the computation
+        digest: Identity of the computation within the namespace
+        compute: Callable producing the value
+        ttl: Seconds a result is fresh
+        stale_ttl: Seconds a result may be served after it went stale
+        tags: Cache tags whose bump invalidates the result
+    """
+    entry_key = ENTRY_KEY.format(name=name, digest=digest)
+    lock_key = LOCK_KEY.format(name=name, digest=digest)
+
+    # Versions are read before computing, so a bump while computing makes the result stale
+    entry, versions = read(entry_key, tags)
+    if usable(entry, versions):
+        if time.time() - entry['computed_at'] < ttl:
+            return entry['value']
+        # Stale: whoever takes the lock refreshes, everyone else gets the old value
+        if not cache.add(lock_key, 1, timeout=current_app.config.get('SINGLE_FLIGHT_LOCK_TIMEOUT', 30)):
+            return entry['value']
+        try:
+            return store(entry_key, compute(), versions, ttl, stale_ttl)
+        finally:
+            cache.delete(lock_key)
+
+    with _lock:
+        flight = _in_flight.get(entry_key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[entry_key] = Flight()
+
+    if not leader:
+        if not flight.done.wait(current_app.config.get('SINGLE_FLIGHT_WAIT_TIMEOUT', 10)):
+            return compute()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = compute_locked(entry_key, lock_key, compute, tags, ttl, stale_ttl)
+        return flight.value
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(entry_key, None)
+        flight.done.set()
+
+
+def single_flight(name, key=None, ttl=60, stale_ttl=300, tags=()):
+    """
+    Share one computation of a function between concurrent identical calls
+
+    Callers get the same result object, which must not be mutated.
+
+    Args:
+        name: Namespace of the function
+        key: Optional callable(*args, **kwargs) returning what identifies a
+            call (defaults to the arguments themselves)
+        ttl: Seconds a result is served as fresh
+        stale_ttl: Seconds a stale result is served while one caller refreshes it
+        tags: Cache tags (list or callable(*args, **kwargs)) whose bump drops
+            the result
+
+    Example:
+        @single_flight('job_recommendations', key=lambda student, limit=10: (student.student_id, limit))
+        def get_recommended_jobs(student, limit=10):
+            ...
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            parts = key(*args, **kwargs) if key else (args, sorted(kwargs.items()))
+            digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+            return run(name, digest, lambda: fn(*args, **kwargs), ttl, stale_ttl,
+                       resolve_tags(tags, *args, **kwargs))
+
+        return wrapper
+    return decorator
@@ -0,0 +1,270 @@
+"""
+Job View Counter
+Buffer job view increments and flush them in batched UPDATEs, with
+HyperLogLog unique-viewer estimates per job per day
+"""
+import uuid
+import atexit
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from redis.exceptions import ResponseError
+from app.extensions import db, get_redis
+from app.utils.hyperloglog import HyperLogLog
+
+
+PENDING_KEY = 'job_views:pending'
+PROCESSING_KEY = 'job_views:pending:processing:{claimed_at}:{token}'
+PROCESSING_MATCH = 'job_views:pending:processing:*'
+UNIQUE_KEY = 'job_views:unique:{job_id}:{day}'
+
+_lock = threading.Lock()
+_pending = defaultdict(int)
+_unique = {}
+_flusher = None
+
+
+def use_redis():
+    """Whether counters live in Redis (shared by all workers) or in process memory"""
+    return current_app.config.get('VIEW_COUNTER_BACKEND', 'redis') == 'redis'
+
+
+def day_key(day=None):
+    """Day bucket used for unique-viewer estimates"""
+    return (day or datetime.utcnow().date()).strftime('%Y%m%d')
+
+
+def record_job_view(job_id, viewer_key):
+    """
+    Record a job page view without touching the database
+
+    Args:
+        job_id: Viewed job
+        viewer_key: Stable identifier of the viewer (user id or client fingerprint)
+    """
+    day = day_key()
+
+    if use_redis():
+        unique_key = UNIQUE_KEY.format(job_id=job_id, day=day)
+        retention = current_app.config.get('VIEW_UNIQUE_RETENTION_DAYS', 30)
+
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hincrby(PENDING_KEY, job_id, 1)
+            pipe.pfadd(unique_key, viewer_key)
+            pipe.expire(unique_key, timedelta(days=retention))
+            pipe.execute()
+        except Exception as e:
+            # Losing a view is better than failing the page
+            current_app.logger.warning(f'Failed to record job view: {e}')
+            return
+    else:
+        with _lock:
+            _pending[job_id] += 1
+            _unique.setdefault((job_id, day), HyperLogLog()).add(viewer_key)
+
+    start_flusher(current_app._get_current_object())
+
+
+def get_unique_viewers(job_id, days=7):
+    """
+    Get estimated unique viewers of a job for the last N days
+
+    Returns:
+        list: [{'date': 'YYYY-MM-DD', 'unique_viewers': int}] oldest first
+    """
+    today = datetime.utcnow().date()
+    dates = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+
+    if use_redis():
+        pipe = get_redis().pipeline(transaction=False)
+        for date in dates:
+            pipe.pfcount(UNIQUE_KEY.format(job_id=job_id, day=day_key(date)))
+        counts = pipe.execute()
+    else:
+        with _lock:
+            counts = [
+                _unique[(job_id, day_key(date))].count() if (job_id, day_key(date)) in _unique else 0
+                for date in dates
+            ]
+
+    return [
+        {'date': date.isoformat(), 'unique_viewers': count}
+        for date, count in zip(dates, counts)
+    ]
+
+
+def get_pending_views(job_id):
+    """Views recorded but not yet flushed to jobs.views_count"""
+    if use_redis():
+        return int(get_redis().hget(PENDING_KEY, job_id) or 0)
+    with _lock:
+        return _pending.get(job_id, 0)
+
+
+def processing_key():
+    """Key a flusher moves the pending hash to while writing it (claim time in the name)"""
+    return PROCESSING_KEY.format(claimed_at=int(time.time()), token=uuid.uuid4())
+
+
+def take_stale_batches(redis_client):
+    """
+    Claim batches left behind by flushers that died before acknowledging them
+
+    A batch is considered abandoned once it is older than VIEW_FLUSH_STALE_AFTER.
+    Renaming it is the claim, so only one flusher adopts each batch.
+
+    Returns:
+        list: Processing keys now owned by the caller
+    """
+    stale_before = time.time() - current_app.config.get('VIEW_FLUSH_STALE_AFTER', 300)
+    claimed = []
+
+    for key in redis_client.scan_iter(match=PROCESSING_MATCH, count=100):
+        key = key.decode() if isinstance(key, bytes) else key
+        claimed_at = key.rsplit(':', 2)[1]
+        if not claimed_at.isdigit() or int(claimed_at) > stale_before:
+            continue
+
+        new_key = processing_key()
+        try:
+            redis_client.rename(key, new_key)
+        except ResponseError as e:
+            # Adopted by another flusher in the meantime
+            if 'no such key' not in str(e).lower():
+                raise
+            continue
+        current_app.logger.warning(f'Re-processing abandoned job view batch {key}')
+        claimed.append(new_key)
+
+    return claimed
+
+
+def take_pending():
+    """
+    Atomically take all pending increments, plus batches an earlier flush
+    took but never acknowledged
+
+    Returns:
+        tuple: (dict job_id -> increment, callable to acknowledge after the DB write)
+    """
+    if use_redis():
+        redis_client = get_redis()
+        flushing_keys = take_stale_batches(redis_client)
+
+        flushing_key = processing_key()
+        try:
+            redis_client.rename(PENDING_KEY, flushing_key)
+            flushing_keys.append(flushing_key)
+        except ResponseError as e:
+            # RENAME fails when nothing is pending; anything else is an outage
+            if 'no such key' not in str(e).lower():
+                raise
+
+        if not flushing_keys:
+            return {}, lambda: None
+
+        pipe = redis_client.pipeline(transaction=False)
+        for key in flushing_keys:
+            pipe.hgetall(key)
+
+        counts = defaultdict(int)
+        for batch in pipe.execute():
+            for job_id, n in batch.items():
+                counts[job_id.decode() if isinstance(job_id, bytes) else job_id] += int(n)
+        return dict(counts), lambda: redis_client.delete(*flushing_keys)
+
+    with _lock:
+        counts = dict(_pending)
+        _pending.clear()
+
+        # Drop unique-viewer sketches older than the retention window
+        cutoff = day_key(datetime.utcnow().date() - timedelta(days=current_app.config.get('VIEW_UNIQUE_RETENTION_DAYS', 30)))
+        for key in [key for key in _unique if key[1] < cutoff]:
+            del _unique[key]
+
+    return counts, lambda: None
+
+
+def flush_job_views():
+    """
+    Write pending view increments with one UPDATE per distinct increment
+
+    Returns:
+        int: Number of jobs updated
+    """
+    from app.models.all_models import Job
+
+    counts, acknowledge = take_pending()
+    if not counts:
+        return 0
+
+    by_increment = defaultdict(list)
+    for job_id, increment in counts.items():
+        by_increment[increment].append(job_id)
+
+    try:
+        for increment, job_ids in by_increment.items():
+            Job.query.filter(Job.job_id.in_(job_ids)).update(
+                {
+                    'views_count': db.func.coalesce(Job.views_count, 0) + increment,
+                    # A view is not an edit; keep updated_at as is
+                    'updated_at': Job.updated_at
+                },
+                synchronize_session=False
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        restore_pending(counts)
+        acknowledge()
+        raise
+
+    acknowledge()
+    return len(counts)
+
+
+def restore_pending(counts):
+    """Put increments back after a failed flush"""
+    if use_redis():
+        pipe = get_redis().pipeline(transaction=False)
+        for job_id, increment in counts.items():
+            pipe.hincrby(PENDING_KEY, job_id, increment)
+        pipe.execute()
+    else:
+        with _lock:
+            for job_id, increment in counts.items():
+                _pending[job_id] += increment
+
+
+def start_flusher(app):
+    """Start the background flush thread for this process (once)"""
+    global _flusher
+    if _flusher is not None:
+        return
+
+    with _lock:
+        if _flusher is not None:
+            return
+
+        interval = app.config.get('VIEW_COUNT_FLUSH_INTERVAL', 10)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                flush_in_app_context(app)
+
+        _flusher = threading.Thread(target=run, name='job-view-flusher', daemon=True)
+        _flusher.start()
+        atexit.register(flush_in_app_context, app)
+
+
+def flush_in_app_context(app):
+    """Flush pending views, logging instead of raising"""
+    with app.app_context():
+        try:
+            flush_job_views()
+        except Exception as e:
+            app.logger.error(f'Failed to flush job views: {e}')
@@ -1,6 +1,7 @@
 """
 Authentication utilities
 """
+import hashlib
 from functools import wraps
 from flask import request, jsonify
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
@@ -39,6 +40,25 @@ def get_current_user():
         return None
 
 
+def get_viewer_key():
+    """
+    Identify the viewer of a public page
+
+    Returns the user ID for authenticated requests, otherwise a hash of the
+    client address and user agent.
+    """
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+        if user_id:
+            return f"user:{user_id}"
+    except Exception:
+        pass
+
+    fingerprint = f"{request.headers.get('X-Forwarded-For', request.remote_addr)}|{request.user_agent.string}"
+    return f"anon:{hashlib.sha1(fingerprint.encode()).hexdigest()}"
+
+
 def get_user_type():
     """Get current user type from JWT token"""
     user = get_current_user()
@@ -0,0 +1,238 @@
+"""
+Two-tier cache backend
+A bounded in-process LRU/TTL tier in front of Redis for hot keys
+
+Values in the local tier are the unpickled objects, so a local hit costs
+neither a round trip nor deserialisation. Every write or delete of a local
+key is published on a Redis channel and every worker drops its copy when the
+message arrives. The local TTL caps how stale a copy can get if a message is
+lost.
+
+Use with CACHE_TYPE = 'app.utils.cache_backend.TwoTierRedisCache'. Local
+values are shared between requests of a worker and must not be mutated.
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from flask_caching.backends.rediscache import RedisCache
+from app.services.metrics import record_tier_lookups
+
+
+class LocalTier:
+    """Thread-safe LRU of values that expire after a fixed TTL"""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        # Bumped by every invalidation; loads that started earlier are not stored
+        self.generation = 0
+        self._entries = OrderedDict()   # key -> (expires at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value, generation):
+        """Store a value loaded from Redis, unless it was invalidated while loading"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+class TwoTierRedisCache(RedisCache):
+    """
+    RedisCache with a per-process tier for keys starting with one of
+    CACHE_LOCAL_PREFIXES, kept coherent across workers over pub/sub
+
+    Config:
+        CACHE_LOCAL_MAX_ENTRIES: Size of the local LRU per process
+        CACHE_LOCAL_TIMEOUT: Seconds a local copy is served at most
+        CACHE_LOCAL_PREFIXES: Key prefixes cached locally
+        CACHE_INVALIDATION_CHANNEL: Redis channel carrying invalidations
+    """
+
+    def __init__(self, *args, local_max_entries=1024, local_timeout=30, local_prefixes=(),
+                 channel='cache:invalidate', logger=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.local = LocalTier(local_max_entries, local_timeout)
+        self.local_prefixes = tuple(local_prefixes)
+        self.channel = channel
+        self.logger = logger or logging.getLogger(__name__)
+        self._origin = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            local_max_entries=config.get('CACHE_LOCAL_MAX_ENTRIES', 1024),
+            local_timeout=config.get('CACHE_LOCAL_TIMEOUT', 30),
+            local_prefixes=config.get('CACHE_LOCAL_PREFIXES', ()),
+            channel=config.get('CACHE_INVALIDATION_CHANNEL', 'cache:invalidate'),
+            logger=app.logger
+        )
+        return super().factory(app, config, args, kwargs)
+
+    def is_local(self, key):
+        return key.startswith(self.local_prefixes)
+
+    # Reads
+
+    def get(self, key):
+        return self.get_many(key)[0]
+
+    def get_many(self, *keys):
+        self.ensure_listener()
+
+        values = [None] * len(keys)
+        remote = []
+        local_lookups = local_hits = 0
+        for i, key in enumerate(keys):
+            if self.is_local(key):
+                local_lookups += 1
+                values[i] = self.local.get(key)
+                if values[i] is not None:
+                    local_hits += 1
+                    continue
+            remote.append(i)
+
+        remote_hits = 0
+        if remote:
+            generation = self.local.generation
+            for i, value in zip(remote, super().get_many(*[keys[i] for i in remote])):
+                if value is None:
+                    continue
+                remote_hits += 1
+                values[i] = value
+                if self.is_local(keys[i]):
+                    self.local.put(keys[i], value, generation)
+
+        record_tier_lookups('local', local_hits, local_lookups - local_hits)
+        record_tier_lookups('redis', remote_hits, len(remote) - remote_hits)
+        return values
+
+    # Writes (Redis first, then drop local copies everywhere)
+
+    def set(self, key, value, timeout=None):
+        result = super().set(key, value, timeout)
+        self.invalidate([key])
+        return result
+
+    def add(self, key, value, timeout=None):
+        result = super().add(key, value, timeout)
+        if result:
+            self.invalidate([key])
+        return result
+
+    def set_many(self, mapping, timeout=None):
+        result = super().set_many(mapping, timeout)
+        self.invalidate(list(mapping))
+        return result
+
+    def delete(self, key):
+        result = super().delete(key)
+        self.invalidate([key])
+        return result
+
+    def delete_many(self, *keys):
+        result = super().delete_many(*keys)
+        self.invalidate(keys)
+        return result
+
+    def inc(self, key, delta=1):
+        result = super().inc(key, delta)
+        self.invalidate([key])
+        return result
+
+    def dec(self, key, delta=1):
+        result = super().dec(key, delta)
+        self.invalidate([key])
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self.local.clear()
+        self.publish(None)
+        return result
+
+    # Invalidation across workers
+
+    def invalidate(self, keys):
+        keys = [key for key in keys if self.is_local(key)]
+        if keys:
+            self.local.discard(keys)
+            self.publish(keys)
+
+    def publish(self, keys):
+        """Tell other workers to drop keys (None = everything)"""
+        self.ensure_listener()
+        try:
+            self._write_client.publish(self.channel, json.dumps({'origin': self._origin, 'keys': keys}))
+        except Exception as e:
+            self.logger.warning(f'Failed to publish cache invalidation: {e}')
+
+    def ensure_listener(self):
+        """Subscribe to invalidations once per process (again after a fork)"""
+        if self._listener_pid == os.getpid():
+            return
+
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # Copies inherited from the parent process were never invalidated
+            self.local.clear()
+            self._origin = f'{os.getpid()}-{uuid.uuid4().hex}'
+            self._listener_pid = os.getpid()
+            threading.Thread(target=self.listen, name='cache-invalidation', daemon=True).start()
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self._write_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Invalidations sent while not subscribed are lost
+                self.local.clear()
+                for message in pubsub.listen():
+                    self.apply(message['data'])
+            except Exception as e:
+                self.logger.warning(f'Cache invalidation listener failed: {e}')
+                time.sleep(1)
+
+    def apply(self, data):
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get('origin') == self._origin:
+            return
+        if message.get('keys') is None:
+            self.local.clear()
+        else:
+            self.local.discard(message['keys'])
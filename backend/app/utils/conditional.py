@@ -0,0 +1,79 @@
+"""
+Conditional GET support (weak ETags, If-None-Match -> 304, Cache-Control)
+"""
+import json
+import hashlib
+from functools import wraps
+from flask import g, request, make_response
+
+
+def weak_etag(*validators):
+    """ETag value derived from validator values (ids, updated_at, counters, ...)"""
+    raw = '|'.join(str(value) for value in validators)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def body_etag(response):
+    """ETag of a JSON response body, ignoring the per-response timestamp"""
+    payload = response.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload.pop('timestamp', None)
+        return weak_etag(json.dumps(payload, sort_keys=True, default=str))
+    return weak_etag(response.get_data(as_text=True))
+
+
+def check_not_modified(*validators):
+    """
+    Answer If-None-Match before doing any serialization work
+
+    Call inside a view decorated with @conditional once the validators are
+    known; return the result if it is not None.
+
+    Returns:
+        Response (304) or None when the client's copy is stale
+    """
+    g.etag = weak_etag(*validators)
+    if request.if_none_match.contains_weak(g.etag):
+        return make_response('', 304)
+    return None
+
+
+def conditional(max_age=0, private=False):
+    """
+    Add a weak ETag and Cache-Control to successful GET responses and turn
+    them into 304s when If-None-Match matches
+
+    The ETag comes from check_not_modified() when the view called it,
+    otherwise from a hash of the response body.
+
+    Args:
+        max_age: Seconds caches may reuse the response without asking
+            (0 = store but revalidate every time)
+        private: Only the browser may cache (authenticated responses)
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            g.etag = None
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code not in (200, 304):
+                return response
+
+            if response.status_code == 200:
+                response.set_etag(g.etag or body_etag(response), weak=True)
+                response.make_conditional(request)
+            else:
+                response.set_etag(g.etag, weak=True)
+
+            if private:
+                response.cache_control.private = True
+            else:
+                response.cache_control.public = True
+            if max_age:
+                response.cache_control.max_age = max_age
+            else:
+                response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+    return decorator
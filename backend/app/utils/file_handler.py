@@ -2,20 +2,31 @@
 File handling utilities
 """
 import os
-import uuid
+import glob
+import hashlib
+import tempfile
+from datetime import datetime
 from werkzeug.utils import secure_filename
 from flask import current_app, url_for
-from PIL import Image
 
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
 
-def save_file(file, category='general', resize_image=None):
+
+def save_file(file, category='general', resize_image=None, user_id=None):
     """
     Save uploaded file to local storage
 
+    The upload is streamed to a temp file while being hashed, then stored
+    under a content-addressed name. Uploading identical content again
+    reuses the stored file and bumps its FileUpload reference count.
+
     Args:
         file: FileStorage object from request.files
         category: Category folder (profile, resume, logo, course, attachment)
-        resize_image: Tuple of (width, height) to resize images
+        resize_image: Tuple of (width, height) to resize images. Resizing runs
+            in the background; use process_image() after committing the
+            returned path if the stored URL should be swapped when ready.
+        user_id: Uploading user (recorded on the FileUpload row)
 
     Returns:
         dict: {success: bool, file_path: str, file_id: str, error: str}
@@ -34,73 +45,272 @@ def save_file(file, category='general', resize_image=None):
         if ext not in current_app.config.get('ALLOWED_EXTENSIONS', set()):
             return {'success': False, 'error': f'File extension .{ext} not allowed'}
 
-        # Generate unique file ID
-        file_id = str(uuid.uuid4())
-        new_filename = f"{file_id}.{ext}"
-
         # Create category folder if it doesn't exist
         upload_folder = current_app.config.get('UPLOAD_FOLDER', './uploads')
         category_path = os.path.join(upload_folder, category)
         os.makedirs(category_path, exist_ok=True)
 
-        # Full file path
-        file_path = os.path.join(category_path, new_filename)
-
-        # Save file
-        file.save(file_path)
-
-        # Resize image if needed
-        if resize_image and ext in ['jpg', 'jpeg', 'png', 'gif']:
-            try:
-                with Image.open(file_path) as img:
-                    img.thumbnail(resize_image, Image.Resampling.LANCZOS)
-                    img.save(file_path)
-            except Exception as e:
-                print(f"Error resizing image: {e}")
-
-        # Return relative path for database storage
-        relative_path = f"/uploads/{category}/{new_filename}"
-
-        return {
-            'success': True,
-            'file_path': relative_path,
-            'file_id': file_id,
-            'filename': new_filename,
-            'original_filename': filename,
-            'size': os.path.getsize(file_path)
-        }
+        # Stream to a temp file in the same folder (so the final rename is atomic)
+        tmp_path, content_hash, size = write_stream(file.stream, category_path)
+
+        result = store_file(
+            tmp_path,
+            content_hash=content_hash,
+            size=size,
+            ext=ext,
+            category=category,
+            user_id=user_id,
+            original_filename=filename,
+            file_type=file.mimetype
+        )
+
+        # Resize image in the background (variants appear once processed)
+        if resize_image and ext in IMAGE_EXTENSIONS:
+            from app.services.image_processing import process_image
+            result['variants'] = process_image(result['file_path'], resize_image)
+
+        return result
 
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
+def write_stream(stream, directory, chunk_size=None):
+    """
+    Copy a stream to a temp file in chunks, hashing while writing
+
+    Args:
+        stream: Readable binary stream
+        directory: Folder for the temp file (same filesystem as the destination)
+        chunk_size: Bytes per read (default UPLOAD_CHUNK_SIZE)
+
+    Returns:
+        tuple: (tmp_path, sha256 hex digest, size in bytes)
+    """
+    chunk_size = chunk_size or current_app.config.get('UPLOAD_CHUNK_SIZE', 65536)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    return tmp_path, digest.hexdigest(), size
+
+
+def content_path(content_hash, ext, category):
+    """
+    Get relative path for content-addressed storage
+
+    Example: /uploads/resumes/9f/9f86d08...a08.pdf
+    """
+    return f"/uploads/{category}/{content_hash[:2]}/{content_hash}.{ext}"
+
+
+def store_file(tmp_path, content_hash, size, ext, category, user_id=None,
+               original_filename=None, file_type=None, record=None):
+    """
+    Move a fully written temp file into content-addressed storage
+
+    If the same content is already stored for the category the temp file is
+    discarded and the existing FileUpload reference count is incremented.
+
+    Args:
+        record: Existing FileUpload row to complete (resumable uploads)
+            instead of inserting a new one. It is soft deleted with status
+            'duplicate' (pointing at the stored copy) when the content turns
+            out to be a duplicate.
+
+    Returns:
+        dict: save_file() style result with 'duplicate' flag
+    """
+    from sqlalchemy.exc import IntegrityError
+    from app.extensions import db
+    from app.models.all_models import FileUpload
+
+    pending = record
+
+    def reuse(record):
+        record.reference_count += 1
+        if pending is not None:
+            pending.upload_status = 'duplicate'
+            pending.file_path = record.file_path
+            pending.deleted_at = datetime.utcnow()
+        db.session.commit()
+        return upload_result(record, original_filename, duplicate=True)
+
+    # Locked until reuse() commits: delete_file() cannot release the last
+    # reference in between, and a row it is deleting no longer matches
+    existing = FileUpload.query.filter_by(
+        content_hash=content_hash,
+        category=category,
+        deleted_at=None
+    ).populate_existing().with_for_update().first()
+
+    if existing:
+        existing_path = get_local_path(existing.file_path)
+        if os.path.exists(existing_path):
+            os.remove(tmp_path)
+        else:
+            # Row survived but the file went missing on disk; restore it
+            os.makedirs(os.path.dirname(existing_path), exist_ok=True)
+            os.replace(tmp_path, existing_path)
+        return reuse(existing)
+
+    relative_path = content_path(content_hash, ext, category)
+    full_path = get_local_path(relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    os.replace(tmp_path, full_path)
+
+    record = pending or FileUpload(user_id=user_id, category=category)
+    record.file_name = original_filename or record.file_name or os.path.basename(relative_path)
+    record.file_path = relative_path
+    record.file_type = file_type or record.file_type
+    record.file_size = size
+    record.content_hash = content_hash
+    record.reference_count = 1
+    record.upload_status = 'complete'
+    record.bytes_received = size
+
+    try:
+        record.save()
+    except IntegrityError:
+        # Same content stored concurrently by another request
+        db.session.rollback()
+        if pending is not None:
+            pending = db.session.get(FileUpload, pending.file_id)
+        return reuse(FileUpload.query.filter_by(
+            content_hash=content_hash,
+            category=category,
+            deleted_at=None
+        ).populate_existing().with_for_update().first())
+
+    return upload_result(record, original_filename)
+
+
+def upload_result(record, original_filename=None, duplicate=False):
+    """Build the save_file() result dict for a FileUpload row"""
+    return {
+        'success': True,
+        'file_path': record.file_path,
+        'file_id': record.file_id,
+        'filename': os.path.basename(record.file_path),
+        'original_filename': original_filename or record.file_name,
+        'size': record.file_size,
+        'content_hash': record.content_hash,
+        'duplicate': duplicate
+    }
+
+
+def get_local_path(file_path):
+    """
+    Get filesystem path for a relative upload path
+
+    Args:
+        file_path: Relative file path (e.g., /uploads/profiles/ab/abc123.jpg)
+
+    Returns:
+        str: Path inside UPLOAD_FOLDER
+    """
+    upload_folder = current_app.config.get('UPLOAD_FOLDER', './uploads')
+    if file_path.startswith('/uploads/'):
+        return os.path.join(upload_folder, file_path[len('/uploads/'):])
+    return os.path.join(os.getcwd(), file_path.lstrip('/'))
+
+
+def retain_file(file_path):
+    """
+    Add a reference to a stored file for another row keeping its URL (e.g.
+    the resume copied onto an application), in the caller's transaction
+
+    The reference is released with delete_file() like any other.
+
+    Returns:
+        bool: True if the file is tracked and a reference was added
+    """
+    from app.models.all_models import FileUpload
+
+    if not file_path:
+        return False
+
+    return FileUpload.query.filter_by(file_path=file_path, deleted_at=None).update(
+        {'reference_count': FileUpload.reference_count + 1},
+        synchronize_session=False
+    ) > 0
+
+
 def delete_file(file_path):
     """
     Delete file from local storage
 
+    Files tracked in FileUpload are reference counted and only removed from
+    disk (with their image variants) once the last reference is released.
+    The URL of a variant releases a reference to its original.
+
     Args:
         file_path: Relative file path (e.g., /uploads/profiles/abc123.jpg)
 
     Returns:
-        bool: True if deleted successfully
+        bool: True if deleted (or a reference was released) successfully
     """
+    from app.extensions import db
+    from app.models.all_models import FileUpload
+
     try:
         if not file_path:
             return False
 
-        # Remove leading slash if present
-        if file_path.startswith('/'):
-            file_path = file_path[1:]
-
-        full_path = os.path.join(os.getcwd(), file_path)
-
-        if os.path.exists(full_path):
-            os.remove(full_path)
+        folder, filename = file_path.rsplit('/', 1)
+        content_hash = filename.rsplit('.', 1)[0].split('_', 1)[0]
+
+        # Locked so store_file() cannot reuse the row while it is released
+        record = FileUpload.query.filter(
+            FileUpload.deleted_at.is_(None),
+            db.or_(
+                FileUpload.file_path == file_path,
+                db.and_(FileUpload.content_hash == content_hash,
+                        FileUpload.file_path.startswith(f'{folder}/'))
+            )
+        ).populate_existing().with_for_update().first()
+
+        if record is None:
+            paths = [get_local_path(file_path)]
+        elif record.reference_count > 1:
+            record.reference_count -= 1
+            db.session.commit()
             return True
-        return False
+        else:
+            record.reference_count = 0
+            record.deleted_at = datetime.utcnow()
+            db.session.flush()
+            full_path = get_local_path(record.file_path)
+            stem = os.path.basename(full_path).rsplit('.', 1)[0]
+            paths = [full_path] + glob.glob(os.path.join(os.path.dirname(full_path), f'{glob.escape(stem)}_*'))
+
+        # Removed before the lock is released, so a concurrent upload of the
+        # same content waits and then stores a fresh copy
+        removed = False
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+                removed = True
+
+        db.session.commit()
+        return removed or record is not None
 
     except Exception as e:
-        print(f"Error deleting file: {e}")
+        db.session.rollback()
+        current_app.logger.error(f'Error deleting file {file_path}: {e}')
         return False
 
 
@@ -1,7 +1,9 @@
 """
 Helper utilities
 """
-from flask import request, jsonify, current_app
+import io
+import csv
+from flask import Response, request, jsonify, current_app, stream_with_context
 from datetime import datetime
 
 
@@ -68,6 +70,54 @@ def success_response(data=None, message=None, status=200):
     return jsonify(response), status
 
 
+def stream_success_response(data, stream_key, items, message=None, status=200, chunk_size=100):
+    """
+    Create a standardized success response whose largest list is encoded and
+    sent incrementally instead of being built as one string
+
+    Args:
+        data: Response data (dict) without the streamed list
+        stream_key: Key of the streamed list inside data (sent last)
+        items: Iterable of JSON-serializable values, e.g. a generator of
+            to_dict() over query.yield_per()
+        message: Success message
+        status: HTTP status code
+        chunk_size: Items encoded per chunk written to the client
+
+    Returns:
+        Response: Streamed application/json response
+    """
+    dumps = current_app.json.dumps
+    response = {
+        'success': True,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+    if message:
+        response['message'] = message
+
+    def open_object(obj):
+        # '{"a":1}' -> '{"a":1,' so more members can follow
+        encoded = dumps(obj)
+        return encoded[:-1] + (',' if len(encoded) > 2 else '')
+
+    def generate():
+        yield f'{open_object(response)}"data":{open_object(data)}{dumps(stream_key)}:['
+        chunk = []
+        separator = ''
+        for item in items:
+            chunk.append(dumps(item))
+            if len(chunk) >= chunk_size:
+                yield separator + ','.join(chunk)
+                separator = ','
+                chunk = []
+        if chunk:
+            yield separator + ','.join(chunk)
+        yield ']}}'
+
+    return Response(stream_with_context(generate()), status=status, mimetype='application/json')
+
+
 def error_response(message, errors=None, status=400):
     """
     Create standardized error response
@@ -167,3 +217,20 @@ def filter_dict(data, allowed_keys):
         Filtered dictionary
     """
     return {key: value for key, value in data.items() if key in allowed_keys}
+
+
+def iter_csv_lines(columns, rows):
+    """Render dict rows as CSV text one line at a time (list values joined with ;)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield line(columns)
+    for row in rows:
+        yield line([';'.join(row[column]) if isinstance(row[column], list) else row[column] for column in columns])
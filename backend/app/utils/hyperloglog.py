@@ -0,0 +1,48 @@
+"""
+HyperLogLog cardinality estimator
+In-process counterpart of Redis PFADD/PFCOUNT for unique-viewer estimates
+"""
+import math
+import hashlib
+
+
+class HyperLogLog:
+    """Approximate distinct counter (~1.6% standard error at precision 12)"""
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, value):
+        """Add a value; returns True if the estimate may have changed"""
+        x = int.from_bytes(hashlib.sha1(str(value).encode()).digest()[:8], 'big')
+        index = x >> (64 - self.precision)
+        remaining = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other):
+        """Merge another HyperLogLog of the same precision into this one"""
+        for i, rank in enumerate(other.registers):
+            if rank > self.registers[i]:
+                self.registers[i] = rank
+
+    def count(self):
+        """Estimated number of distinct values added"""
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -r for r in self.registers)
+
+        # Small range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
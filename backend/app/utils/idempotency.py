@@ -0,0 +1,83 @@
+"""
+Idempotency-Key support for retry-safe POST endpoints
+"""
+import hashlib
+from functools import wraps
+from flask import request, current_app, make_response
+from flask_jwt_extended import get_jwt_identity
+from app.extensions import cache
+from app.utils.helpers import error_response
+
+
+IDEMPOTENCY_KEY = 'idempotency:{scope}:{user_id}:{key}'
+
+# Longest accepted Idempotency-Key header
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(scope):
+    """
+    Replay the stored response when a request is retried with the same
+    Idempotency-Key header
+
+    The first response (anything below 500) is cached per user and key for
+    IDEMPOTENCY_KEY_TTL seconds. A retry with the same key and body gets the
+    same status and body back (with Idempotent-Replayed: true) without
+    running the view again. Reusing a key with a different body is a 422;
+    a retry while the first request is still running is a 409.
+
+    Must be applied after token_required (the key is scoped to the user).
+
+    Args:
+        scope: Name separating keys of different endpoints (e.g. 'apply')
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get('Idempotency-Key')
+            if not key:
+                return fn(*args, **kwargs)
+
+            if len(key) > MAX_KEY_LENGTH:
+                return error_response(f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters', status=400)
+
+            cache_key = IDEMPOTENCY_KEY.format(scope=scope, user_id=get_jwt_identity(), key=key)
+            fingerprint = hashlib.sha256(
+                f"{request.path}|{request.get_data(as_text=True)}".encode()
+            ).hexdigest()
+            ttl = current_app.config.get('IDEMPOTENCY_KEY_TTL', 86400)
+
+            lock_key = f'{cache_key}:lock'
+
+            stored = cache.get(cache_key)
+            if stored is None:
+                if not cache.add(lock_key, 1, timeout=60):
+                    return error_response('A request with this Idempotency-Key is still in progress', status=409)
+
+                # The first request may have finished between the two lookups
+                stored = cache.get(cache_key)
+                if stored is not None:
+                    cache.delete(lock_key)
+
+            if stored is not None:
+                if stored['fingerprint'] != fingerprint:
+                    return error_response('Idempotency-Key was already used with a different request', status=422)
+                response = make_response(stored['body'], stored['status'])
+                response.mimetype = 'application/json'
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response
+
+            try:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code < 500:
+                    cache.set(cache_key, {
+                        'fingerprint': fingerprint,
+                        'status': response.status_code,
+                        'body': response.get_data(as_text=True)
+                    }, timeout=ttl)
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        return wrapper
+    return decorator
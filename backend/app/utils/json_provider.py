@@ -0,0 +1,62 @@
+"""
+Fast JSON provider (orjson)
+
+Serializes datetime, date and time (ISO 8601, like .isoformat()), UUID and
+dataclasses natively, and Decimal as float. to_dict() methods can therefore
+return raw column values.
+"""
+import decimal
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def default(value):
+    """Types orjson does not serialize itself"""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps_bytes(obj, option=0):
+    return orjson.dumps(obj, default=default, option=OPTIONS | option)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding with orjson (app.json, used by jsonify)
+
+    indent and sort_keys map to orjson options; calls passing other stdlib
+    json arguments (cls, ...) fall back to the default provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = 0
+        if kwargs.pop('indent', None):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.pop('sort_keys', False):
+            option |= orjson.OPT_SORT_KEYS
+        kwargs.pop('separators', None)
+        kwargs.pop('ensure_ascii', None)
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Readable output in debug mode, like the default provider
+        option = 0
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option = orjson.OPT_INDENT_2
+        return self._app.response_class(dumps_bytes(obj, option), mimetype=self.mimetype)
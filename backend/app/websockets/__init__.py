@@ -1,17 +1,20 @@
 """
 WebSocket Event Handlers
 """
+from flask import request
 from flask_socketio import emit, join_room, leave_room
 from flask_jwt_extended import decode_token
 from app.extensions import socketio, db
 from app.models.websocket import WebSocketSession
 from app.models.messaging import Message
+from app.services.notifications import user_room
+from app.services.metrics import counted_socket_event, socket_connected, socket_disconnected
 
 
 def register_socket_events(socketio_instance):
     """Register all WebSocket event handlers"""
 
-    @socketio_instance.on('connect')
+    @counted_socket_event(socketio_instance, 'connect')
     def handle_connect(auth):
         """Handle client connection"""
         try:
@@ -30,16 +33,21 @@ def register_socket_events(socketio_instance):
             )
             session.save()
 
+            # Personal room for notification push
+            join_room(user_room(user_id))
+
             emit('connected', {'message': 'Successfully connected'})
+            socket_connected()
             return True
 
         except Exception as e:
             print(f"Connection error: {e}")
             return False
 
-    @socketio_instance.on('disconnect')
+    @counted_socket_event(socketio_instance, 'disconnect')
     def handle_disconnect():
         """Handle client disconnection"""
+        socket_disconnected()
         try:
             session = WebSocketSession.query.filter_by(socket_id=request.sid).first()
             if session:
@@ -49,7 +57,7 @@ def register_socket_events(socketio_instance):
         except Exception as e:
             print(f"Disconnection error: {e}")
 
-    @socketio_instance.on('join_conversation')
+    @counted_socket_event(socketio_instance, 'join_conversation')
     def handle_join_conversation(data):
         """Join a conversation room"""
         try:
@@ -64,7 +72,7 @@ def register_socket_events(socketio_instance):
         except Exception as e:
             emit('error', {'message': str(e)})
 
-    @socketio_instance.on('leave_conversation')
+    @counted_socket_event(socketio_instance, 'leave_conversation')
     def handle_leave_conversation(data):
         """Leave a conversation room"""
         try:
@@ -78,7 +86,7 @@ def register_socket_events(socketio_instance):
         except Exception as e:
             emit('error', {'message': str(e)})
 
-    @socketio_instance.on('send_message')
+    @counted_socket_event(socketio_instance, 'send_message')
     def handle_send_message(data):
         """Send a message in a conversation"""
         try:
@@ -114,7 +122,7 @@ def register_socket_events(socketio_instance):
         except Exception as e:
             emit('error', {'message': str(e)})
 
-    @socketio_instance.on('mark_read')
+    @counted_socket_event(socketio_instance, 'mark_read')
     def handle_mark_read(data):
         """Mark messages as read"""
         try:
@@ -143,7 +151,7 @@ def register_socket_events(socketio_instance):
         except Exception as e:
             emit('error', {'message': str(e)})
 
-    @socketio_instance.on('typing')
+    @counted_socket_event(socketio_instance, 'typing')
     def handle_typing(data):
         """Broadcast typing indicator"""
         try:
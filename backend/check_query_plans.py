@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Check that hot queries are served by indexes
+
+Seeds a realistic amount of data in a transaction, runs EXPLAIN on every
+query registered in HOT_QUERIES (built the same way app/routes builds them)
+and exits with status 1 if any of them plans a sequential scan. Everything
+is rolled back afterwards.
+
+Usage:
+    python check_query_plans.py [config_name]   (default: FLASK_ENV or development)
+"""
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.models import (
+    User, StudentProfile, StudentSkill, EmployerProfile, MentorProfile,
+    Job, JobSkillRequired, JobApplication, SavedJob,
+    MentorshipRequest, MentorshipSession, MentorshipReview,
+    Conversation, ConversationParticipant, Message,
+    Course, CourseEnrollment, AIToolUsage,
+    Post, PostLike, PostComment, Notification
+)
+
+
+# Seeded rows per parent; enough that a sequential scan is never the cheap plan
+STUDENTS = 500
+EMPLOYERS = 50
+MENTORS = 50
+JOBS_PER_EMPLOYER = 20
+APPLICATIONS_PER_STUDENT = 10
+ROWS_PER_USER = 5
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+def seed():
+    """Insert seed rows and return one id of each kind to query with"""
+    now = datetime.utcnow()
+    rows = {model: [] for model in [
+        User, StudentProfile, StudentSkill, EmployerProfile, MentorProfile,
+        Job, JobSkillRequired, JobApplication, SavedJob,
+        MentorshipRequest, MentorshipSession, MentorshipReview,
+        Conversation, ConversationParticipant, Message,
+        Course, CourseEnrollment, AIToolUsage,
+        Post, PostLike, PostComment, Notification
+    ]}
+
+    def user(user_type):
+        user_id = new_id()
+        rows[User].append({
+            'user_id': user_id, 'email': f'{user_id}@plans.test', 'password_hash': '-',
+            'user_type': user_type, 'created_at': now, 'updated_at': now
+        })
+        return user_id
+
+    students = [user('student') for _ in range(STUDENTS)]
+    employers = [user('employer') for _ in range(EMPLOYERS)]
+    mentors = [user('mentor') for _ in range(MENTORS)]
+
+    rows[StudentProfile] = [{'student_id': s, 'full_name': 'Student'} for s in students]
+    rows[EmployerProfile] = [{'employer_id': e, 'company_name': 'Company'} for e in employers]
+    rows[MentorProfile] = [
+        {'mentor_id': m, 'full_name': 'Mentor', 'current_role': 'Engineer', 'current_company': 'Company'}
+        for m in mentors
+    ]
+
+    jobs = []
+    for e in employers:
+        for i in range(JOBS_PER_EMPLOYER):
+            job_id = new_id()
+            jobs.append(job_id)
+            rows[Job].append({
+                'job_id': job_id, 'employer_id': e, 'title': 'Job', 'company_name': 'Company',
+                'description': '-', 'job_type': 'full-time', 'status': 'active' if i % 4 else 'closed',
+                'posted_at': now - timedelta(hours=i), 'created_at': now, 'updated_at': now
+            })
+            rows[JobSkillRequired] += [
+                {'id': new_id(), 'job_id': job_id, 'skill_name': f'skill{k}'} for k in range(3)
+            ]
+
+    courses = [new_id() for _ in range(50)]
+    rows[Course] = [
+        {'course_id': c, 'title': 'Course', 'description': '-', 'created_at': now, 'updated_at': now}
+        for c in courses
+    ]
+
+    posts = []
+    for n, s in enumerate(students):
+        for k in range(APPLICATIONS_PER_STUDENT):
+            rows[JobApplication].append({
+                'application_id': new_id(), 'job_id': jobs[(n * APPLICATIONS_PER_STUDENT + k) % len(jobs)],
+                'student_id': s, 'applied_at': now - timedelta(minutes=k)
+            })
+        for k in range(ROWS_PER_USER):
+            mentor = mentors[(n + k) % len(mentors)]
+            request_id, session_id = new_id(), new_id()
+            rows[StudentSkill].append({'skill_id': new_id(), 'student_id': s, 'skill_name': f'skill{k}'})
+            rows[SavedJob].append({'id': new_id(), 'student_id': s, 'job_id': jobs[(n + k) % len(jobs)], 'saved_at': now})
+            rows[CourseEnrollment].append({
+                'enrollment_id': new_id(), 'student_id': s, 'course_id': courses[(n + k) % len(courses)], 'enrolled_at': now
+            })
+            rows[AIToolUsage].append({'usage_id': new_id(), 'student_id': s, 'tool_name': 'resume', 'used_at': now})
+            rows[MentorshipRequest].append({
+                'request_id': request_id, 'student_id': s, 'mentor_id': mentor, 'status': 'pending', 'requested_at': now
+            })
+            rows[MentorshipSession].append({
+                'session_id': session_id, 'request_id': request_id, 'student_id': s, 'mentor_id': mentor,
+                'scheduled_at': now + timedelta(days=k)
+            })
+            rows[MentorshipReview].append({
+                'review_id': new_id(), 'session_id': session_id, 'student_id': s, 'mentor_id': mentor, 'rating': 5
+            })
+            rows[Notification].append({
+                'notification_id': new_id(), 'user_id': s, 'type': 'system', 'title': '-', 'message': '-',
+                'is_read': bool(k % 2), 'created_at': now - timedelta(minutes=k)
+            })
+
+            conversation_id = new_id()
+            other = employers[(n + k) % len(employers)]
+            rows[Conversation].append({'conversation_id': conversation_id, 'created_at': now, 'updated_at': now})
+            rows[ConversationParticipant] += [
+                {'id': new_id(), 'conversation_id': conversation_id, 'user_id': s},
+                {'id': new_id(), 'conversation_id': conversation_id, 'user_id': other}
+            ]
+            rows[Message] += [
+                {'message_id': new_id(), 'conversation_id': conversation_id, 'sender_id': sender,
+                 'message_text': '-', 'is_read': False, 'sent_at': now}
+                for sender in (s, other)
+            ]
+
+            post_id = new_id()
+            posts.append(post_id)
+            rows[Post].append({
+                'post_id': post_id, 'author_id': s, 'content': '-', 'post_type': 'general' if k else 'achievement',
+                'created_at': now - timedelta(minutes=n * ROWS_PER_USER + k), 'updated_at': now
+            })
+            rows[PostLike].append({'id': new_id(), 'post_id': post_id, 'user_id': students[(n + 1) % len(students)]})
+            rows[PostComment].append({
+                'comment_id': new_id(), 'post_id': post_id, 'user_id': students[(n + 1) % len(students)],
+                'comment_text': '-', 'created_at': now
+            })
+
+    for model, values in rows.items():
+        if values:
+            db.session.execute(db.insert(model), values)
+
+    return {
+        'student_id': students[0],
+        'employer_id': employers[0],
+        'mentor_id': mentors[0],
+        'job_id': jobs[0],
+        'conversation_id': rows[Conversation][0]['conversation_id'],
+        'session_id': rows[MentorshipSession][0]['session_id'],
+        'post_id': posts[0],
+        'course_id': courses[0]
+    }
+
+
+# name -> function(ids) returning the query, as built in app/routes and app/services
+HOT_QUERIES = {
+    'jobs: active listing': lambda ids: Job.query.filter_by(
+        status='active', deleted_at=None
+    ).order_by(Job.posted_at.desc()).limit(20),
+    'jobs: employer listing': lambda ids: Job.query.filter_by(
+        employer_id=ids['employer_id'], deleted_at=None
+    ).order_by(Job.posted_at.desc()).limit(20),
+    'jobs: required skills': lambda ids: JobSkillRequired.query.filter_by(
+        job_id=ids['job_id'], deleted_at=None
+    ),
+    'jobs: applicants': lambda ids: JobApplication.query.filter_by(
+        job_id=ids['job_id'], deleted_at=None
+    ).order_by(JobApplication.applied_at.desc()).limit(20),
+    'jobs: applicants by status': lambda ids: JobApplication.query.filter_by(
+        job_id=ids['job_id'], deleted_at=None, status='pending'
+    ),
+    'jobs: my applications': lambda ids: JobApplication.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ).order_by(JobApplication.applied_at.desc()).limit(20),
+    'jobs: saved check': lambda ids: SavedJob.query.filter_by(
+        student_id=ids['student_id'], job_id=ids['job_id'], deleted_at=None
+    ).limit(1),
+    'jobs: saved listing': lambda ids: SavedJob.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ).order_by(SavedJob.saved_at.desc()).limit(20),
+    'students: skills': lambda ids: StudentSkill.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ),
+    'students: duplicate skill check': lambda ids: StudentSkill.query.filter_by(
+        student_id=ids['student_id'], skill_name='skill1', deleted_at=None
+    ).limit(1),
+    'mentors: student requests': lambda ids: MentorshipRequest.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ).order_by(MentorshipRequest.requested_at.desc()).limit(20),
+    'mentors: mentor requests': lambda ids: MentorshipRequest.query.filter_by(
+        mentor_id=ids['mentor_id'], deleted_at=None
+    ).order_by(MentorshipRequest.requested_at.desc()).limit(20),
+    'mentors: student sessions': lambda ids: MentorshipSession.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ).order_by(MentorshipSession.scheduled_at.desc()).limit(20),
+    'mentors: mentor sessions': lambda ids: MentorshipSession.query.filter_by(
+        mentor_id=ids['mentor_id'], deleted_at=None
+    ).order_by(MentorshipSession.scheduled_at.desc()).limit(20),
+    'mentors: review check': lambda ids: MentorshipReview.query.filter_by(
+        session_id=ids['session_id'], deleted_at=None
+    ).limit(1),
+    'messaging: conversation list': lambda ids: Conversation.query.join(ConversationParticipant).filter(
+        ConversationParticipant.user_id == ids['student_id'],
+        ConversationParticipant.deleted_at.is_(None),
+        Conversation.deleted_at.is_(None)
+    ).order_by(Conversation.updated_at.desc()),
+    'messaging: participant check': lambda ids: ConversationParticipant.query.filter_by(
+        conversation_id=ids['conversation_id'], user_id=ids['student_id'], deleted_at=None
+    ).limit(1),
+    'messaging: messages': lambda ids: Message.query.filter_by(
+        conversation_id=ids['conversation_id'], deleted_at=None
+    ).order_by(Message.sent_at.asc()),
+    'messaging: unread in conversation': lambda ids: Message.query.filter(
+        Message.conversation_id == ids['conversation_id'],
+        Message.sender_id != ids['student_id'],
+        Message.is_read == False,
+        Message.deleted_at.is_(None)
+    ),
+    'messaging: unread count': lambda ids: Message.query.join(
+        ConversationParticipant, ConversationParticipant.conversation_id == Message.conversation_id
+    ).filter(
+        ConversationParticipant.user_id == ids['student_id'],
+        Message.sender_id != ids['student_id'],
+        Message.is_read == False,
+        Message.deleted_at.is_(None),
+        ConversationParticipant.deleted_at.is_(None)
+    ),
+    'social: feed': lambda ids: Post.query.filter_by(deleted_at=None).order_by(Post.created_at.desc()).limit(20),
+    'social: feed by type': lambda ids: Post.query.filter_by(
+        deleted_at=None, post_type='achievement'
+    ).order_by(Post.created_at.desc()).limit(20),
+    'social: like check': lambda ids: PostLike.query.filter_by(
+        post_id=ids['post_id'], user_id=ids['student_id'], deleted_at=None
+    ).limit(1),
+    'social: comments': lambda ids: PostComment.query.filter_by(
+        post_id=ids['post_id'], deleted_at=None
+    ).order_by(PostComment.created_at.desc()).limit(20),
+    'courses: enrollment check': lambda ids: CourseEnrollment.query.filter_by(
+        student_id=ids['student_id'], course_id=ids['course_id'], deleted_at=None
+    ).limit(1),
+    'courses: my enrollments': lambda ids: CourseEnrollment.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ).order_by(CourseEnrollment.enrolled_at.desc()).limit(20),
+    'ai_tools: usage history': lambda ids: AIToolUsage.query.filter_by(
+        student_id=ids['student_id'], deleted_at=None
+    ).order_by(AIToolUsage.used_at.desc()).limit(20),
+    'notifications: list': lambda ids: Notification.query.filter(
+        Notification.user_id == ids['student_id'],
+        Notification.deleted_at.is_(None)
+    ).order_by(Notification.created_at.desc(), Notification.notification_id.desc()).limit(21),
+    'notifications: unread count': lambda ids: Notification.query.filter_by(
+        user_id=ids['student_id'], is_read=False, deleted_at=None
+    ),
+}
+
+
+def explain(query):
+    """
+    Get the plan of a query
+
+    Returns:
+        tuple: (plan lines, sequentially scanned tables)
+    """
+    dialect = db.session.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+    if dialect.name == 'sqlite':
+        lines = [row[3] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}'))]
+        # "SCAN table" without "USING ... INDEX" reads the whole table
+        scans = [line.split()[1] for line in lines
+                 if line.startswith('SCAN ') and ' USING ' not in line and 'CONSTANT ROW' not in line]
+    else:
+        lines = [row[0] for row in db.session.execute(db.text(f'EXPLAIN {sql}'))]
+        scans = [line.split('Seq Scan on ', 1)[1].split()[0] for line in lines if 'Seq Scan on ' in line]
+
+    return lines, scans
+
+
+def main():
+    config_name = sys.argv[1] if len(sys.argv) > 1 else os.getenv('FLASK_ENV', 'development')
+    app = create_app(config_name)
+    failures = 0
+
+    with app.app_context():
+        try:
+            ids = seed()
+            db.session.execute(db.text('ANALYZE'))
+
+            for name, build in HOT_QUERIES.items():
+                lines, scans = explain(build(ids))
+                if scans:
+                    failures += 1
+                    print(f"FAIL  {name}: sequential scan on {', '.join(scans)}")
+                    for line in lines:
+                        print(f'        {line}')
+                else:
+                    print(f'ok    {name}')
+        finally:
+            db.session.rollback()
+
+    print(f'\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use indexes')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
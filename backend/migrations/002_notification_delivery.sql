@@ -0,0 +1,6 @@
+-- Collabio Database Migration
+-- Notification delivery: unread-count and cursor pagination index
+
+-- Serves unread counts (user_id, is_read) and newest-first pages ordered by created_at
+CREATE INDEX IF NOT EXISTS idx_notifications_user_read_created
+    ON notifications(user_id, is_read, created_at);
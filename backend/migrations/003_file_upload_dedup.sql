@@ -0,0 +1,19 @@
+-- Collabio Database Migration
+-- Content-addressed file storage with reference counting
+
+ALTER TABLE file_uploads ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE file_uploads ADD COLUMN IF NOT EXISTS reference_count INT NOT NULL DEFAULT 1;
+
+-- One stored copy per content hash and category
+CREATE UNIQUE INDEX IF NOT EXISTS idx_uploads_content_hash
+    ON file_uploads(content_hash, category) WHERE deleted_at IS NULL;
+
+-- Reference lookups by stored path (delete_file)
+CREATE INDEX IF NOT EXISTS idx_uploads_path ON file_uploads(file_path);
+
+-- Categories are recorded by upload folder name (profiles, resumes, ...)
+ALTER TABLE file_uploads DROP CONSTRAINT IF EXISTS file_uploads_category_check;
+ALTER TABLE file_uploads ADD CONSTRAINT file_uploads_category_check CHECK (category IN (
+    'profile', 'resume', 'logo', 'course', 'attachment',
+    'profiles', 'resumes', 'logos', 'courses', 'attachments', 'general'
+));
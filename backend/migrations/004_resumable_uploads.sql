@@ -0,0 +1,12 @@
+-- Collabio Database Migration
+-- Resumable (chunked) uploads: progress tracking on file_uploads
+
+ALTER TABLE file_uploads ADD COLUMN IF NOT EXISTS upload_status VARCHAR(20) NOT NULL DEFAULT 'complete'
+    CHECK (upload_status IN ('uploading', 'complete'));
+ALTER TABLE file_uploads ADD COLUMN IF NOT EXISTS bytes_received BIGINT NOT NULL DEFAULT 0;
+
+UPDATE file_uploads SET bytes_received = COALESCE(file_size, 0) WHERE upload_status = 'complete';
+
+-- In-progress uploads per user (status / cleanup)
+CREATE INDEX IF NOT EXISTS idx_uploads_in_progress
+    ON file_uploads(user_id, uploaded_at) WHERE upload_status = 'uploading' AND deleted_at IS NULL;
@@ -0,0 +1,27 @@
+-- Collabio Database Migration
+-- Canonical key for direct (1:1) conversations
+
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS direct_key VARCHAR(64);
+
+-- Backfill: sha256("<smaller user_id>:<larger user_id>") for two-participant
+-- conversations, keeping only the most recently active one per pair
+UPDATE conversations c
+SET direct_key = pairs.direct_key
+FROM (
+    SELECT DISTINCT ON (pair.direct_key) pair.conversation_id, pair.direct_key
+    FROM (
+        SELECT cp.conversation_id,
+               encode(digest(string_agg(cp.user_id::text, ':' ORDER BY cp.user_id::text COLLATE "C"), 'sha256'), 'hex') AS direct_key
+        FROM conversation_participants cp
+        WHERE cp.deleted_at IS NULL
+        GROUP BY cp.conversation_id
+        HAVING COUNT(DISTINCT cp.user_id) = 2 AND COUNT(*) = 2
+    ) pair
+    JOIN conversations conv ON conv.conversation_id = pair.conversation_id AND conv.deleted_at IS NULL
+    ORDER BY pair.direct_key, conv.updated_at DESC
+) pairs
+WHERE c.conversation_id = pairs.conversation_id
+  AND c.direct_key IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_conversations_direct_key
+    ON conversations(direct_key) WHERE deleted_at IS NULL;
@@ -0,0 +1,19 @@
+-- Collabio Database Migration
+-- Transactional outbox for side effects run by the background worker
+
+CREATE TABLE IF NOT EXISTS outbox_events (
+    event_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    event_type VARCHAR(50) NOT NULL,
+    payload JSON NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP
+);
+
+-- Worker polls due events; done/failed rows are never scanned
+CREATE INDEX IF NOT EXISTS idx_outbox_status_available
+    ON outbox_events(status, available_at);
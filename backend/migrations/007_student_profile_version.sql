@@ -0,0 +1,6 @@
+-- Collabio Database Migration
+-- Profile version for cached applicant match scores
+
+-- Bumped by the app whenever skills, education, experience or scored
+-- profile fields change; part of the applicant score cache key
+ALTER TABLE student_profiles ADD COLUMN IF NOT EXISTS profile_version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,32 @@
+-- Collabio Database Migration
+-- Race-free applies: partial unique index and per-job applicant counter
+
+-- Only active applications must be unique, so a withdrawn (soft deleted)
+-- application no longer blocks applying again
+ALTER TABLE job_applications DROP CONSTRAINT IF EXISTS job_applications_job_id_student_id_key;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_job_student_active
+    ON job_applications(job_id, student_id) WHERE deleted_at IS NULL;
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS applications_count INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill counters from existing applications
+UPDATE jobs j
+SET applications_count = counts.total
+FROM (
+    SELECT job_id, COUNT(*) AS total
+    FROM job_applications
+    WHERE deleted_at IS NULL
+    GROUP BY job_id
+) counts
+WHERE j.job_id = counts.job_id;
+
+UPDATE student_profiles s
+SET applications_count = counts.total
+FROM (
+    SELECT student_id, COUNT(*) AS total
+    FROM job_applications
+    WHERE deleted_at IS NULL
+    GROUP BY student_id
+) counts
+WHERE s.student_id = counts.student_id;
@@ -0,0 +1,16 @@
+-- Collabio Database Migration
+-- Partial indexes on open postings for listings and the expiry sweeper
+
+CREATE INDEX IF NOT EXISTS idx_jobs_active_posted
+    ON jobs(posted_at) WHERE status = 'active' AND deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_active_expires
+    ON jobs(expires_at) WHERE status = 'active' AND deleted_at IS NULL AND expires_at IS NOT NULL;
+
+-- Close postings that already expired so they leave the active set right away
+UPDATE jobs
+SET status = 'closed'
+WHERE status = 'active'
+  AND deleted_at IS NULL
+  AND expires_at IS NOT NULL
+  AND expires_at <= CURRENT_TIMESTAMP;
@@ -0,0 +1,80 @@
+-- Collabio Database Migration
+-- Composite partial indexes matched to the filters and sort orders used by app/routes
+-- Verify with: python check_query_plans.py
+
+-- Employer dashboard: own jobs newest first
+CREATE INDEX IF NOT EXISTS idx_jobs_employer_posted
+    ON jobs(employer_id, posted_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_jobs_employer;
+
+-- Applicants of a job / a student's applications, newest first
+CREATE INDEX IF NOT EXISTS idx_applications_job_applied
+    ON job_applications(job_id, applied_at) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_applications_student_applied
+    ON job_applications(student_id, applied_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_applications_job;
+DROP INDEX IF EXISTS idx_applications_student;
+
+-- Saved jobs list (save/unsave lookups use the UNIQUE(student_id, job_id) index)
+CREATE INDEX IF NOT EXISTS idx_saved_jobs_student_saved
+    ON saved_jobs(student_id, saved_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_saved_jobs_student;
+
+-- Mentorship requests and sessions of a student or mentor, newest first
+CREATE INDEX IF NOT EXISTS idx_mentorship_requests_student_requested
+    ON mentorship_requests(student_id, requested_at) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_mentorship_requests_mentor_requested
+    ON mentorship_requests(mentor_id, requested_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_mentorship_requests_student;
+DROP INDEX IF EXISTS idx_mentorship_requests_mentor;
+
+CREATE INDEX IF NOT EXISTS idx_sessions_student_scheduled
+    ON mentorship_sessions(student_id, scheduled_at) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_sessions_mentor_scheduled
+    ON mentorship_sessions(mentor_id, scheduled_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_sessions_student;
+DROP INDEX IF EXISTS idx_sessions_mentor;
+
+-- One review per session check
+CREATE INDEX IF NOT EXISTS idx_reviews_session
+    ON mentorship_reviews(session_id) WHERE deleted_at IS NULL;
+
+-- A user's conversation list (participant checks use the UNIQUE(conversation_id, user_id) index)
+CREATE INDEX IF NOT EXISTS idx_participants_user_conversation
+    ON conversation_participants(user_id, conversation_id) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_participants_conversation;
+DROP INDEX IF EXISTS idx_participants_user;
+
+-- Unread messages are always looked up per conversation (idx_messages_unread_conversation)
+DROP INDEX IF EXISTS idx_messages_unread;
+
+-- Enrollment list (the enroll check uses the UNIQUE(student_id, course_id) index)
+CREATE INDEX IF NOT EXISTS idx_enrollments_student_enrolled
+    ON course_enrollments(student_id, enrolled_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_enrollments_student;
+
+-- AI tool usage history
+CREATE INDEX IF NOT EXISTS idx_ai_usage_student_used
+    ON ai_tool_usage(student_id, used_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_ai_usage_student;
+
+-- Feed filtered by post type
+CREATE INDEX IF NOT EXISTS idx_posts_type_created
+    ON posts(post_type, created_at) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_posts_type;
+
+-- Like/unlike lookups and like lists use the UNIQUE(post_id, user_id) index
+DROP INDEX IF EXISTS idx_post_likes_post;
+
+-- Duplicate skill check
+CREATE INDEX IF NOT EXISTS idx_skills_student_name
+    ON student_skills(student_id, skill_name) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS idx_skills_student;
+
+-- Duplicates of UNIQUE constraints from 001, created by earlier versions of this migration
+DROP INDEX IF EXISTS idx_saved_jobs_student_job;
+DROP INDEX IF EXISTS idx_participants_conversation_user;
+DROP INDEX IF EXISTS idx_enrollments_student_course;
+DROP INDEX IF EXISTS idx_post_likes_post_user;
+
+ANALYZE;
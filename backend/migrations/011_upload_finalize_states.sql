@@ -0,0 +1,7 @@
+-- Collabio Database Migration
+-- Resumable uploads: a finalize claims the upload ('finalizing') and always
+-- ends in a terminal state ('complete', 'duplicate' or 'failed')
+
+ALTER TABLE file_uploads DROP CONSTRAINT IF EXISTS file_uploads_upload_status_check;
+ALTER TABLE file_uploads ADD CONSTRAINT file_uploads_upload_status_check
+    CHECK (upload_status IN ('uploading', 'finalizing', 'complete', 'duplicate', 'failed'));
@@ -0,0 +1,71 @@
+"""
+Shared fixtures: an app on TEST_DATABASE_URL with in-memory cache, rate
+limiting and Socket.IO queue, and factories for common rows
+"""
+import os
+
+os.environ.setdefault('SECRET_KEY', 'test-secret-key-with-at-least-32-bytes')
+os.environ.setdefault('JWT_SECRET_KEY', 'test-jwt-secret-key-with-at-least-32-bytes')
+os.environ.setdefault('CACHE_TYPE', 'SimpleCache')
+os.environ.setdefault('RATELIMIT_ENABLED', 'False')
+os.environ.setdefault('SOCKETIO_MESSAGE_QUEUE', '')
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db, cache
+from app.models import User, EmployerProfile, Job, JobApplication, StudentProfile
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        cache.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth_headers(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=user.user_id)}'}
+
+
+@pytest.fixture
+def employer(app):
+    user = User(email='employer@example.com', password='x', user_type='employer')
+    user.save()
+    EmployerProfile(employer_id=user.user_id, company_name='Acme').save()
+    return user
+
+
+@pytest.fixture
+def job(employer):
+    job = Job(employer_id=employer.user_id, title='Backend Developer', company_name='Acme',
+              description='Build APIs', job_type='full-time')
+    job.save()
+    return job
+
+
+@pytest.fixture
+def make_application(job):
+    """Create a student and their pending application to job"""
+    count = 0
+
+    def make():
+        nonlocal count
+        count += 1
+        user = User(email=f'student{count}@example.com', password='x', user_type='student')
+        user.save()
+        StudentProfile(student_id=user.user_id, full_name=f'Student {count}').save()
+        application = JobApplication(job_id=job.job_id, student_id=user.user_id)
+        application.save()
+        return application
+
+    return make
@@ -0,0 +1,88 @@
+"""
+Outbox: accepted applications are delivered by the in-process worker
+"""
+from app.extensions import db
+from app.models import Conversation, Message, Notification, OutboxEvent
+from app.services import outbox
+from tests.conftest import auth_headers
+
+
+def accept(client, employer, application):
+    return client.put(
+        f'/api/v1/jobs/applications/{application.application_id}/status',
+        json={'status': 'accepted'},
+        headers=auth_headers(employer)
+    )
+
+
+def test_accepted_application_is_delivered_by_drain(app, client, employer, make_application):
+    application = make_application()
+
+    assert accept(client, employer, application).status_code == 200
+    # Nothing is delivered until the worker runs
+    assert Message.query.count() == 0
+
+    assert outbox.drain(app) == 1
+
+    assert Conversation.query.count() == 1
+    assert Message.query.count() == 1
+    assert Notification.query.count() == 1
+    assert [event.status for event in OutboxEvent.query] == ['done']
+
+
+def test_accepting_again_enqueues_nothing(app, client, employer, make_application):
+    application = make_application()
+
+    accept(client, employer, application)
+    accept(client, employer, application)
+    outbox.drain(app)
+
+    assert OutboxEvent.query.count() == 1
+    assert Message.query.count() == 1
+
+
+def test_failing_handler_is_retried_then_marked_failed(app):
+    app.config['OUTBOX_MAX_ATTEMPTS'] = 2
+    calls = []
+
+    @outbox.handler('test.failing')
+    def failing(events):
+        calls.append(len(events))
+        raise RuntimeError('boom')
+
+    try:
+        outbox.enqueue('test.failing', {})
+        db.session.commit()
+
+        outbox.drain(app)
+        event = OutboxEvent.query.one()
+        assert event.status == 'pending'
+        assert event.attempts == 1
+        assert event.last_error == 'boom'
+        assert event.available_at > event.created_at
+
+        # Make the retry due now instead of after the backoff
+        event.available_at = event.created_at
+        db.session.commit()
+
+        outbox.drain(app)
+        event = OutboxEvent.query.one()
+        assert event.status == 'failed'
+        assert event.attempts == 2
+        assert calls == [1, 1]
+    finally:
+        outbox.HANDLERS.pop('test.failing', None)
+
+
+def test_failing_event_does_not_block_its_batch(app, client, employer, make_application):
+    application = make_application()
+    accept(client, employer, application)
+    # Malformed payload for the same handler, claimed in the same batch
+    outbox.enqueue('application.accepted', {'application_id': 'missing'})
+    db.session.commit()
+
+    outbox.drain(app)
+
+    statuses = sorted(event.status for event in OutboxEvent.query)
+    assert statuses == ['done', 'pending']
+    assert Message.query.count() == 1
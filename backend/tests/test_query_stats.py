@@ -0,0 +1,76 @@
+"""
+Query budgets: routes running more SQL statements than allowed fail in tests
+"""
+import pytest
+from flask import Response, stream_with_context
+from app.extensions import db
+from app.models import User, Conversation, ConversationParticipant, Message
+from app.services.query_stats import QueryBudgetExceeded, query_budget
+from tests.conftest import auth_headers
+
+
+def test_route_over_budget_raises(app, client, employer):
+    @app.route('/test/over-budget')
+    @query_budget(2)
+    def over_budget():
+        for _ in range(3):
+            User.query.count()
+        return 'ok'
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/test/over-budget')
+
+
+def test_route_within_budget_reports_query_count(app, client):
+    @app.route('/test/within-budget')
+    @query_budget(2)
+    def within_budget():
+        User.query.count()
+        return 'ok'
+
+    response = client.get('/test/within-budget')
+
+    assert response.status_code == 200
+    assert 'desc="1 queries"' in response.headers['Server-Timing']
+
+
+def test_streamed_body_queries_count_against_budget(app, client, employer):
+    @app.route('/test/streamed-over-budget')
+    @query_budget(2)
+    def streamed_over_budget():
+        def body():
+            for _ in range(3):
+                yield str(User.query.count())
+        return Response(stream_with_context(body()))
+
+    with pytest.raises(QueryBudgetExceeded):
+        response = client.get('/test/streamed-over-budget')
+        response.get_data()
+        response.close()
+
+
+def test_budget_survives_outer_decorators(app):
+    view = app.view_functions['messaging.get_conversations']
+    assert view.query_budget == 8
+
+
+def test_conversation_list_stays_within_budget(app, client, employer, make_application):
+    for _ in range(10):
+        student = make_application().student_id
+        conversation = Conversation()
+        db.session.add(conversation)
+        db.session.flush()
+        db.session.add_all([
+            ConversationParticipant(conversation_id=conversation.conversation_id, user_id=employer.user_id),
+            ConversationParticipant(conversation_id=conversation.conversation_id, user_id=student),
+            Message(conversation_id=conversation.conversation_id, sender_id=student, message_text='Hello')
+        ])
+        db.session.commit()
+
+    response = client.get('/api/v1/messages/conversations', headers=auth_headers(employer))
+
+    assert response.status_code == 200
+    conversations = response.get_json()['data']['data']
+    assert len(conversations) == 10
+    assert all(conv['latest_message']['message_text'] == 'Hello' for conv in conversations)
+    assert all(conv['participants'][0]['full_name'].startswith('Student') for conv in conversations)